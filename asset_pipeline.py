@@ -0,0 +1,292 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       asset_pipeline.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Asset pipeline step for the game's PNG images, run whenever images are added or changed, every image
+                  has its metadata chunks (eg. the text chunks image editors embed, which can be many times the size of
+                  the pixel data) stripped and any image with enough fully transparent border is trimmed to its visible
+                  pixels, the offset of each trimmed image within its original canvas is recorded in the image trims
+                  data file so that the game app anchors the trimmed image to draw exactly where the original did, the
+                  hit mask of every image is then derived from its alpha channel and recorded in the hit masks data
+                  file along with the hash of the image file, so that the game app need not derive them as it starts
+
+                  Usage:
+                    python asset_pipeline.py                process the images in place
+                    python asset_pipeline.py --check        ... only report, fail if any image or hit mask would change
+"""
+
+# Imports
+import os
+import sys
+import io
+import json
+import struct
+import argparse
+import pyglet
+
+# The headless option must be set before pyglet.image is imported, the images are decoded without creating a window
+pyglet.options["headless"] = True
+pyglet.options["shadow_window"] = False
+
+import pyglet.image
+from pyglet.image.codecs.png import PNGImageEncoder
+from engine.consts import *
+from engine.hit_mask import HitMask, image_hash
+
+
+# Consts
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Ancillary chunks that change how the pixels are decoded are kept, all other ancillary chunks are stripped (critical
+# chunks, ie. those whose type starts with an upper case letter, are always kept)
+PNG_KEEP_CHUNKS = (b"tRNS", b"gAMA", b"cHRM", b"sRGB", b"iCCP", b"sBIT")
+
+# An image is only trimmed if trimming removes at least this fraction of its pixels, trimming re-encodes the image and
+# shifts its origin so a trim of a pixel or two is not worth it
+TRIM_MIN_SAVING = 0.1
+
+
+# Globals
+# Classes
+
+
+# Functions
+def png_chunks(data):
+    """
+    Split PNG file data into its chunks
+
+    :param data: bytes of the PNG file
+
+    :return chunks: list of (chunk type, chunk bytes) tuples, the chunk bytes include the length, type and CRC
+
+    :exception ValueError: raised if the data is not a PNG file
+    """
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("not a PNG file")
+
+    chunks = []
+    offset = len(PNG_SIGNATURE)
+
+    while offset < len(data):
+        length, = struct.unpack(">I", data[offset:offset + 4])
+        chunks.append((data[offset + 4:offset + 8], data[offset:offset + length + 12]))
+        offset += length + 12
+
+    return chunks
+
+
+def strip_png(data):
+    """
+    Strip the ancillary chunks that do not affect the decoded pixels from PNG file data, the pixel data itself is
+    copied untouched
+
+    :param data: bytes of the PNG file
+
+    :return data: bytes of the stripped PNG file
+    """
+    return PNG_SIGNATURE + b"".join(chunk for chunk_type, chunk in png_chunks(data)
+                                    if chunk_type[:1].isupper() or chunk_type in PNG_KEEP_CHUNKS)
+
+
+def opaque_bounds(image):
+    """
+    Find the bounds of the pixels of an image that are not fully transparent
+
+    :param image: pyglet image to find the bounds of
+
+    :return bounds: (x, y, width, height) tuple with y up from the bottom of the image, None if the image is fully
+                    transparent
+    """
+    width = image.width
+    height = image.height
+    alpha = image.get_image_data().get_data("A", width)
+
+    rows = [y for y in range(height) if alpha[y * width:(y + 1) * width].strip(b"\x00")]
+
+    if not rows:
+        return None
+
+    # OR together all the rows so that the columns with a visible pixel are the non zero bytes
+    combined = 0
+    for y in range(rows[0], rows[-1] + 1):
+        combined |= int.from_bytes(alpha[y * width:(y + 1) * width], "big")
+
+    columns = combined.to_bytes(width, "big")
+    left = len(columns) - len(columns.lstrip(b"\x00"))
+    right = len(columns.rstrip(b"\x00"))
+
+    return left, rows[0], right - left, rows[-1] + 1 - rows[0]
+
+
+def process_image(name, data, min_saving=TRIM_MIN_SAVING):
+    """
+    Strip and (if worthwhile) trim a single image
+
+    :param name: file name of the image, used by the PNG decoder and encoder
+    :param data: bytes of the PNG file
+    :param min_saving: minimum fraction of the pixels that trimming must remove for the image to be trimmed
+
+    :return result: (data, trim) tuple of the bytes of the processed PNG file and, if the image was trimmed, a
+                    dictionary of "x", "y" (the offset of the trimmed image within the original) and "width", "height"
+                    (the size of the original), otherwise None
+    """
+    image = pyglet.image.load(name, file=io.BytesIO(data))
+    bounds = opaque_bounds(image)
+
+    if not bounds or bounds[2] * bounds[3] > (1.0 - min_saving) * image.width * image.height:
+        return strip_png(data), None
+
+    output = io.BytesIO()
+    image.get_image_data().get_region(*bounds).save(name, file=output, encoder=PNGImageEncoder())
+    return strip_png(output.getvalue()), {"x": bounds[0], "y": bounds[1], "width": image.width, "height": image.height}
+
+
+def process_images(images_path, trims, min_saving=TRIM_MIN_SAVING, write=True):
+    """
+    Strip and trim all the PNG images in a folder
+
+    :param images_path: path of the folder of images
+    :param trims: dictionary of image resource path (eg. "images/back_btn_e.png") to the trim of that image as a
+                  dictionary of "x", "y" (the offset of the trimmed image within the original) and "width", "height"
+                  (the size of the original), this is updated with any images that are trimmed
+    :param min_saving: minimum fraction of the pixels that trimming must remove for an image to be trimmed
+    :param write: if True then the processed images are written back, otherwise they are only reported
+
+    :return changed: list of (file name, original size in bytes, processed size in bytes) tuples of the images that
+                     were (or would be) changed
+    """
+    changed = []
+
+    for file_name in sorted(os.listdir(images_path)):
+        if not file_name.lower().endswith(".png"):
+            continue
+
+        with open(os.path.join(images_path, file_name), "rb") as image_file:
+            data = image_file.read()
+
+        processed, trim = process_image(file_name, data, min_saving)
+
+        if processed == data:
+            continue
+
+        changed.append((file_name, len(data), len(processed)))
+
+        if not write:
+            continue
+
+        with open(os.path.join(images_path, file_name), "wb") as image_file:
+            image_file.write(processed)
+
+        if trim:
+            # An image that was trimmed before keeps its original size, its offset moves by the offset of this trim
+            previous = trims.get(IMAGES_PATH + file_name)
+
+            if previous:
+                trim = {"x": previous["x"] + trim["x"], "y": previous["y"] + trim["y"],
+                        "width": previous["width"], "height": previous["height"]}
+
+            trims[IMAGES_PATH + file_name] = trim
+
+    return changed
+
+
+def derive_hit_masks(images_path, hit_masks, write=True):
+    """
+    Derive the hit masks of all the PNG images in a folder, only those whose image has changed (or whose hit mask was
+    derived with another cell size or alpha threshold) are derived again
+
+    :param images_path: path of the folder of images
+    :param hit_masks: dictionary of image resource path (eg. "images/back_btn_e.png") to the hit mask of that image as a
+                      dictionary of the "hash" of the image file, the "threshold" and the hit mask's data (see
+                      engine.hit_mask.HitMask.to_data()), this is updated with any hit masks that are derived
+    :param write: if True then the hit masks are derived, otherwise they are only reported
+
+    :return changed: list of file names of the images whose hit masks were (or would be) derived
+    """
+    changed = []
+
+    for file_name in sorted(os.listdir(images_path)):
+        if not file_name.lower().endswith(".png"):
+            continue
+
+        with open(os.path.join(images_path, file_name), "rb") as image_file:
+            data = image_file.read()
+
+        previous = hit_masks.get(IMAGES_PATH + file_name)
+
+        if previous and previous["hash"] == image_hash(data) and previous["cell_size"] == HIT_MASK_CELL_SIZE and \
+                previous["threshold"] == HIT_MASK_ALPHA_THRESHOLD:
+            continue
+
+        changed.append(file_name)
+
+        if not write:
+            continue
+
+        hit_mask = HitMask.from_image(pyglet.image.load(file_name, file=io.BytesIO(data)))
+        hit_masks[IMAGES_PATH + file_name] = dict(hit_mask.to_data(), hash=image_hash(data),
+                                                  threshold=HIT_MASK_ALPHA_THRESHOLD)
+
+    return changed
+
+
+def main():
+    """
+    Main asset pipeline function
+
+    :return exit code: 0 if all is well, 1 if checking and any image would change
+    """
+    parser = argparse.ArgumentParser(description="Asset pipeline for " + GAME_NAME)
+    parser.add_argument("--check", action="store_true", help="only report, fail if any image or hit mask would change")
+    parser.add_argument("--min-saving", type=float, default=TRIM_MIN_SAVING,
+                        help="minimum fraction of an image's pixels that trimming must remove for it to be trimmed")
+    args = parser.parse_args()
+
+    trims_path = os.path.join(ASSETS_PATH, IMAGE_TRIMS_DATA_PATH)
+    trims = {}
+
+    if os.path.exists(trims_path):
+        with open(trims_path) as trims_file:
+            trims = json.load(trims_file)
+
+    hit_masks_path = os.path.join(ASSETS_PATH, HIT_MASKS_DATA_PATH)
+    hit_masks = {}
+
+    if os.path.exists(hit_masks_path):
+        with open(hit_masks_path) as hit_masks_file:
+            hit_masks = json.load(hit_masks_file)
+
+    changed = process_images(os.path.join(ASSETS_PATH, IMAGES_PATH), trims, args.min_saving, write=not args.check)
+
+    for file_name, original_size, processed_size in changed:
+        print("{0}: {1} -> {2} bytes".format(file_name, original_size, processed_size))
+
+    # Hit masks are derived from the processed images, so they are derived once the images have been written
+    changed_hit_masks = derive_hit_masks(os.path.join(ASSETS_PATH, IMAGES_PATH), hit_masks, write=not args.check)
+
+    for file_name in changed_hit_masks:
+        print("{0}: hit mask derived".format(file_name))
+
+    if args.check:
+        return 1 if changed or changed_hit_masks else 0
+
+    with open(trims_path, "w") as trims_file:
+        json.dump(trims, trims_file, indent=4, sort_keys=True)
+        trims_file.write("\n")
+
+    with open(hit_masks_path, "w") as hit_masks_file:
+        json.dump(hit_masks, hit_masks_file, indent=4, sort_keys=True)
+        hit_masks_file.write("\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    """
+    Runs the asset pipeline
+    """
+    sys.exit(main())
@@ -0,0 +1,402 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       benchmark.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Benchmarks of the game app that run without a display (using pyglet's headless mode), these time the
+                  game app startup phases, entering and leaving every game state, storms of mouse motion over the
+                  button heavy screens and the throughput of the threat deck and dice, the results are written as
+                  JSON and can be saved as a baseline that later runs are checked against for regressions
+
+                  Usage:
+                    python benchmark.py                     run the benchmarks and print the results
+                    python benchmark.py --save-baseline     ... and save the results as the baseline
+                    python benchmark.py --check             ... and fail (exit code 1) if any result has regressed
+                                                            (exit code 2 if there is no baseline to check against)
+"""
+
+# Imports
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import pyglet
+
+# The headless option must be set before any pyglet window is created, ie. before the game app is imported
+pyglet.options["headless"] = "--window" not in sys.argv
+pyglet.options["shadow_window"] = False
+
+from engine.consts import *
+from engine import metrics
+from engine.game_app import GameApp
+from data_model.die import Die
+from data_model.threat_deck import ThreatDeck
+from fsm.state import State
+
+
+# Consts
+BENCHMARK_BASELINE_PATH = "benchmark_baseline.json"
+BENCHMARK_TOLERANCE = 0.25
+BENCHMARK_STARTUP_NOISE = 0.01
+BENCHMARK_ROUNDS = 5
+MOUSE_MOTION_STORM_EVENTS = 5000
+MOUSE_MOTION_STORM_STATES = ["main_menu_screen", "game_play_menu_screen"]
+THREAT_DECK_DRAWS = 20000
+DIE_ROLLS = 100000
+GENERATED_FSM_STATES = 300
+GENERATED_FSM_FAN_OUT = 8
+GENERATED_FSM_FIRES = 100000
+
+
+# Globals
+# Classes
+
+
+# Functions
+def _median_per_op(durations, operations):
+    return statistics.median(durations) / operations
+
+
+def _shortest_path(app, source, target):
+    """
+    Shortest sequence of game states to fire transitions to in order to get from the source state to the target state
+
+    :param app: engine.game_app.GameApp object that has been started
+    :param source: fsm.state.State object to start from
+    :param target: fsm.state.State object to reach
+
+    :return path: list of fsm.state.State objects to fire transitions to in turn, or None if the target is unreachable
+    """
+    path = app.transition_table.shortest_path(source.name, target.name)
+    return None if path is None else [app.game_states[name] for name in path]
+
+
+def _fire(app, target):
+    """
+    Fire the transition from the current game state to the target state, the game play state needs its screen captured
+    before it moves to the game play menu state (this is normally done by the game main board's key and mouse handlers)
+
+    :return duration: time taken in seconds
+    """
+    source = app.current_game_state
+
+    if source.name == "game_play_screen" and target.name == "game_play_menu_screen":
+        source.capture_screen()
+
+    start = time.perf_counter()
+    source.fire_transition(target)
+    return time.perf_counter() - start
+
+
+def _restart(app, state_name):
+    # Used to leave a state that has no transitions out of it (eg. the quit screen)
+    app.current_game_state.leave(None)
+    app.game_states[state_name].enter(None)
+
+
+def _dispatch(window, event_type, *args):
+    # Dispatch straight to the handlers, the headless window would otherwise queue events until its event loop runs
+    pyglet.event.EventDispatcher.dispatch_event(window, event_type, *args)
+
+
+def benchmark_startup(app):
+    """
+    Time each of the game app's startup phases and then launch into the splash screen game state
+
+    :param app: engine.game_app.GameApp object that has not yet been started
+
+    :return results: dictionary of benchmark name to seconds
+    """
+    results = {}
+
+    for name, phase in app.startup_phases:
+        start = time.perf_counter()
+        phase()
+        results["startup/" + name] = time.perf_counter() - start
+
+    # Time the benchmarks themselves and not the instrumentation
+    metrics.registry().enabled = False
+    app.frame_profiler.enabled = False
+
+    start = time.perf_counter()
+    app.current_game_state = app.game_states["splash_screen"]
+    app.current_game_state.enter(state=None)
+    results["startup/enter_splash_screen"] = time.perf_counter() - start
+
+    return results
+
+
+def benchmark_transitions(app, rounds=BENCHMARK_ROUNDS):
+    """
+    Fire every transition of the game state machine (travelling along the shortest path to the source state of each
+    transition), each transition is timed from leaving its source to having entered its target
+
+    :param app: engine.game_app.GameApp object that has been started
+    :param rounds: number of times every transition is fired
+
+    :return results: dictionary of benchmark name to median seconds per transition
+    """
+    # Game states are loaded lazily and a transition is only in place once both of its game states are loaded
+    app.game_states.prefetch(*app.game_states)
+    transitions = [transition for state in app.game_states.values() for transition in state.transitions]
+
+    # Transitions into states with no way out are fired last in each round
+    transitions.sort(key=lambda transition: not transition.target.transitions)
+
+    durations = {}
+
+    for _ in range(rounds):
+        for transition in transitions:
+            path = _shortest_path(app, app.current_game_state, transition.source)
+
+            if path is None:
+                # The source cannot be reached from the current state (eg. the splash screen, or the current state is
+                # a dead end) so it is entered directly
+                _restart(app, transition.source.name)
+                path = []
+
+            for state in path + [transition.target]:
+                key = "transition/{0}->{1}".format(app.current_game_state.name, state.name)
+                durations.setdefault(key, []).append(_fire(app, state))
+
+        _restart(app, "main_menu_screen")
+
+    return {key: statistics.median(values) for key, values in durations.items()}
+
+
+def benchmark_mouse_motion(app, events=MOUSE_MOTION_STORM_EVENTS):
+    """
+    Sweep the mouse back and forth across the whole game window over the button heavy game states
+
+    :param app: engine.game_app.GameApp object that has been started
+    :param events: number of mouse motion events per game state
+
+    :return results: dictionary of benchmark name to median seconds per event
+    """
+    window = app.game_window
+    rows = max(1, int(events ** 0.5))
+    step_x = window.width / rows
+    step_y = window.height / rows
+    points = [(int((column if row % 2 == 0 else rows - 1 - column) * step_x), int(row * step_y))
+              for row in range(rows) for column in range(rows)]
+
+    results = {}
+
+    for state_name in MOUSE_MOTION_STORM_STATES:
+        path = _shortest_path(app, app.current_game_state, app.game_states[state_name])
+
+        if path is None:
+            _restart(app, "main_menu_screen")
+            path = _shortest_path(app, app.current_game_state, app.game_states[state_name])
+
+        for state in path:
+            _fire(app, state)
+
+        durations = []
+
+        for _ in range(BENCHMARK_ROUNDS):
+            last_x, last_y = points[0]
+            start = time.perf_counter()
+
+            for x, y in points:
+                _dispatch(window, "on_mouse_motion", x, y, x - last_x, y - last_y)
+                last_x, last_y = x, y
+
+            durations.append(time.perf_counter() - start)
+
+        results["mouse_motion/" + state_name] = _median_per_op(durations, len(points))
+
+    return results
+
+
+def benchmark_data_model(draws=THREAT_DECK_DRAWS, rolls=DIE_ROLLS):
+    """
+    Time the threat deck (resetting, shuffling and drawing every card) and the dice
+
+    :param draws: minimum number of threat cards to draw per round
+    :param rolls: number of rolls of each die per round
+
+    :return results: dictionary of benchmark name to median seconds per operation
+    """
+    threat_deck = ThreatDeck(cards_file=GAME_THREAT_CARDS_DATA_PATH, reproducible=True)
+    dice = [Die(name="Threat-Die", sides=6, reproducible=True, seed=1),
+            Die(name="Crew-Die", sides=6, reproducible=False)]
+
+    results = {}
+    durations = []
+    drawn = 0
+
+    for _ in range(BENCHMARK_ROUNDS):
+        drawn = 0
+        start = time.perf_counter()
+
+        while drawn < draws:
+            threat_deck.reset_deck()
+            threat_deck.shuffle_deck(use_reproducible=True)
+
+            while threat_deck.draw_card():
+                drawn += 1
+
+        durations.append(time.perf_counter() - start)
+
+    results["data_model/threat_deck_draw"] = _median_per_op(durations, drawn)
+
+    for die in dice:
+        durations = []
+
+        for _ in range(BENCHMARK_ROUNDS):
+            start = time.perf_counter()
+
+            for _ in range(rolls):
+                die.roll()
+
+            durations.append(time.perf_counter() - start)
+
+        kind = "reproducible" if die.reproducible else "system"
+        results["data_model/die_roll_" + kind] = _median_per_op(durations, rolls)
+
+    return results
+
+
+def benchmark_generated_fsm(states=GENERATED_FSM_STATES, fan_out=GENERATED_FSM_FAN_OUT, fires=GENERATED_FSM_FIRES):
+    """
+    Time firing transitions around a generated state machine (eg. the shape of a machine of per-turn phases), each
+    state has transitions to the next few states along, firing is expected to take the same time however many states
+    and transitions there are
+
+    :param states: number of states in the generated state machine
+    :param fan_out: number of transitions out of each state
+    :param fires: number of transitions fired per round
+
+    :return results: dictionary of benchmark name to median seconds per transition fired
+    """
+    machine = [State("phase_{0}".format(index)) for index in range(states)]
+
+    for index, state in enumerate(machine):
+        for step in range(1, fan_out + 1):
+            state.add_transition(machine[(index + step) % states])
+
+    durations = []
+
+    for _ in range(BENCHMARK_ROUNDS):
+        index = 0
+        start = time.perf_counter()
+
+        # Always fire the last transition added, the worst case for a linear search of the transitions
+        for _ in range(fires):
+            target = (index + fan_out) % states
+            machine[index].fire_transition(machine[target])
+            index = target
+
+        durations.append(time.perf_counter() - start)
+
+    return {"fsm/fire_generated_{0}_states".format(states): _median_per_op(durations, fires)}
+
+
+def check_regressions(results, baseline, tolerance=BENCHMARK_TOLERANCE):
+    """
+    Compare results against a baseline, a result has regressed if it is slower than the baseline by more than the
+    tolerance, results with no baseline entry are ignored, the startup phases can only be timed once per run and so are
+    also allowed a fixed amount of noise
+
+    :param results: dictionary of benchmark name to seconds
+    :param baseline: dictionary of benchmark name to seconds
+    :param tolerance: allowed slow down as a fraction, eg. 0.25 for 25%
+
+    :return regressions: list of (name, baseline seconds, result seconds) tuples
+    """
+    regressions = []
+
+    for name, value in sorted(results.items()):
+        if name not in baseline:
+            continue
+
+        allowed = baseline[name] * (1 + tolerance) + (BENCHMARK_STARTUP_NOISE if name.startswith("startup/") else 0)
+
+        if value > allowed:
+            regressions.append((name, baseline[name], value))
+
+    return regressions
+
+
+def run_benchmarks():
+    """
+    Run all the benchmarks
+
+    :return results: dictionary of benchmark name to seconds
+    """
+    app = GameApp()
+
+    results = benchmark_startup(app)
+    results.update(benchmark_transitions(app))
+    results.update(benchmark_mouse_motion(app))
+    results.update(benchmark_data_model())
+    results.update(benchmark_generated_fsm())
+
+    app.game_window.close()
+
+    return results
+
+
+def main():
+    """
+    Main benchmark function
+
+    :return exit code: 0 if all is well, 1 if a regression was found
+
+    :exception SystemExit: raised (with exit code 2) if the results are to be checked but there is no baseline
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks for " + GAME_NAME)
+    parser.add_argument("--output", help="write the results as JSON to this file (default: standard output)")
+    parser.add_argument("--baseline", default=BENCHMARK_BASELINE_PATH, help="baseline file to save to or check against")
+    parser.add_argument("--save-baseline", action="store_true", help="save the results as the baseline")
+    parser.add_argument("--check", action="store_true", help="fail if any result regressed against the baseline")
+    parser.add_argument("--tolerance", type=float, default=BENCHMARK_TOLERANCE,
+                        help="allowed slow down as a fraction before a result counts as regressed")
+    parser.add_argument("--window", action="store_true", help="use a real window rather than pyglet's headless mode")
+    args = parser.parse_args()
+
+    # Baselines are specific to the machine they were saved on, so none is shipped, fail before running the benchmarks
+    # rather than after
+    if args.check and not args.save_baseline and not os.path.isfile(args.baseline):
+        parser.error("no baseline to check against at '{0}', save one on this machine first with --save-baseline "
+                     "(or give another with --baseline)".format(args.baseline))
+
+    results = run_benchmarks()
+    report = json.dumps({"version": VERSION, "timestamp": time.time(), "results": results}, indent=2, sort_keys=True)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(report + "\n")
+    else:
+        print(report)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write("\n")
+
+    if args.check:
+        with open(args.baseline) as baseline_file:
+            regressions = check_regressions(results, json.load(baseline_file), args.tolerance)
+
+        for name, expected, actual in regressions:
+            print("REGRESSION {0}: {1:.6f}s -> {2:.6f}s ({3:+.0%})".format(name, expected, actual,
+                                                                          actual / expected - 1), file=sys.stderr)
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    """
+    Runs the benchmarks
+    """
+    sys.exit(main())
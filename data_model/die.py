@@ -11,6 +11,7 @@ Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leade
 
 # Imports
 from data_model.rng import RNG
+from engine import metrics
 
 
 # Consts
@@ -27,6 +28,8 @@ class Die(RNG):
         self.__sides = sides
         self.__faces = faces
         self.__last_roll = None
+        self.__rolls_counter = metrics.counter("die_rolls_total", "Number of die rolls", {"die": name})
+        self.__roll_timer = metrics.timer("die_roll_seconds", "Time taken to roll a die", {"die": name})
 
     @property
     def name(self):
@@ -45,11 +48,16 @@ class Die(RNG):
         return self.__last_roll
 
     def roll(self):
+        start = self.__roll_timer.start()
+
         if self.sides < 1:
             self.__last_roll = 1
         else:
             self.__last_roll = self._rng.randint(a=1, b=self.sides)
 
+        self.__roll_timer.stop(start)
+        self.__rolls_counter.inc()
+
         return self.last_roll
 
     def face_at_side(self, side):
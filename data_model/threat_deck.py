@@ -13,10 +13,15 @@ Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leade
 import json
 from data_model.threats import Threat, ExternalThreat, InternalThreat
 from data_model.rng import RNG
+from engine import metrics
 
 
 # Consts
 # Globals
+_draws_counter = metrics.counter("threat_deck_draws_total", "Number of threat cards drawn")
+_draw_timer = metrics.timer("threat_deck_draw_seconds", "Time taken to draw a threat card")
+_available_gauge = metrics.gauge("threat_deck_available_cards", "Number of threat cards available to draw")
+
 # Functions
 
 
@@ -128,10 +133,16 @@ class ThreatDeck(RNG):
         a None
         :return: Threat
         """
-        if len(self.available_cards) > 0:
-            return self.available_cards.pop(0)
+        start = _draw_timer.start()
+        card = self.available_cards.pop(0) if len(self.available_cards) > 0 else None
+        _draw_timer.stop(start)
+
+        if card:
+            _draws_counter.inc()
+
+        _available_gauge.set(len(self.available_cards))
 
-        return None
+        return card
 
     def discard_card(self, card):
         if card in self.available_cards:
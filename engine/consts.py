@@ -23,12 +23,95 @@ WINDOW_COLOUR_R = 128
 WINDOW_COLOUR_G = 0
 WINDOW_COLOUR_B = 0
 
+# Design resolution, the resolution the screen images are drawn at, game state layouts position and size their sprites
+# in the pixels of this resolution and are scaled from it to the actual window size
+DESIGN_WIDTH = 1920
+DESIGN_HEIGHT = 1080
+
 # Default values used when there is no proper configuration information for the various variable game app settings
 DEFAULT_DISPLAY_ID = 0
 DEFAULT_DISPLAY_WIDTH = 1600
 DEFAULT_DISPLAY_HEIGHT = 900
 DEFAULT_VSYNC = True
 DEFAULT_FULLSCREEN = False
+DEFAULT_CONTINUOUS_REDRAW = False
+DEFAULT_METRICS_EXPORT = "none"
+DEFAULT_METRICS_EXPORT_INTERVAL = 10
+DEFAULT_TEXTURE_BUDGET = 0
+
+# Game loop timing, game logic is advanced in fixed timesteps (in seconds) with at most the given number of catch-up steps
+# per rendered frame, frames are rendered at the screen refresh rate (or the default if this cannot be established)
+LOGIC_TIMESTEP = 1 / 120.0
+MAX_LOGIC_STEPS_PER_FRAME = 5
+DEFAULT_REFRESH_RATE = 60
+
+# UI hit masks are derived from the alpha channel of UI images, each bit covers a square cell of this many pixels and is
+# set if any pixel in the cell has an alpha above the threshold
+HIT_MASK_CELL_SIZE = 4
+HIT_MASK_ALPHA_THRESHOLD = 16
+
+# Size in pixels of the cells of the spatial grid used to index UI objects for routing of mouse input
+SPATIAL_GRID_CELL_SIZE = 128
+
+# Size in pixels of the square tiles that large images (eg. the game main board) are split into for drawing, each tile's
+# texture also holds a gutter of the given number of its neighbours' pixels so that filtering is continuous across tiles,
+# the gutter is a power of 2 so that the mipmap levels down to 1 / gutter scale stay aligned with the tile's pixels
+TILE_SIZE = 512
+TILE_GUTTER = 8
+
+# Scale (relative to the game window) of the offscreen render target that the game play scene is drawn into to form
+# the backdrop of the game play menu, values below 1.0 reduce the cost of the capture and, as the texture is stretched
+# back up to the window size with linear filtering, give the backdrop a soft blurred look
+PAUSE_BACKDROP_SCALE = 0.5
+
+# Frame profiler, number of samples kept in the ring buffer of each timed section (per game state), a frame is counted as
+# a spike if it takes longer than the given multiple of the frame budget, the overlay is refreshed at the given interval
+# (in seconds) and toggled with the given key
+PROFILER_CAPACITY = 240
+PROFILER_SPIKE_FACTOR = 2.0
+PROFILER_OVERLAY_INTERVAL = 0.5
+PROFILER_OVERLAY_KEY = "F3"
+
+# Transition history, the key that toggles its overlay, a firing is highlighted in the overlay if it took longer than the
+# frame budget (ie. it caused a frame hitch)
+TRANSITION_OVERLAY_KEY = "F4"
+
+# Options screen, keys that toggle display settings, the settings take effect straight away and are written to the
+# settings file in the background
+OPTIONS_VSYNC_KEY = "V"
+OPTIONS_CONTINUOUS_REDRAW_KEY = "C"
+
+# Debug HUD, minimum interval (in seconds) between refreshes of the debug info it draws in the game window
+DEBUG_HUD_INTERVAL = 0.1
+
+# Game states are prewarmed (loaded and their objects built) one per interval (in seconds) while the splash screen is
+# shown, so that the work is spread over frames rather than holding up any one frame
+PREWARM_INTERVAL = 1 / DEFAULT_REFRESH_RATE
+
+# Number of worker processes that decode the image files as the assets are loaded, 0 for one per CPU core (the images
+# are decoded by the game app's own process if that is only one)
+IMAGE_DECODE_PROCESSES = 0
+
+# Texture memory, textures are accounted at the given bytes per pixel (ie. RGBA8) with mipmapped textures (eg. the tiles
+# of the game main board) taking the given factor more for their smaller levels, the texture budget setting is in MB
+# (0 for no budget), above the budget the assets of inactive game states are evicted
+TEXTURE_BYTES_PER_PIXEL = 4
+TEXTURE_MIPMAP_FACTOR = 4 / 3
+TEXTURE_BUDGET_UNIT = 1024 * 1024
+
+# Push buttons show their pressed image for the reset delay (in seconds) and run their command after the command delay
+PUSH_BUTTON_RESET_DELAY = 0.1
+PUSH_BUTTON_COMMAND_DELAY = 0.2
+
+# Metrics, formats the metrics can be exported in (to a file in the user settings folder) and the upper bounds (in
+# seconds) of the histogram buckets that timers record durations into
+METRICS_FORMAT_NONE = "none"
+METRICS_FORMAT_JSON = "json"
+METRICS_FORMAT_PROMETHEUS = "prometheus"
+METRICS_EXPORT_INTERVAL = DEFAULT_METRICS_EXPORT_INTERVAL
+METRICS_JSON_FILENAME = "metrics.jsonl"
+METRICS_PROMETHEUS_FILENAME = "metrics.prom"
+METRICS_TIMER_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
 
 COMPANY_DIR_NAME = (COMPANY_NAME + os.path.sep).replace(os.path.sep, "/")
 GAME_NAME_DIR_NAME = (GAME_NAME + os.path.sep).replace(os.path.sep, "/")
@@ -36,6 +119,10 @@ USER_SETTINGS_DIR_NAME = ("Settings" + os.path.sep).replace(os.path.sep, "/")
 DEFAULT_SETTINGS_FILENAME = "default_settings.ini"
 SETTINGS_FILENAME = "settings.ini"
 
+# Changes to the settings are written to the settings file on a background thread once no further change has been made
+# for this time (in seconds), so that a burst of changes results in a single write
+SETTINGS_WRITE_DELAY = 0.5
+
 # This path has its root as the game app directory (rather than the operating system user application directory) and is
 # used during development only
 USER_SETTINGS_PATH = (COMPANY_DIR_NAME + GAME_NAME_DIR_NAME + USER_SETTINGS_DIR_NAME).replace(os.path.sep, "/")
@@ -235,3 +322,23 @@ GAME_THREAT_CARDS_DATA_PATH = DATA_PATH_FULL + GAME_THREAT_CARDS_DATA_FILENAME
 
 GAME_SHIP_DATA_HALCYON_FILENAME = "halcyon.json"
 GAME_SHIP_DATA_HALCYON_PATH = DATA_PATH_FULL + GAME_SHIP_DATA_HALCYON_FILENAME
+
+# Game state machine definition, this is loaded as a resource so its path is relative to the assets path
+GAME_STATES_DATA_FILENAME = "game_states.json"
+GAME_STATES_DATA_PATH = DATA_PATH + GAME_STATES_DATA_FILENAME
+
+# Game state layout definitions (a dictionary of game state name to its layout definition, see engine.layout), this is
+# loaded as a resource so its path is relative to the assets path
+GAME_STATE_LAYOUTS_DATA_FILENAME = "layouts.json"
+GAME_STATE_LAYOUTS_DATA_PATH = DATA_PATH + GAME_STATE_LAYOUTS_DATA_FILENAME
+
+# Offsets of the images trimmed by the asset pipeline (see asset_pipeline.py) within their original canvases, keyed by
+# image path, this is loaded as a resource so its path is relative to the assets path
+IMAGE_TRIMS_DATA_FILENAME = "image_trims.json"
+IMAGE_TRIMS_DATA_PATH = DATA_PATH + IMAGE_TRIMS_DATA_FILENAME
+
+# Hit masks derived by the asset pipeline (see asset_pipeline.py) from the alpha channels of the images, keyed by image
+# path along with the hash of the image file they were derived from (a hit mask whose image has changed since is derived
+# again as the assets are loaded), this is loaded as a resource so its path is relative to the assets path
+HIT_MASKS_DATA_FILENAME = "hit_masks.json"
+HIT_MASKS_DATA_PATH = DATA_PATH + HIT_MASKS_DATA_FILENAME
@@ -0,0 +1,164 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       debug_hud.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Debug HUD class, draws debug info (eg. the mouse position) in the game window during debug, setting a
+                  field only stores its format and values, the fields are formatted into cached labels at most once per
+                  refresh interval however often they are set (eg. on every mouse motion event)
+"""
+
+# Imports
+import pyglet
+from engine.consts import *
+from engine import timer_scheduler
+
+
+# Consts
+HUD_MARGIN = 8
+HUD_FONT_SIZE = 10
+HUD_LINE_HEIGHT = 16
+
+
+# Globals
+# Functions
+
+
+# Classes
+class DebugHUD:
+    def __init__(self, app, enabled=DEBUG, interval=DEBUG_HUD_INTERVAL):
+        """
+        Initialiser for the DebugHUD class, the fields belong to the current game state and are cleared when it changes
+
+        :attr _app: reference to the main game app object
+        :attr _enabled: True if the HUD is drawn and its fields are kept, otherwise setting a field is a no-op
+        :attr _interval: minimum interval (in seconds) between refreshes of the labels
+        :attr _fields: dictionary of field name to (format string, values tuple), in the order the fields were first set
+        :attr _state_name: name of the game state the fields belong to
+        :attr _stale: True if the labels need to be refreshed from the fields when the HUD is next drawn
+        :attr _batch: drawing batch for the HUD, built on the first draw
+        :attr _labels: list of pyglet.text.Label objects, the first is the game state name and then one per field, the
+                       labels are reused from refresh to refresh
+
+        :param app: main game app object
+        :param enabled: initial enabled state as a boolean
+        :param interval: minimum interval in seconds between refreshes
+        """
+        self._app = app
+        self._enabled = enabled
+        self._interval = interval
+        self._fields = {}
+        self._state_name = None
+        self._stale = True
+        self._batch = None
+        self._labels = []
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        self._enabled = value
+        self._stale = True
+
+        if not value:
+            self._fields.clear()
+            timer_scheduler.scheduler().cancel(key=(self, "refresh"))
+
+    @property
+    def interval(self):
+        return self._interval
+
+    def set(self, name, text, *values):
+        """
+        Set a field of the HUD, the text is not formatted with the values until the labels are next refreshed
+
+        :param name: name of the field, eg. "mouse"
+        :param text: format string of the field, eg. "mouse: ({0}, {1})"
+        :param values: values to format the text with
+
+        :return nothing:
+        """
+        if not self._enabled:
+            return
+
+        self._sync_state()
+        self._fields[name] = (text, values)
+
+        # The refresh timer is left alone if it is already scheduled, so that a stream of events is shown at the
+        # refresh interval rather than waiting until the events stop
+        scheduler = timer_scheduler.scheduler()
+
+        if not scheduler.is_scheduled((self, "refresh")):
+            scheduler.schedule(self._refresh, self._interval, key=(self, "refresh"))
+
+    def clear(self):
+        """
+        Clear all fields
+
+        :return nothing:
+        """
+        self._fields.clear()
+        self._stale = True
+
+    def _sync_state(self):
+        game_state = self._app.current_game_state
+        state_name = game_state.name if game_state else None
+
+        if state_name != self._state_name:
+            self._state_name = state_name
+            self.clear()
+
+    def _refresh(self):
+        # Nothing else may have changed in the current game state, so it must be redrawn for the HUD to be redrawn
+        self._stale = True
+
+        if self._app.current_game_state:
+            self._app.current_game_state.mark_dirty()
+
+    def _label(self, index):
+        if index == len(self._labels):
+            self._labels.append(pyglet.text.Label("", font_size=HUD_FONT_SIZE, color=(255, 255, 0, 255),
+                                                  x=HUD_MARGIN, y=HUD_MARGIN + HUD_LINE_HEIGHT * index,
+                                                  batch=self._batch))
+
+        return self._labels[index]
+
+    def _refresh_labels(self):
+        lines = [self._state_name or ""]
+        lines.extend(text.format(*values) for text, values in self._fields.values())
+
+        # Lines are drawn bottom up, the game state name is at the bottom
+        for index, line in enumerate(lines):
+            label = self._label(index)
+
+            if label.text != line:
+                label.text = line
+
+        for label in self._labels[len(lines):]:
+            if label.text:
+                label.text = ""
+
+    def draw(self):
+        """
+        Draw the HUD if it is enabled
+
+        :return nothing:
+        """
+        if not self._enabled:
+            return
+
+        if not self._batch:
+            self._batch = pyglet.graphics.Batch()
+
+        self._sync_state()
+
+        if self._stale:
+            self._stale = False
+            self._refresh_labels()
+
+        self._batch.draw()
@@ -0,0 +1,359 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       frame_profiler.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Frame profiler class, records per game state timings of the sections of each frame (update, draw,
+                  batch draws, event dispatch and clock callbacks) and per frame counts (eg. draw calls) into ring
+                  buffers and draws an overlay of their percentiles and a graph of recent frame times with any spikes
+                  highlighted
+"""
+
+# Imports
+import time
+import collections
+import pyglet
+from engine.consts import *
+
+
+# Consts
+PERCENTILES = (0.5, 0.95, 0.99)
+
+OVERLAY_MARGIN = 8
+OVERLAY_WIDTH = 480
+OVERLAY_GRAPH_HEIGHT = 60
+OVERLAY_FONT_SIZE = 10
+OVERLAY_LINE_HEIGHT = 16
+OVERLAY_MAX_SECTIONS = 10
+
+
+# Globals
+# Functions
+def percentile(ordered, fraction):
+    """
+    Nearest rank percentile of an already sorted list of samples
+
+    :param ordered: sorted list of samples, must not be empty
+    :param fraction: percentile as a fraction (0.0 -> 1.0), eg. 0.95 for p95
+
+    :return sample: the sample at the requested percentile
+    """
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+# Classes
+class FrameProfiler:
+    def __init__(self, app, enabled=DEBUG, capacity=PROFILER_CAPACITY, spike_factor=PROFILER_SPIKE_FACTOR):
+        """
+        Initialiser for the FrameProfiler class, a timed section is measured by calling start() before it and stop()
+        after it, when the profiler is disabled start() returns None and stop() returns immediately so the cost of the
+        instrumentation is only a pair of method calls
+
+        :attr _app: reference to the main game app object
+        :attr _enabled: True if timings are being recorded, otherwise False
+        :attr _capacity: number of samples kept in each ring buffer, older samples are discarded
+        :attr _spike_factor: a frame is a spike if its frame time is greater than this multiple of the frame budget
+        :attr _samples: dictionary of game state name to a dictionary of section name to its ring buffer (a
+                        collections.deque) of durations in seconds
+        :attr _counts: dictionary of game state name to a dictionary of count name to its ring buffer of counts, one per
+                       frame
+        :attr _spikes: ring buffer of (game state name, frame time in seconds) tuples, one per spike
+        :attr _overlay_visible: True if the overlay is drawn, otherwise False
+        :attr _overlay_batch: drawing batch for the overlay, built on the first draw
+        :attr _overlay_background: translucent pyglet.shapes.Rectangle behind the overlay
+        :attr _overlay_label: multiline pyglet.text.Label of the percentiles of each section
+        :attr _overlay_bars: list of pyglet.shapes.Rectangle objects, one per sample of the frame time graph
+        :attr _overlay_budget_line: pyglet.shapes.Line across the frame time graph at the frame budget
+        :attr _overlay_refreshed: time (from time.perf_counter()) the overlay was last refreshed
+
+        :param app: main game app object
+        :param enabled: initial enabled state as a boolean
+        :param capacity: number of samples kept in each ring buffer
+        :param spike_factor: multiple of the frame budget above which a frame is a spike
+        """
+        self._app = app
+        self._enabled = enabled
+        self._capacity = capacity
+        self._spike_factor = spike_factor
+        self._samples = {}
+        self._counts = {}
+        self._spikes = collections.deque(maxlen=capacity)
+        self._overlay_visible = enabled
+        self._overlay_batch = None
+        self._overlay_background = None
+        self._overlay_label = None
+        self._overlay_bars = []
+        self._overlay_budget_line = None
+        self._overlay_refreshed = 0.0
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        self._enabled = value
+
+    @property
+    def overlay_visible(self):
+        return self._overlay_visible
+
+    @overlay_visible.setter
+    def overlay_visible(self, value):
+        self._overlay_visible = value
+        self._overlay_refreshed = 0.0
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def spikes(self):
+        return list(self._spikes)
+
+    @property
+    def frame_budget(self):
+        """
+        Time (in seconds) that each frame is expected to take, ie. the interval of the app's redraw scheduler
+
+        :return budget: frame budget in seconds
+        """
+        scheduler = self._app.redraw_scheduler
+        return scheduler.interval if scheduler and scheduler.interval else 1 / DEFAULT_REFRESH_RATE
+
+    def _state_name(self):
+        game_state = self._app.current_game_state
+        return game_state.name if game_state else ""
+
+    def start(self):
+        """
+        Mark the start of a timed section
+
+        :return start: start time to pass to stop(), or None if the profiler is disabled
+        """
+        return time.perf_counter() if self._enabled else None
+
+    def stop(self, section, start):
+        """
+        Mark the end of a timed section and record its duration against the current game state
+
+        :param section: name of the section, eg. "update"
+        :param start: value returned by the matching call to start()
+
+        :return nothing:
+        """
+        if start is not None:
+            self.record(section, time.perf_counter() - start)
+
+    def record(self, section, duration):
+        """
+        Record a duration for a section against the current game state
+
+        :param section: name of the section, eg. "update"
+        :param duration: duration in seconds
+
+        :return nothing:
+        """
+        sections = self._samples.get(self._state_name())
+
+        if sections is None:
+            sections = self._samples[self._state_name()] = {}
+
+        ring = sections.get(section)
+
+        if ring is None:
+            ring = sections[section] = collections.deque(maxlen=self._capacity)
+
+        ring.append(duration)
+
+    def count(self, name, value):
+        """
+        Record a per frame count against the current game state, no-op if the profiler is disabled
+
+        :param name: name of the count, eg. "draw_calls"
+        :param value: count for this frame
+
+        :return nothing:
+        """
+        if not self._enabled:
+            return
+
+        counts = self._counts.get(self._state_name())
+
+        if counts is None:
+            counts = self._counts[self._state_name()] = {}
+
+        ring = counts.get(name)
+
+        if ring is None:
+            ring = counts[name] = collections.deque(maxlen=self._capacity)
+
+        ring.append(value)
+
+    def counts(self, name, state_name=None):
+        """
+        Get the recorded per frame counts of a name
+
+        :param name: name of the count, eg. "draw_calls"
+        :param state_name: name of the game state the counts were recorded against, None for the current game state
+
+        :return counts: list of counts, oldest first
+        """
+        counts = self._counts.get(self._state_name() if state_name is None else state_name, {})
+        return list(counts.get(name, ()))
+
+    def record_frame(self, dt):
+        """
+        Record the time since the previous frame, and a spike if it is too far over the frame budget
+
+        :param dt: delta time in seconds since the previous frame
+
+        :return nothing:
+        """
+        if not self._enabled:
+            return
+
+        self.record("frame", dt)
+
+        if dt > self.frame_budget * self._spike_factor:
+            self._spikes.append((self._state_name(), dt))
+
+    def samples(self, section, state_name=None):
+        """
+        Get the recorded durations of a section
+
+        :param section: name of the section, eg. "update"
+        :param state_name: name of the game state the durations were recorded against, None for the current game state
+
+        :return samples: list of durations in seconds, oldest first
+        """
+        sections = self._samples.get(self._state_name() if state_name is None else state_name, {})
+        return list(sections.get(section, ()))
+
+    def sections(self, state_name=None):
+        """
+        Get the names of all sections recorded against a game state
+
+        :param state_name: name of the game state, None for the current game state
+
+        :return sections: list of section names
+        """
+        return list(self._samples.get(self._state_name() if state_name is None else state_name, {}))
+
+    def percentiles(self, section, state_name=None, fractions=PERCENTILES):
+        """
+        Get percentiles of the recorded durations of a section
+
+        :param section: name of the section, eg. "update"
+        :param state_name: name of the game state, None for the current game state
+        :param fractions: tuple of percentiles as fractions, eg. (0.5, 0.95, 0.99)
+
+        :return percentiles: tuple of durations in seconds (one per fraction), or None if there are no samples
+        """
+        ordered = sorted(self.samples(section, state_name))
+
+        if not ordered:
+            return None
+
+        return tuple(percentile(ordered, fraction) for fraction in fractions)
+
+    def reset(self):
+        """
+        Discard all recorded samples and spikes
+
+        :return nothing:
+        """
+        self._samples.clear()
+        self._counts.clear()
+        self._spikes.clear()
+        self._overlay_refreshed = 0.0
+
+    def invalidate_overlay(self):
+        """
+        Discard the overlay so that it is rebuilt for the current size of the game window when it is next drawn
+
+        :return nothing:
+        """
+        self._overlay_batch = None
+        self._overlay_refreshed = 0.0
+
+    def _build_overlay(self):
+        window = self._app.game_window
+        self._overlay_batch = pyglet.graphics.Batch()
+        background = pyglet.graphics.Group(0)
+        foreground = pyglet.graphics.Group(1)
+
+        height = OVERLAY_GRAPH_HEIGHT + OVERLAY_LINE_HEIGHT * (OVERLAY_MAX_SECTIONS + 3) + OVERLAY_MARGIN * 3
+        top = window.height - OVERLAY_MARGIN
+
+        self._overlay_background = pyglet.shapes.Rectangle(OVERLAY_MARGIN, top - height, OVERLAY_WIDTH, height,
+                                                           color=(0, 0, 0, 192),
+                                                           batch=self._overlay_batch, group=background)
+
+        self._overlay_label = pyglet.text.Label("", font_size=OVERLAY_FONT_SIZE, color=(255, 255, 255, 255),
+                                                x=OVERLAY_MARGIN * 2, y=top - OVERLAY_MARGIN,
+                                                anchor_y="top", width=OVERLAY_WIDTH - OVERLAY_MARGIN * 2,
+                                                multiline=True, batch=self._overlay_batch, group=foreground)
+
+        # One bar per sample of the frame time graph, the budget line marks the frame budget and the graph tops out at
+        # the spike threshold
+        graph_y = top - height + OVERLAY_MARGIN
+        bar_width = (OVERLAY_WIDTH - OVERLAY_MARGIN * 2) / self._capacity
+        self._overlay_bars = [pyglet.shapes.Rectangle(OVERLAY_MARGIN * 2 + index * bar_width, graph_y, bar_width, 0,
+                                                      batch=self._overlay_batch, group=foreground)
+                              for index in range(self._capacity)]
+
+        budget_y = graph_y + OVERLAY_GRAPH_HEIGHT / self._spike_factor
+        self._overlay_budget_line = pyglet.shapes.Line(OVERLAY_MARGIN * 2, budget_y,
+                                                       OVERLAY_WIDTH - OVERLAY_MARGIN, budget_y,
+                                                       color=(255, 255, 0, 255),
+                                                       batch=self._overlay_batch, group=foreground)
+
+    def _refresh_overlay(self):
+        state_name = self._state_name()
+        frame = self.percentiles("frame", state_name)
+        spikes = sum(1 for name, dt in self._spikes if name == state_name)
+
+        lines = ["{0}   fps (p50): {1:.0f}   spikes: {2}".format(state_name, 1 / frame[0] if frame and frame[0] else 0,
+                                                                 spikes),
+                 "draw calls: {0}   state changes: {1}".format(*[(self.counts(name, state_name) or ["-"])[-1]
+                                                                 for name in ("draw_calls", "state_changes")]),
+                 "{0:<24}{1:>10}{2:>10}{3:>10}  ms".format("section", "p50", "p95", "p99")]
+
+        for section in sorted(self.sections(state_name))[:OVERLAY_MAX_SECTIONS]:
+            p50, p95, p99 = self.percentiles(section, state_name)
+            lines.append("{0:<24}{1:>10.2f}{2:>10.2f}{3:>10.2f}".format(section, p50 * 1000, p95 * 1000, p99 * 1000))
+
+        self._overlay_label.text = "\n".join(lines)
+
+        frames = self.samples("frame", state_name)
+        frames = [0.0] * (self._capacity - len(frames)) + frames
+        spike_threshold = self.frame_budget * self._spike_factor
+
+        for bar, dt in zip(self._overlay_bars, frames):
+            bar.height = min(1.0, dt / spike_threshold) * OVERLAY_GRAPH_HEIGHT
+            bar.color = (255, 64, 64, 255) if dt > spike_threshold else (64, 255, 64, 255)
+
+    def draw(self):
+        """
+        Draw the overlay if the profiler is enabled and the overlay is visible, the overlay text and graph are only
+        refreshed at the overlay interval so that drawing it costs little more than a single batch draw
+
+        :return nothing:
+        """
+        if not (self._enabled and self._overlay_visible):
+            return
+
+        if not self._overlay_batch:
+            self._build_overlay()
+
+        now = time.perf_counter()
+
+        if now - self._overlay_refreshed >= PROFILER_OVERLAY_INTERVAL:
+            self._overlay_refreshed = now
+            self._refresh_overlay()
+
+        self._overlay_batch.draw()
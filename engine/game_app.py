@@ -11,20 +11,26 @@ Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leade
 
 # Imports
 import shutil
+import json
 import pyglet
-from configparser import ConfigParser
 from engine.consts import *
-from game_states.gs_splash_screen import GSSplashScreen
-from game_states.gs_main_menu import GSMainMenu
-from game_states.gs_new_game import GSNewGame
-from game_states.gs_load_game import GSLoadGame
-from game_states.gs_options import GSOptions
-from game_states.gs_credits import GSCredits
-from game_states.gs_extras import GSExtras
-from game_states.gs_quit_screen import GSQuitScreen
-from game_states.gs_game_play import GSGamePlay
-from game_states.gs_game_play_menu import GSGamePlayMenu
-from game_states.gs_save_game import GSSaveGame
+from engine.settings import Settings
+from engine.game_loop import GameLoop
+from engine.input_state import InputState
+from engine.frame_profiler import FrameProfiler
+from engine.transition_overlay import TransitionOverlay
+from engine.debug_hud import DebugHUD
+from engine import metrics
+from engine import timer_scheduler
+from engine.hit_mask import HitMask, image_hash
+from engine.tiled_image import TiledImage
+from engine.texture_memory import ImageCache, TextureMemory
+from engine.image_decoder import decode_images, decode_image
+from engine.redraw_scheduler import RedrawScheduler
+from engine.render_graph import RenderGraph
+from engine.game_state_registry import GameStateRegistry
+from fsm.definition import StateMachineDefinition
+from fsm import transition_history
 
 
 # Consts
@@ -37,14 +43,31 @@ class GameApp:
     def __init__(self):
         pyglet.resource.path = [ASSETS_PATH]
         pyglet.resource.reindex()
-        self._app_settings = ConfigParser(strict=False)
+        self._settings = Settings()
         self._game_window = None
-        self._game_states = {}
+        self._game_states = GameStateRegistry(self)
+        self._game_state_definition = None
+        self._game_state_layouts = {}
+        self._transition_table = None
         self._current_game_state = None
-        self._game_object_images = {}
+        self._game_object_images = ImageCache(self._load_texture, evictable=True)
         self._game_object_audio = {}
-        self._ui_object_images = {}
+        self._ui_object_images = ImageCache(self._load_image)
         self._ui_object_audio = {}
+        self._ui_object_hit_masks = {}
+        self._image_trims = {}
+        self._ui_texture_bin = None
+        self._decoded_images = {}
+        self._game_loop = None
+        self._redraw_scheduler = None
+        self._frame_profiler = None
+        # The render graph is created up front (its batch needs no GL context) as game states create their render layers
+        # in it as they are instantiated, which can happen without a game loop, eg. for the startup report
+        self._render_graph = RenderGraph()
+        self._transition_overlay = None
+        self._debug_hud = None
+        self._texture_memory = None
+        self._input_state = InputState()
 
     @property
     def settings_defaults(self):
@@ -53,35 +76,60 @@ class GameApp:
                "width = " + str(DEFAULT_DISPLAY_WIDTH).lower() + "\n" + \
                "height = " + str(DEFAULT_DISPLAY_HEIGHT).lower() + "\n" + \
                "vsync = " + str(DEFAULT_VSYNC).lower() + "\n" + \
-               "fullscreen = " + str(DEFAULT_FULLSCREEN).lower() + "\n\n" + \
+               "fullscreen = " + str(DEFAULT_FULLSCREEN).lower() + "\n" + \
+               "continuous_redraw = " + str(DEFAULT_CONTINUOUS_REDRAW).lower() + "\n" + \
+               "texture_budget = " + str(DEFAULT_TEXTURE_BUDGET).lower() + "\n\n" + \
                "[input]\n\n" + \
                "[key_bindings]\n\n" + \
                "[audio]\n\n" + \
-               "[game_play]\n\n"
+               "[game_play]\n\n" + \
+               "[metrics]\n" + \
+               "export = " + str(DEFAULT_METRICS_EXPORT).lower() + "\n" + \
+               "interval = " + str(DEFAULT_METRICS_EXPORT_INTERVAL).lower() + "\n\n"
+
+    @property
+    def settings(self):
+        return self._settings
 
     @property
     def app_settings(self):
-        return self._app_settings
+        return self._settings.config
 
     @property
     def display_id(self):
-        return self.app_settings["display"].getint("id")
+        return self.settings.get("display", "id")
 
     @property
     def display_width(self):
-        return self.app_settings["display"].getint("width")
+        return self.settings.get("display", "width")
 
     @property
     def display_height(self):
-        return self.app_settings["display"].getint("height")
+        return self.settings.get("display", "height")
 
     @property
     def display_vsync(self):
-        return self.app_settings["display"].getboolean("vsync")
+        return self.settings.get("display", "vsync")
 
     @property
     def display_fullscreen(self):
-        return self.app_settings["display"].getboolean("fullscreen")
+        return self.settings.get("display", "fullscreen")
+
+    @property
+    def display_continuous_redraw(self):
+        return self.settings.get("display", "continuous_redraw")
+
+    @property
+    def display_texture_budget(self):
+        return self.settings.get("display", "texture_budget")
+
+    @property
+    def metrics_export(self):
+        return self.settings.get("metrics", "export")
+
+    @property
+    def metrics_export_interval(self):
+        return self.settings.get("metrics", "interval")
 
     @property
     def game_window(self):
@@ -95,6 +143,18 @@ class GameApp:
     def game_states(self):
         return self._game_states
 
+    @property
+    def game_state_definition(self):
+        return self._game_state_definition
+
+    @property
+    def game_state_layouts(self):
+        return self._game_state_layouts
+
+    @property
+    def transition_table(self):
+        return self._transition_table
+
     @property
     def current_game_state(self):
         return self._current_game_state
@@ -103,6 +163,42 @@ class GameApp:
     def current_game_state(self, value):
         self._current_game_state = value
 
+        # Only the current game state's layers of the render graph are drawn
+        if value:
+            self.render_graph.show_only(value.render_layer)
+
+    @property
+    def game_loop(self):
+        return self._game_loop
+
+    @property
+    def redraw_scheduler(self):
+        return self._redraw_scheduler
+
+    @property
+    def render_graph(self):
+        return self._render_graph
+
+    @property
+    def frame_profiler(self):
+        return self._frame_profiler
+
+    @property
+    def transition_overlay(self):
+        return self._transition_overlay
+
+    @property
+    def debug_hud(self):
+        return self._debug_hud
+
+    @property
+    def texture_memory(self):
+        return self._texture_memory
+
+    @property
+    def input_state(self):
+        return self._input_state
+
     @property
     def game_object_images(self):
         return self._game_object_images
@@ -119,6 +215,10 @@ class GameApp:
     def ui_object_audio(self):
         return self._ui_object_audio
 
+    @property
+    def ui_object_hit_masks(self):
+        return self._ui_object_hit_masks
+
     def _configure(self):
         os_user_data_path = pyglet.resource.get_settings_path("").replace(os.path.sep, "/")
         os_company_path = os_user_data_path + COMPANY_DIR_NAME
@@ -141,48 +241,88 @@ class GameApp:
         pyglet.resource.path.append(self.os_user_settings_path)
         pyglet.resource.reindex()
 
+        self.settings.path = self.os_user_settings_path + SETTINGS_FILENAME
+
         try:
-            self._app_settings.read_string(pyglet.resource.text(SETTINGS_FILENAME).text.lower())
+            self.settings.read_string(pyglet.resource.text(SETTINGS_FILENAME).text.lower())
         except (KeyError, pyglet.resource.ResourceNotFoundException):
             if not os.path.isfile(DEFAULT_SETTINGS_FILENAME):
-                with open(self.os_user_settings_path + SETTINGS_FILENAME, "w") as sf:
-                    self._app_settings.read_string(self.settings_defaults)
-                    self._app_settings.write(sf)
+                self.settings.read_string(self.settings_defaults)
+                self.settings.write()
             else:
-                shutil.copy2(DEFAULT_SETTINGS_FILENAME, self.os_user_settings_path + SETTINGS_FILENAME)
+                shutil.copy2(DEFAULT_SETTINGS_FILENAME, self.settings.path)
 
             pyglet.resource.reindex()
-            self._app_settings.read_string(pyglet.resource.text(SETTINGS_FILENAME).text.lower())
-
-        if not self.app_settings.has_section("display"):
-            self.app_settings.add_section("display")
-
-        if not self.app_settings.has_option("display", "id"):
-            self.app_settings["display"]["id"] = DEFAULT_DISPLAY_ID
-
-        if not self.app_settings.has_option("display", "width"):
-            self.app_settings["display"]["width"] = DEFAULT_DISPLAY_WIDTH
-
-        if not self.app_settings.has_option("display", "height"):
-            self.app_settings["display"]["height"] = DEFAULT_DISPLAY_HEIGHT
-
-        if not self.app_settings.has_option("display", "vsync"):
-            self.app_settings["display"]["vsync"] = DEFAULT_VSYNC
-
-        if not self.app_settings.has_option("display", "fullscreen"):
-            self.app_settings["display"]["fullscreen"] = DEFAULT_FULLSCREEN
-
-        if not self.app_settings.has_section("input"):
-            self.app_settings.add_section("input")
-
-        if not self.app_settings.has_section("key_bindings"):
-            self.app_settings.add_section("key_bindings")
-
-        if not self.app_settings.has_section("audio"):
-            self.app_settings.add_section("audio")
-
-        if not self.app_settings.has_section("game_play"):
-            self.app_settings.add_section("game_play")
+            self.settings.read_string(pyglet.resource.text(SETTINGS_FILENAME).text.lower())
+
+        # Define the type of each setting (so its value is parsed once and then cached) along with its default value,
+        # which is used if the setting is missing from the settings file
+        self.settings.define("display", "id", int, DEFAULT_DISPLAY_ID)
+        self.settings.define("display", "width", int, DEFAULT_DISPLAY_WIDTH)
+        self.settings.define("display", "height", int, DEFAULT_DISPLAY_HEIGHT)
+        self.settings.define("display", "vsync", bool, DEFAULT_VSYNC)
+        self.settings.define("display", "fullscreen", bool, DEFAULT_FULLSCREEN)
+        self.settings.define("display", "continuous_redraw", bool, DEFAULT_CONTINUOUS_REDRAW)
+        self.settings.define("display", "texture_budget", int, DEFAULT_TEXTURE_BUDGET)
+        self.settings.add_section("input")
+        self.settings.add_section("key_bindings")
+        self.settings.add_section("audio")
+        self.settings.add_section("game_play")
+        self.settings.define("metrics", "export", str, DEFAULT_METRICS_EXPORT)
+        self.settings.define("metrics", "interval", float, DEFAULT_METRICS_EXPORT_INTERVAL)
+
+    def _on_display_setting_changed(self, section, option, value):
+        # Settings that can be applied to the running game app take effect as soon as they are changed (eg. from the
+        # options screen), the others take effect the next time the game app is run
+        if option == "continuous_redraw" and self.redraw_scheduler:
+            self.redraw_scheduler.continuous = value
+            self.redraw_scheduler.wake()
+        elif option == "vsync" and self.game_window:
+            self.game_window.set_vsync(value)
+
+            # With vsync the buffer flip paces the frames, without it the clock must (see GameLoop.render_interval)
+            if self.redraw_scheduler:
+                self.redraw_scheduler.interval = self.game_loop.render_interval
+        elif option == "texture_budget" and self.texture_memory:
+            self.texture_memory.budget = value * TEXTURE_BUDGET_UNIT
+        elif option in ("width", "height") and self.game_window:
+            # The width and height are usually changed together, so the resolution change is deferred to the next clock
+            # tick, where both changes are applied at once
+            timer_scheduler.scheduler().schedule(self._apply_display_size, 0, key=(self, "display_size"))
+
+    def _apply_display_size(self):
+        self.change_resolution(self.display_width, self.display_height)
+
+    def _start_metrics(self):
+        # The metrics registry starts disabled, metrics are always recorded during debug, otherwise only if they are
+        # being exported
+        metrics.registry().enabled = DEBUG or self.metrics_export != METRICS_FORMAT_NONE
+
+        if self.metrics_export == METRICS_FORMAT_JSON:
+            metrics.registry().start_exporting(pyglet.clock.get_default(),
+                                               self.os_user_settings_path + METRICS_JSON_FILENAME,
+                                               METRICS_FORMAT_JSON, self.metrics_export_interval)
+        elif self.metrics_export == METRICS_FORMAT_PROMETHEUS:
+            metrics.registry().start_exporting(pyglet.clock.get_default(),
+                                               self.os_user_settings_path + METRICS_PROMETHEUS_FILENAME,
+                                               METRICS_FORMAT_PROMETHEUS, self.metrics_export_interval)
+
+        # Transition firings are counted and timed from the transition history, so that the fsm package does not
+        # depend on the metrics
+        if metrics.registry().enabled:
+            transition_history.history().add_listener(self._on_transition_recorded)
+
+    @staticmethod
+    def _on_transition_recorded(record):
+        labels = {"source": record.source, "target": record.target}
+
+        if record.outcome == transition_history.FIRED:
+            metrics.counter("transitions_fired_total", "Number of transitions fired", labels).inc()
+            metrics.timer("transition_fire_seconds", "Time taken to fire a transition", labels).observe(
+                record.leave_time + record.enter_time)
+        elif record.outcome == transition_history.GUARD_FAILED:
+            metrics.counter("transition_guard_failures_total", "Number of transitions prohibited by their guard",
+                            labels).inc()
 
     def _create_game_window(self):
         self._game_window = pyglet.window.Window(width=self.display_width, height=self.display_height,
@@ -211,220 +351,334 @@ class GameApp:
         # Note that the colour RGB values are 0.0 -> 1.0 and not 0 -> 255, they need to be mapped accordingly
         pyglet.gl.glClearColor(WINDOW_COLOUR_R / 255, WINDOW_COLOUR_G / 255, WINDOW_COLOUR_B / 255, 1.0)
 
+    def _create_game_loop(self):
+        self._frame_profiler = FrameProfiler(self)
+        self._transition_overlay = TransitionOverlay(self)
+        self._debug_hud = DebugHUD(self)
+        self._texture_memory = TextureMemory(self, budget=self.display_texture_budget * TEXTURE_BUDGET_UNIT)
+        self._game_loop = GameLoop(self)
+        self._redraw_scheduler = RedrawScheduler(self, interval=self.game_loop.render_interval,
+                                                 continuous=self.display_continuous_redraw)
+        self.settings.add_listener(self._on_display_setting_changed, "display")
+
     def _build_game_states(self):
-        # Instantiate game state objects
-        game_state = GSSplashScreen("splash_screen", self)
-        self.game_states[game_state.name] = game_state
+        # The game states and the transitions between them are defined in a data file, which is validated as it is
+        # loaded (eg. every game state must be reachable and only the quit screen may be a dead end)
+        with pyglet.resource.file(GAME_STATES_DATA_PATH, "r") as definition_file:
+            self._game_state_definition = StateMachineDefinition.from_file(definition_file)
+
+        # The layout of each game state's game and UI objects is also defined in a data file, each game state builds its
+        # layout from its own definition when it is instantiated
+        with pyglet.resource.file(GAME_STATE_LAYOUTS_DATA_PATH, "r") as layouts_file:
+            self._game_state_layouts = json.load(layouts_file)
+
+        # Register game states, each game state module is only imported (and the game state instantiated) when the
+        # game state is first looked up, ie. when it is first entered or prefetched
+        for name in self.game_state_definition.states:
+            state_data = self.game_state_definition.state_data(name)
+            self.game_states.register(name, state_data["module"], state_data["class"])
 
-        game_state = GSMainMenu("main_menu_screen", self)
-        self.game_states[game_state.name] = game_state
+        # Wire-up game state transitions
+        for source_name, target_name in self.game_state_definition.transitions:
+            self.game_states.add_transition(source_name, target_name)
 
-        game_state = GSNewGame("new_game_screen", self)
-        self.game_states[game_state.name] = game_state
+        # The compiled transitions of the whole game state machine, so that reachability and routes between game states
+        # can be queried by name without loading any game states
+        self._transition_table = self.game_state_definition.table
 
-        game_state = GSLoadGame("load_game_screen", self)
-        self.game_states[game_state.name] = game_state
+    def _anchor_trimmed(self, path, image):
+        trim = self._image_trims.get(path)
 
-        game_state = GSOptions("options_screen", self)
-        self.game_states[game_state.name] = game_state
+        if trim:
+            image.anchor_x = -trim["x"]
+            image.anchor_y = -trim["y"]
 
-        game_state = GSCredits("credits_screen", self)
-        self.game_states[game_state.name] = game_state
+        return image
 
-        game_state = GSExtras("extras_screen", self)
-        self.game_states[game_state.name] = game_state
+    @staticmethod
+    def _image_filename(path):
+        # Image files are decoded by worker processes, so they are given the file's name rather than a pyglet resource
+        return os.path.join(pyglet.resource.location(path).path, path)
 
-        game_state = GSQuitScreen("quit_screen", self)
-        self.game_states[game_state.name] = game_state
+    def _decoded_image(self, path):
+        # The images are decoded ahead of time (in parallel) as the assets are loaded, an image that is loaded again
+        # after being evicted is decoded there and then
+        image = self._decoded_images.get(path)
 
-        game_state = GSGamePlay("game_play_screen", self)
-        self.game_states[game_state.name] = game_state
+        if image is None:
+            image = decode_image(self._image_filename(path))
 
-        game_state = GSGamePlayMenu("game_play_menu_screen", self)
-        self.game_states[game_state.name] = game_state
+        return image
 
-        game_state = GSSaveGame("save_game_screen", self)
-        self.game_states[game_state.name] = game_state
+    def _load_image(self, path):
+        # UI images are small so they are packed into texture atlases, as pyglet.resource.image() would pack them
+        return self._anchor_trimmed(path, self._ui_texture_bin.add(self._decoded_image(path), border=1))
 
-        # Wire-up game state transitions
-        self.game_states["splash_screen"].add_transition(self.game_states["main_menu_screen"])
-        self.game_states["main_menu_screen"].add_transition(self.game_states["new_game_screen"])
-        self.game_states["new_game_screen"].add_transition(self.game_states["main_menu_screen"])
-        self.game_states["new_game_screen"].add_transition(self.game_states["game_play_screen"])
-        self.game_states["main_menu_screen"].add_transition(self.game_states["load_game_screen"])
-        self.game_states["load_game_screen"].add_transition(self.game_states["main_menu_screen"])
-        self.game_states["load_game_screen"].add_transition(self.game_states["game_play_screen"])
-        self.game_states["main_menu_screen"].add_transition(self.game_states["options_screen"])
-        self.game_states["options_screen"].add_transition(self.game_states["main_menu_screen"])
-        self.game_states["main_menu_screen"].add_transition(self.game_states["credits_screen"])
-        self.game_states["credits_screen"].add_transition(self.game_states["main_menu_screen"])
-        self.game_states["main_menu_screen"].add_transition(self.game_states["extras_screen"])
-        self.game_states["extras_screen"].add_transition(self.game_states["main_menu_screen"])
-        self.game_states["main_menu_screen"].add_transition(self.game_states["quit_screen"])
-        self.game_states["game_play_screen"].add_transition(self.game_states["main_menu_screen"])
-        self.game_states["game_play_screen"].add_transition(self.game_states["game_play_menu_screen"])
-        self.game_states["game_play_menu_screen"].add_transition(self.game_states["game_play_screen"])
-        self.game_states["game_play_menu_screen"].add_transition(self.game_states["save_game_screen"])
-        self.game_states["save_game_screen"].add_transition(self.game_states["game_play_menu_screen"])
-        self.game_states["game_play_menu_screen"].add_transition(self.game_states["load_game_screen"])
-        self.game_states["load_game_screen"].add_transition(self.game_states["game_play_menu_screen"])
-        self.game_states["game_play_menu_screen"].add_transition(self.game_states["options_screen"])
-        self.game_states["options_screen"].add_transition(self.game_states["game_play_menu_screen"])
-        self.game_states["game_play_menu_screen"].add_transition(self.game_states["main_menu_screen"])
+    def _load_texture(self, path):
+        # Game object images are the large screens of the game states, each is loaded as its own texture (outside of
+        # the texture atlases) so that evicting it frees its texture memory
+        return self._anchor_trimmed(path, self._decoded_image(path).get_texture())
+
+    def _load_tiled_image(self, path):
+        return TiledImage(self._decoded_image(path))
+
+    def _stored_hit_mask(self, path, stored):
+        # A stored hit mask is only used if it was derived from the image as it is now and in the way the game app would
+        # derive it
+        if not stored or stored["cell_size"] != HIT_MASK_CELL_SIZE or stored["threshold"] != HIT_MASK_ALPHA_THRESHOLD:
+            return None
+
+        with open(self._image_filename(path), "rb") as image_file:
+            if image_hash(image_file.read()) != stored["hash"]:
+                return None
+
+        return HitMask.from_data(stored)
 
     def _load_assets(self):
-        # Load game object images
+        load_timer = metrics.timer("asset_load_seconds", "Time taken to load all game and UI assets")
+        start = load_timer.start()
+
+        # Images trimmed of their transparent borders by the asset pipeline are anchored by their offset within their
+        # original canvas, so that they are drawn (and hit tested) exactly where the untrimmed images would be
+        with pyglet.resource.file(IMAGE_TRIMS_DATA_PATH, "r") as trims_file:
+            self._image_trims = json.load(trims_file)
+
+        # Define game object images, they are loaded together once all the image files have been decoded
         # Common game state game object images
-        self._game_object_images["back_screen"] = pyglet.resource.image(BACK_SCREEN_IMAGE_PATH)
+        self._game_object_images.define("back_screen", BACK_SCREEN_IMAGE_PATH)
 
         # Splash screen game state game object images
-        self._game_object_images["splash_screen"] = pyglet.resource.image(SPLASH_SCREEN_IMAGE_PATH)
+        self._game_object_images.define("splash_screen", SPLASH_SCREEN_IMAGE_PATH)
 
         # Main menu game state game object images
-        self._game_object_images["main_menu_screen"] = pyglet.resource.image(MAIN_MENU_IMAGE_PATH)
+        self._game_object_images.define("main_menu_screen", MAIN_MENU_IMAGE_PATH)
 
         # New game screen game state game object images
-        self._game_object_images["new_game_screen"] = pyglet.resource.image(NEW_GAME_SCREEN_IMAGE_PATH)
+        self._game_object_images.define("new_game_screen", NEW_GAME_SCREEN_IMAGE_PATH)
 
         # Load game screen game state game object images
-        self._game_object_images["load_game_screen"] = pyglet.resource.image(LOAD_GAME_SCREEN_IMAGE_PATH)
+        self._game_object_images.define("load_game_screen", LOAD_GAME_SCREEN_IMAGE_PATH)
 
         # Options screen game state game object images
-        self._game_object_images["options_screen"] = pyglet.resource.image(OPTIONS_SCREEN_IMAGE_PATH)
+        self._game_object_images.define("options_screen", OPTIONS_SCREEN_IMAGE_PATH)
 
         # Credits screen game state game object images
-        self._game_object_images["credits_screen"] = pyglet.resource.image(CREDITS_SCREEN_IMAGE_PATH)
+        self._game_object_images.define("credits_screen", CREDITS_SCREEN_IMAGE_PATH)
 
         # Extras screen game state game object images
-        self._game_object_images["extras_screen"] = pyglet.resource.image(EXTRAS_SCREEN_IMAGE_PATH)
+        self._game_object_images.define("extras_screen", EXTRAS_SCREEN_IMAGE_PATH)
 
         # Quit screen game state game object images
-        self._game_object_images["quit_screen"] = pyglet.resource.image(QUIT_SCREEN_IMAGE_PATH)
+        self._game_object_images.define("quit_screen", QUIT_SCREEN_IMAGE_PATH)
 
         # Game play screen game state game object images
-        self._game_object_images["game_play_screen"] = pyglet.resource.image(GAME_PLAY_SCREEN_IMAGE_PATH)
+        self._game_object_images.define("game_play_screen", GAME_PLAY_SCREEN_IMAGE_PATH)
 
         # Game play menu screen game state game object images
-        self._game_object_images["game_play_menu_mask"] = pyglet.resource.image(GAME_PLAY_MENU_MASK_IMAGE_PATH)
-        self._game_object_images["game_play_menu_screen"] = pyglet.resource.image(GAME_PLAY_MENU_SCREEN_IMAGE_PATH)
+        self._game_object_images.define("game_play_menu_mask", GAME_PLAY_MENU_MASK_IMAGE_PATH)
+        self._game_object_images.define("game_play_menu_screen", GAME_PLAY_MENU_SCREEN_IMAGE_PATH)
 
         # Save game screen game state game object images
-        self._game_object_images["save_game_screen"] = pyglet.resource.image(SAVE_GAME_SCREEN_IMAGE_PATH)
+        self._game_object_images.define("save_game_screen", SAVE_GAME_SCREEN_IMAGE_PATH)
 
-        # Game map game object images
-        self._game_object_images["game_main_board"] = pyglet.resource.image(GAME_MAIN_BOARD_IMAGE_PATH)
+        # Game map game object images, these are decoded (rather than loaded as a single texture) and split into tiles
+        self._game_object_images.define("game_main_board", GAME_MAIN_BOARD_IMAGE_PATH, self._load_tiled_image)
 
-        # Load UI object images
+        # Define UI object images
         # Common UI images
-        self._ui_object_images["btn_missing"] = pyglet.resource.image(BTN_MISSING_IMAGE_PATH)
-        self._ui_object_images["btn_back_d"] = pyglet.resource.image(BTN_BACK_D_IMAGE_PATH)
-        self._ui_object_images["btn_back_e"] = pyglet.resource.image(BTN_BACK_E_IMAGE_PATH)
-        self._ui_object_images["btn_back_h"] = pyglet.resource.image(BTN_BACK_H_IMAGE_PATH)
-        self._ui_object_images["btn_back_p"] = pyglet.resource.image(BTN_BACK_P_IMAGE_PATH)
-        self._ui_object_images["btn_start_d"] = pyglet.resource.image(BTN_START_D_IMAGE_PATH)
-        self._ui_object_images["btn_start_e"] = pyglet.resource.image(BTN_START_E_IMAGE_PATH)
-        self._ui_object_images["btn_start_h"] = pyglet.resource.image(BTN_START_H_IMAGE_PATH)
-        self._ui_object_images["btn_start_p"] = pyglet.resource.image(BTN_START_P_IMAGE_PATH)
-        self._ui_object_images["btn_confirm_d"] = pyglet.resource.image(BTN_CONFIRM_D_IMAGE_PATH)
-        self._ui_object_images["btn_confirm_e"] = pyglet.resource.image(BTN_CONFIRM_E_IMAGE_PATH)
-        self._ui_object_images["btn_confirm_h"] = pyglet.resource.image(BTN_CONFIRM_H_IMAGE_PATH)
-        self._ui_object_images["btn_confirm_p"] = pyglet.resource.image(BTN_CONFIRM_P_IMAGE_PATH)
+        self._ui_object_images.define("btn_missing", BTN_MISSING_IMAGE_PATH)
+        self._ui_object_images.define("btn_back_d", BTN_BACK_D_IMAGE_PATH)
+        self._ui_object_images.define("btn_back_e", BTN_BACK_E_IMAGE_PATH)
+        self._ui_object_images.define("btn_back_h", BTN_BACK_H_IMAGE_PATH)
+        self._ui_object_images.define("btn_back_p", BTN_BACK_P_IMAGE_PATH)
+        self._ui_object_images.define("btn_start_d", BTN_START_D_IMAGE_PATH)
+        self._ui_object_images.define("btn_start_e", BTN_START_E_IMAGE_PATH)
+        self._ui_object_images.define("btn_start_h", BTN_START_H_IMAGE_PATH)
+        self._ui_object_images.define("btn_start_p", BTN_START_P_IMAGE_PATH)
+        self._ui_object_images.define("btn_confirm_d", BTN_CONFIRM_D_IMAGE_PATH)
+        self._ui_object_images.define("btn_confirm_e", BTN_CONFIRM_E_IMAGE_PATH)
+        self._ui_object_images.define("btn_confirm_h", BTN_CONFIRM_H_IMAGE_PATH)
+        self._ui_object_images.define("btn_confirm_p", BTN_CONFIRM_P_IMAGE_PATH)
 
         # Main menu game state UI images
-        self._ui_object_images["main_menu_btn_new_d"] = pyglet.resource.image(MAIN_MENU_BTN_NEW_D_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_new_e"] = pyglet.resource.image(MAIN_MENU_BTN_NEW_E_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_new_h"] = pyglet.resource.image(MAIN_MENU_BTN_NEW_H_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_new_p"] = pyglet.resource.image(MAIN_MENU_BTN_NEW_P_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_load_d"] = pyglet.resource.image(MAIN_MENU_BTN_LOAD_D_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_load_e"] = pyglet.resource.image(MAIN_MENU_BTN_LOAD_E_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_load_h"] = pyglet.resource.image(MAIN_MENU_BTN_LOAD_H_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_load_p"] = pyglet.resource.image(MAIN_MENU_BTN_LOAD_P_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_options_d"] = pyglet.resource.image(MAIN_MENU_BTN_OPTIONS_D_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_options_e"] = pyglet.resource.image(MAIN_MENU_BTN_OPTIONS_E_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_options_h"] = pyglet.resource.image(MAIN_MENU_BTN_OPTIONS_H_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_options_p"] = pyglet.resource.image(MAIN_MENU_BTN_OPTIONS_P_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_credits_d"] = pyglet.resource.image(MAIN_MENU_BTN_CREDITS_D_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_credits_e"] = pyglet.resource.image(MAIN_MENU_BTN_CREDITS_E_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_credits_h"] = pyglet.resource.image(MAIN_MENU_BTN_CREDITS_H_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_credits_p"] = pyglet.resource.image(MAIN_MENU_BTN_CREDITS_P_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_extras_d"] = pyglet.resource.image(MAIN_MENU_BTN_EXTRAS_D_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_extras_e"] = pyglet.resource.image(MAIN_MENU_BTN_EXTRAS_E_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_extras_h"] = pyglet.resource.image(MAIN_MENU_BTN_EXTRAS_H_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_extras_p"] = pyglet.resource.image(MAIN_MENU_BTN_EXTRAS_P_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_quit_d"] = pyglet.resource.image(MAIN_MENU_BTN_QUIT_D_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_quit_e"] = pyglet.resource.image(MAIN_MENU_BTN_QUIT_E_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_quit_h"] = pyglet.resource.image(MAIN_MENU_BTN_QUIT_H_IMAGE_PATH)
-        self._ui_object_images["main_menu_btn_quit_p"] = pyglet.resource.image(MAIN_MENU_BTN_QUIT_P_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_new_d", MAIN_MENU_BTN_NEW_D_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_new_e", MAIN_MENU_BTN_NEW_E_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_new_h", MAIN_MENU_BTN_NEW_H_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_new_p", MAIN_MENU_BTN_NEW_P_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_load_d", MAIN_MENU_BTN_LOAD_D_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_load_e", MAIN_MENU_BTN_LOAD_E_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_load_h", MAIN_MENU_BTN_LOAD_H_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_load_p", MAIN_MENU_BTN_LOAD_P_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_options_d", MAIN_MENU_BTN_OPTIONS_D_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_options_e", MAIN_MENU_BTN_OPTIONS_E_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_options_h", MAIN_MENU_BTN_OPTIONS_H_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_options_p", MAIN_MENU_BTN_OPTIONS_P_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_credits_d", MAIN_MENU_BTN_CREDITS_D_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_credits_e", MAIN_MENU_BTN_CREDITS_E_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_credits_h", MAIN_MENU_BTN_CREDITS_H_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_credits_p", MAIN_MENU_BTN_CREDITS_P_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_extras_d", MAIN_MENU_BTN_EXTRAS_D_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_extras_e", MAIN_MENU_BTN_EXTRAS_E_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_extras_h", MAIN_MENU_BTN_EXTRAS_H_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_extras_p", MAIN_MENU_BTN_EXTRAS_P_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_quit_d", MAIN_MENU_BTN_QUIT_D_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_quit_e", MAIN_MENU_BTN_QUIT_E_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_quit_h", MAIN_MENU_BTN_QUIT_H_IMAGE_PATH)
+        self._ui_object_images.define("main_menu_btn_quit_p", MAIN_MENU_BTN_QUIT_P_IMAGE_PATH)
 
         # Game play menu game state UI images
-        self._ui_object_images["game_play_menu_btn_resume_d"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_RESUME_D_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_resume_e"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_RESUME_E_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_resume_h"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_RESUME_H_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_resume_p"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_RESUME_P_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_save_d"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_SAVE_D_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_save_e"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_SAVE_E_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_save_h"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_SAVE_H_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_save_p"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_SAVE_P_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_load_d"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_LOAD_D_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_load_e"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_LOAD_E_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_load_h"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_LOAD_H_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_load_p"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_LOAD_P_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_options_d"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_OPTIONS_D_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_options_e"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_OPTIONS_E_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_options_h"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_OPTIONS_H_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_options_p"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_OPTIONS_P_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_main_d"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_MAIN_D_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_main_e"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_MAIN_E_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_main_h"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_MAIN_H_IMAGE_PATH)
-        self._ui_object_images["game_play_menu_btn_main_p"] = pyglet.resource.image(
-            GAME_PLAY_MENU_BTN_MAIN_P_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_resume_d", GAME_PLAY_MENU_BTN_RESUME_D_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_resume_e", GAME_PLAY_MENU_BTN_RESUME_E_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_resume_h", GAME_PLAY_MENU_BTN_RESUME_H_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_resume_p", GAME_PLAY_MENU_BTN_RESUME_P_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_save_d", GAME_PLAY_MENU_BTN_SAVE_D_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_save_e", GAME_PLAY_MENU_BTN_SAVE_E_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_save_h", GAME_PLAY_MENU_BTN_SAVE_H_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_save_p", GAME_PLAY_MENU_BTN_SAVE_P_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_load_d", GAME_PLAY_MENU_BTN_LOAD_D_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_load_e", GAME_PLAY_MENU_BTN_LOAD_E_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_load_h", GAME_PLAY_MENU_BTN_LOAD_H_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_load_p", GAME_PLAY_MENU_BTN_LOAD_P_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_options_d", GAME_PLAY_MENU_BTN_OPTIONS_D_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_options_e", GAME_PLAY_MENU_BTN_OPTIONS_E_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_options_h", GAME_PLAY_MENU_BTN_OPTIONS_H_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_options_p", GAME_PLAY_MENU_BTN_OPTIONS_P_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_main_d", GAME_PLAY_MENU_BTN_MAIN_D_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_main_e", GAME_PLAY_MENU_BTN_MAIN_E_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_main_h", GAME_PLAY_MENU_BTN_MAIN_H_IMAGE_PATH)
+        self._ui_object_images.define("game_play_menu_btn_main_p", GAME_PLAY_MENU_BTN_MAIN_P_IMAGE_PATH)
+
+        # Decode all the image files in parallel (decoding is CPU bound) so that loading the images only uploads their
+        # decoded pixels as textures, the UI images are packed into texture atlases of their own
+        self._ui_texture_bin = pyglet.image.atlas.TextureBin()
+        paths = self._game_object_images.paths + self._ui_object_images.paths
+        decoded_images = decode_images(self._image_filename(path) for path in paths)
+        self._decoded_images = {path: decoded_images[self._image_filename(path)] for path in paths}
+        self._game_object_images.load_all()
+        self._ui_object_images.load_all()
+
+        # The hit masks for all UI images are those derived by the asset pipeline, any that are missing or were derived
+        # from an image that has changed since are derived from the image's decoded pixels (rather than reading back the
+        # texture atlases), the same image loaded under different names shares its hit mask
+        with pyglet.resource.file(HIT_MASKS_DATA_PATH, "r") as hit_masks_file:
+            stored_hit_masks = json.load(hit_masks_file)
+
+        hit_masks = {}
+        for name in self._ui_object_images:
+            path = self._ui_object_images.path(name)
+
+            if path not in hit_masks:
+                hit_masks[path] = self._stored_hit_mask(path, stored_hit_masks.get(path)) or \
+                    HitMask.from_image(self._decoded_image(path))
+
+            self._ui_object_hit_masks[name] = hit_masks[path]
+
+        self._decoded_images = {}
+
+        load_timer.stop(start)
+        metrics.gauge("assets_loaded", "Number of loaded assets", {"kind": "game_object_images"}).set(
+            len(self._game_object_images))
+        metrics.gauge("assets_loaded", "Number of loaded assets", {"kind": "ui_object_images"}).set(
+            len(self._ui_object_images))
+
+    def change_resolution(self, width, height):
+        """
+        Change the size of the game window while the game app is running, every loaded game state is laid out again
+        for the new size in a single pass (game states that are not yet loaded are laid out when they are built),
+        layouts cache their placements for each window size so changing back to an earlier size is cheap
+
+        :param width: new width of the game window
+        :param height: new height of the game window
+
+        :return nothing:
+        """
+        if self.game_window.fullscreen:
+            return
+
+        self.game_window.set_size(width, height)
+
+        for game_state in self.game_states.loaded():
+            game_state.apply_layout()
+
+        self.frame_profiler.invalidate_overlay()
+        self.transition_overlay.invalidate()
+
+        if self.current_game_state:
+            self.current_game_state.mark_dirty()
+
+    @property
+    def startup_phases(self):
+        """
+        The phases the game app runs through (in order) before launching into the splash screen game state, each phase
+        is named so that it can be timed individually, eg. by the benchmarks
+
+        :return phases: list of (name, method) tuples
+        """
+        return [("configure", self._configure),
+                ("start_metrics", self._start_metrics),
+                ("create_game_window", self._create_game_window),
+                ("create_game_loop", self._create_game_loop),
+                ("build_game_states", self._build_game_states),
+                ("load_assets", self._load_assets)]
 
     def run(self):
-        self._configure()
-        self._create_game_window()
-        self._build_game_states()
-        self._load_assets()
+        for name, phase in self.startup_phases:
+            phase()
 
         @self.game_window.event
         def on_key_press(symbol, modifiers):
+            # Toggle the frame profiler overlay (only when the profiler is enabled, ie. during debug)
+            if self.frame_profiler.enabled and symbol == getattr(pyglet.window.key, PROFILER_OVERLAY_KEY):
+                self.frame_profiler.overlay_visible = not self.frame_profiler.overlay_visible
+                self.current_game_state.mark_dirty()
+                return pyglet.event.EVENT_HANDLED
+
+            # Toggle the transition history overlay (only during debug)
+            if DEBUG and symbol == getattr(pyglet.window.key, TRANSITION_OVERLAY_KEY):
+                self.transition_overlay.visible = not self.transition_overlay.visible
+                self.current_game_state.mark_dirty()
+                return pyglet.event.EVENT_HANDLED
+
             # If running in window then disable any escaped ESC key press as this will force close on the game window
             if not self.game_window.fullscreen:
                 return pyglet.event.EVENT_HANDLED
 
         @self.game_window.event
         def on_draw():
+            start = self.frame_profiler.start()
             self.current_game_state.draw(self.game_window)
+            self.frame_profiler.stop("draw", start)
+
+            self.frame_profiler.draw()
+            self.transition_overlay.draw()
+            self.debug_hud.draw()
+
+        @self.game_window.event
+        def on_expose():
+            # The game window contents have been damaged (or first shown) so it must be redrawn
+            if self.current_game_state:
+                self.current_game_state.mark_dirty()
 
         @self.game_window.event
         def on_close():
-            with open(self.os_user_settings_path + SETTINGS_FILENAME, "w") as sf:
-                self._app_settings.write(sf)
+            metrics.registry().stop_exporting()
+            transition_history.history().remove_listener(self._on_transition_recorded)
+
+            # Changes to the settings are written on a background thread, write any pending changes now so that none are
+            # lost (and stop applying them to the closing game window)
+            self.settings.remove_listener(self._on_display_setting_changed)
+            self.settings.flush()
 
-        def update(dt):
-            self.current_game_state.update(dt)
+        # Launch into loading game state, while it is shown every other game state is prewarmed (loaded and its objects
+        # built) over the following clock ticks, most likely to be entered first (they are queued before the loading
+        # game state is entered, so that entering it does not evict the images of the game states about to be prewarmed)
+        initial = self.game_state_definition.initial
+        self.game_states.prewarm(*self.transition_table.likely_reachable(initial))
 
-        # Launch into loading game state
-        self.current_game_state = self.game_states["splash_screen"]
+        self.current_game_state = self.game_states[initial]
         self.current_game_state.enter(state=None)
 
-        pyglet.clock.schedule_interval(update, 1 / 120.0)
-        pyglet.app.run()
+        # Updating and redrawing of the game window is driven by the redraw scheduler (which idles whenever the current
+        # game state is not dirty) rather than by pyglet's own fixed rate redraw of all windows
+        self.redraw_scheduler.wake()
+        pyglet.app.run(interval=None)
@@ -0,0 +1,119 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       game_loop.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Game loop class that runs game logic at a fixed timestep (with a bounded catch-up) independently of
+                  the rate at which the game window is rendered
+"""
+
+# Imports
+from engine.consts import *
+
+
+# Consts
+# Globals
+# Functions
+
+
+# Classes
+class GameLoop:
+    def __init__(self, app, timestep=LOGIC_TIMESTEP, max_steps=MAX_LOGIC_STEPS_PER_FRAME):
+        """
+        Initialiser for the GameLoop class
+
+        :attr _app: reference to the main game app object
+        :attr _timestep: fixed timestep (in seconds) that the game logic is always advanced by
+        :attr _max_steps: maximum number of logic steps run for any single rendered frame, any time beyond this is
+                          dropped so that a hitch cannot cause a spiral of ever longer catch-ups
+        :attr _accumulator: unsimulated time (in seconds) carried over from the previous frame
+        :attr _alpha: fraction (0.0 -> 1.0) of a timestep that the rendered frame lies between the previous logic step
+                      and the next one, used to interpolate when drawing
+
+        :param app: main game app object
+        :param timestep: fixed logic timestep in seconds
+        :param max_steps: maximum number of logic steps per rendered frame
+        """
+        self._app = app
+        self._timestep = timestep
+        self._max_steps = max_steps
+        self._accumulator = 0.0
+        self._alpha = 0.0
+
+    @property
+    def timestep(self):
+        return self._timestep
+
+    @property
+    def max_steps(self):
+        return self._max_steps
+
+    @property
+    def alpha(self):
+        return self._alpha
+
+    @property
+    def render_interval(self):
+        """
+        Interval (in seconds) between rendered frames, if vsync is on then this is 0 so that a frame is rendered on
+        every pass of the event loop with the buffer flip pacing it to the display refresh rate, otherwise frames are
+        paced by the clock to the refresh rate of the screen the game window is on
+
+        :return interval: render interval in seconds
+        """
+        if self._app.display_vsync:
+            return 0
+
+        refresh_rate = DEFAULT_REFRESH_RATE
+
+        try:
+            mode = self._app.game_window.screen.get_mode()
+
+            if mode and getattr(mode, "rate", None):
+                refresh_rate = mode.rate
+        except (AttributeError, NotImplementedError):
+            pass
+
+        return 1 / refresh_rate
+
+    def reset(self):
+        """
+        Discard any unsimulated time, use this when the loop restarts after idling
+
+        :return nothing:
+        """
+        self._accumulator = 0.0
+        self._alpha = 0.0
+
+    def advance(self, dt):
+        """
+        Advance the game logic of the current game state by as many whole timesteps as fit in the elapsed time (up to
+        the maximum number of steps) and then set the interpolation factor for the frame about to be drawn
+
+        :param dt: delta time in seconds since the last rendered frame
+
+        :return steps: number of logic steps that were run
+        """
+        game_state = self._app.current_game_state
+        profiler = self._app.frame_profiler
+
+        self._accumulator += min(dt, self._timestep * self._max_steps)
+        steps = 0
+
+        while self._accumulator >= self._timestep and steps < self._max_steps:
+            start = profiler.start()
+            game_state.update(self._timestep)
+            profiler.stop("update", start)
+            self._accumulator -= self._timestep
+            steps += 1
+
+        # Never carry more than a single timestep into the next frame
+        self._accumulator = min(self._accumulator, self._timestep)
+        self._alpha = self._accumulator / self._timestep
+
+        game_state.interpolate(self._alpha)
+
+        return steps
@@ -11,6 +11,7 @@ Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leade
 
 # Imports
 import pyglet
+from engine.render_graph import RenderSpriteGroup
 
 
 # Consts
@@ -20,6 +21,9 @@ import pyglet
 
 # Classes
 class GameSprite(pyglet.sprite.Sprite):
+    # The sprite groups of game sprites stay removable from the batch after their textures are evicted
+    group_class = RenderSpriteGroup
+
     def __init__(self, window=None, active=True, *args, **kwargs):
         """
         Initialiser for the GameSprite class, this is typically used as an abstract class that can be extended
@@ -28,17 +32,54 @@ class GameSprite(pyglet.sprite.Sprite):
 
         :attr _active: is this sprite currently active or inactive, use of this determined by the extended class
 
+        :attr _game_state: game state that currently owns this sprite, this is bound when the game state pushes its
+                           handlers and is used to mark the game state as dirty when this sprite changes
+
         :param window: window object containing this sprite
         :param active: initial active state of this sprite
         """
         super().__init__(*args, **kwargs)
         self._window = window
         self._active = active
+        self._game_state = None
 
     @property
     def window(self):
         return self._window
 
+    @property
+    def game_state(self):
+        return self._game_state
+
+    @game_state.setter
+    def game_state(self, value):
+        self._game_state = value
+
+    @property
+    def images(self):
+        """
+        The images this sprite can show, eg. for accounting the texture memory of a game state, expected to be
+        overridden by derived classes that switch between images
+
+        :return images: list of images
+        """
+        return [self.image]
+
+    def reload_images(self, reload):
+        """
+        Show this sprite's images again after any of them have been evicted from texture memory (see
+        engine.texture_memory.TextureMemory), expected to be overridden by derived classes that switch between images
+
+        :param reload: function called with an image that returns the image to use in its place, ie. the image itself
+                       unless it has been evicted, in which case it is loaded again
+
+        :return nothing:
+        """
+        image = reload(self.image)
+
+        if image is not self.image:
+            self.image = image
+
     @property
     def active(self):
         return self._active
@@ -49,10 +90,20 @@ class GameSprite(pyglet.sprite.Sprite):
             old_value = self.active
             self._active = value
             self.on_active_changed(old_value)
+            self.mark_dirty()
 
     def on_active_changed(self, old_value):
         pass
 
+    def mark_dirty(self):
+        """
+        Call this whenever a change to this sprite means the game window needs to be redrawn
+
+        :return nothing:
+        """
+        if self._game_state:
+            self._game_state.mark_dirty()
+
     def activate(self):
         self.active = True
 
@@ -61,3 +112,6 @@ class GameSprite(pyglet.sprite.Sprite):
 
     def updater(self, dt):
         pass
+
+    def interpolator(self, alpha):
+        pass
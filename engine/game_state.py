@@ -12,6 +12,9 @@ Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leade
 # Imports
 import pyglet
 from engine.consts import *
+from engine.input_router import InputRouter
+from engine.layout import Layout
+from engine import metrics
 from fsm.state import State
 
 
@@ -27,31 +30,53 @@ class GameState(State):
         Initialiser for the GameState class
 
         :attr _app: reference to the main game app object
-        :attr _game_objects_batch: drawing batch for game objects
+        :attr _render_layer: root engine.render_graph.RenderLayer of this game state in the app's render graph, it is
+                             only visible while this is the current game state
+        :attr _game_objects_group: render layer for game objects, drawn beneath the UI objects
+        :attr _game_objects_batch: drawing batch for game objects, ie. the app's render graph batch
         :attr _game_objects: list of all game objects
-        :attr _ui_objects_batch: drawing batch for UI objects
+        :attr _ui_objects_group: render layer for UI objects
+        :attr _ui_objects_batch: drawing batch for UI objects, ie. the app's render graph batch (the same batch as for
+                                 game objects, the objects are kept apart by their render layers)
         :attr _ui_objects: list of all UI objects
-
-        :if DEBUG:
-        :attr _fps_display: used during debug to show fps
+        :attr _layout: engine.layout.Layout of the game and UI objects in design coordinates, built from this game
+                       state's layout definition (if it has one), which also declares any further render layers
+        :attr _input_router: the single event handler pushed onto the game window event stack for this game state, it
+                             routes events to the game state and its game and UI objects
+        :attr _dirty: True if anything in this game state has changed since it was last drawn, ie. the game window needs
+                      to be redrawn, this is used by the app's redraw scheduler to idle when nothing has changed
+        :attr _update_timer: engine.metrics.Timer of the time taken by update()
+        :attr _draw_timer: engine.metrics.Timer of the time taken by draw()
 
         :param name: name of this state as a string
         :param app: main game app object
         """
         super().__init__(name)
         self._app = app
-        self._game_objects_batch = pyglet.graphics.Batch()
+        self._render_layer = app.render_graph.layer(name, visible=False)
+        self._game_objects_group = app.render_graph.layer("game_objects", order=0, parent=self._render_layer)
+        self._game_objects_batch = app.render_graph.batch
         self._game_objects = []
-        self._ui_objects_batch = pyglet.graphics.Batch()
+        self._ui_objects_group = app.render_graph.layer("ui_objects", order=1, parent=self._render_layer)
+        self._ui_objects_batch = app.render_graph.batch
         self._ui_objects = []
-
-        if DEBUG:
-            self._fps_display = pyglet.window.FPSDisplay(self.app.game_window)
+        self._layout = Layout(app.render_graph, {"game_objects": self._game_objects_group,
+                                                 "ui_objects": self._ui_objects_group},
+                              app.game_state_layouts.get(name))
+        self._input_router = InputRouter(self)
+        self._dirty = True
+        self._update_timer = metrics.timer("game_state_update_seconds", "Time taken to update a game state",
+                                           {"state": name})
+        self._draw_timer = metrics.timer("game_state_draw_seconds", "Time taken to draw a game state", {"state": name})
 
     @property
     def app(self):
         return self._app
 
+    @property
+    def render_layer(self):
+        return self._render_layer
+
     @property
     def game_objects(self):
         return self._game_objects
@@ -60,15 +85,124 @@ class GameState(State):
     def ui_objects(self):
         return self._ui_objects
 
+    @property
+    def layout(self):
+        return self._layout
+
+    @property
+    def input_router(self):
+        return self._input_router
+
+    @property
+    def dirty(self):
+        return self._dirty
+
+    @dirty.setter
+    def dirty(self, value):
+        self._dirty = value
+
+    def mark_dirty(self):
+        """
+        Flag that this game state needs to be redrawn, if this is the current game state then the app's redraw scheduler
+        is woken so that the game window is updated and redrawn on its next tick
+
+        :return nothing:
+        """
+        self._dirty = True
+
+        if self.app.current_game_state is self:
+            self.app.redraw_scheduler.wake()
+
+    def build(self):
+        """
+        Build method that instantiates the game and UI objects of this game state, expected to be overridden by derived
+        classes, it is called on every entry into the game state (see enter()) and may also be called ahead of the first
+        entry by the app's prewarming, therefore it must only instantiate objects that are not already instantiated
+
+        :return nothing:
+        """
+        pass
+
+    @property
+    def render_targets(self):
+        """
+        The render targets this game state draws into, eg. for accounting their texture memory, expected to be
+        overridden by derived classes that draw into render targets
+
+        :return render_targets: list of engine.render_target.RenderTarget
+        """
+        return []
+
+    def release_render_targets(self):
+        """
+        Release the render targets of this game state, eg. to free their texture memory while it is inactive, they are
+        created again when next drawn into, expected to be overridden by derived classes that draw into render targets
+
+        :return nothing:
+        """
+        pass
+
+    def apply_layout(self, force=False):
+        """
+        Apply the layout of this game state to the current size of the game window, ie. position and scale all the game
+        and UI objects that have been placed in the layout, this is called at the end of build() and whenever the size
+        of the game window changes
+
+        :param force: if True then the layout is applied even if it has already been applied to the window size
+
+        :return nothing:
+        """
+        window = self.app.game_window
+
+        if self._layout.apply(window.width, window.height, force):
+            # The UI objects have moved so the spatial index of the input router must be rebuilt, straight away if this
+            # is the current game state, otherwise when its handlers are next pushed (ie. when it is next entered)
+            self._input_router.invalidate()
+
+            if self.app.current_game_state is self:
+                self._input_router.refresh()
+
+            self.mark_dirty()
+
+    def push_handlers(self):
+        """
+        Push the input router of this game state onto the event stack of the game window, the router dispatches events
+        to this game state and all its game and UI objects, each object is also bound to this game state so that it can
+        mark this game state as dirty when it changes
+
+        :return nothing:
+        """
+        for obj in self.game_objects:
+            obj.game_state = self
+
+        for obj in self.ui_objects:
+            obj.game_state = self
+
+        self._input_router.refresh()
+        self.app.game_window.push_handlers(self._input_router)
+        self.app.texture_memory.entered(self)
+        self.mark_dirty()
+
+    def pop_handlers(self):
+        """
+        Pop the input router of this game state from the event stack of the game window, this must mirror
+        push_handlers()
+
+        :return nothing:
+        """
+        self.app.game_window.pop_handlers()
+
     def update(self, dt):
         """
         Update method that updates all game and UI objects, note: if overridden by derived classes then this behaviour
         must also be included in any polymorphic version (or use super())
 
-        :param dt: delta time in milliseconds since last update
+        :param dt: delta time in seconds since last update, this is always the fixed logic timestep of the game loop
 
         :return nothing
         """
+        start = self._update_timer.start()
+
         for obj in self.ui_objects:
             if obj.active and obj.enabled:
                 obj.updater(dt)
@@ -77,6 +211,27 @@ class GameState(State):
             if obj.active:
                 obj.updater(dt)
 
+        self._update_timer.stop(start)
+
+    def interpolate(self, alpha):
+        """
+        Interpolate method called once per rendered frame after the game logic has been advanced, it passes on how far
+        the frame lies between the previous and the next logic step to all active game and UI objects so they can
+        smooth their rendered positions, note: if overridden by derived classes then this behaviour must also be
+        included in any polymorphic version (or use super())
+
+        :param alpha: fraction (0.0 -> 1.0) of a logic timestep since the last logic step
+
+        :return nothing:
+        """
+        for obj in self.ui_objects:
+            if obj.active and obj.enabled:
+                obj.interpolator(alpha)
+
+        for obj in self.game_objects:
+            if obj.active:
+                obj.interpolator(alpha)
+
     def draw(self, window):
         """
         Draw method that draws all game and UI objects, note: if overridden by derived classes then this behaviour
@@ -86,9 +241,18 @@ class GameState(State):
 
         :return nothing:
         """
+        profiler = self.app.frame_profiler
+        draw_start = self._draw_timer.start()
+
         window.clear()
-        self._game_objects_batch.draw()
-        self._ui_objects_batch.draw()
 
-        if DEBUG:
-            self._fps_display.draw()
+        # The render graph only draws the layers of the current game state, ie. this game state's game objects and then
+        # its UI objects
+        start = profiler.start()
+        self.app.render_graph.draw(count=profiler.enabled)
+        profiler.stop("batch:render_graph", start)
+
+        profiler.count("draw_calls", self.app.render_graph.draw_calls)
+        profiler.count("state_changes", self.app.render_graph.state_changes)
+
+        self._draw_timer.stop(draw_start)
@@ -0,0 +1,194 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       game_state_registry.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Game state registry class, a dictionary like collection of the game app's game states where each game
+                  state is registered by the name of its module and class and only imported and instantiated when it
+                  is first needed (eg. entered or prefetched), so that startup does not pay for every game state
+"""
+
+# Imports
+import time
+import importlib
+import collections
+import pyglet
+from collections.abc import Mapping
+from engine.consts import *
+from engine import metrics
+
+
+# Consts
+# Globals
+# Functions
+
+
+# Classes
+class GameStateRegistry(Mapping):
+    def __init__(self, app):
+        """
+        Initialiser for the GameStateRegistry class, looking up a game state by name (eg. app.game_states["name"])
+        loads it if it is not already loaded, the transitions between game states are also registered by name and each
+        one is added to its source state as soon as both of its states are loaded, therefore a transition to a game
+        state is always in place by the time that game state has been looked up to be fired to
+
+        :attr _app: reference to the main game app object
+        :attr _registered: dictionary of game state name to its (module name, class name) tuple, in registration order
+        :attr _loaded: dictionary of game state name to its game state object, for those game states that are loaded
+        :attr _transitions: list of (source name, target name) tuples in registration order
+        :attr _import_times: dictionary of game state name to the time taken (in seconds) to import its module and
+                             instantiate it
+        :attr _prewarm_queue: queue (a collections.deque) of names of the game states waiting to be prewarmed
+
+        :param app: main game app object
+        """
+        self._app = app
+        self._registered = {}
+        self._loaded = {}
+        self._transitions = []
+        self._import_times = {}
+        self._prewarm_queue = collections.deque()
+
+    @property
+    def import_times(self):
+        return self._import_times
+
+    def register(self, name, module_name, class_name):
+        """
+        Register a game state without importing its module
+
+        :param name: name of the game state as a string
+        :param module_name: name of the module that contains the game state class, eg. "game_states.gs_main_menu"
+        :param class_name: name of the game state class, eg. "GSMainMenu"
+
+        :return nothing:
+        """
+        self._registered[name] = (module_name, class_name)
+
+    def add_transition(self, source_name, target_name):
+        """
+        Register a transition between two game states, it is added to the source game state once both game states are
+        loaded
+
+        :param source_name: name of the source game state
+        :param target_name: name of the target game state
+
+        :return nothing:
+        """
+        self._transitions.append((source_name, target_name))
+
+        if source_name in self._loaded and target_name in self._loaded:
+            self._loaded[source_name].add_transition(self._loaded[target_name])
+
+    @property
+    def transitions(self):
+        return list(self._transitions)
+
+    def is_loaded(self, name):
+        return name in self._loaded
+
+    def loaded(self):
+        """
+        Get the game states that are currently loaded, without loading any others
+
+        :return game states: list of loaded game state objects
+        """
+        return list(self._loaded.values())
+
+    def prefetch(self, *names):
+        """
+        Load game states ahead of them being needed, eg. the game states that can be moved to from the current one
+
+        :param names: names of the game states to load
+
+        :return nothing:
+        """
+        for name in names:
+            self[name]
+
+    def prewarm(self, *names):
+        """
+        Load game states and build their game and UI objects ahead of them first being entered, so that the first
+        transition to each of them does not cause a frame hitch, the work is spread over clock ticks (one game state per
+        prewarm interval) so that the game window stays responsive while it is done
+
+        :param names: names of the game states to prewarm, in the order they should be prewarmed
+
+        :return nothing:
+        """
+        idle = not self._prewarm_queue
+        self._prewarm_queue.extend(name for name in names if name not in self._prewarm_queue)
+
+        if idle and self._prewarm_queue:
+            pyglet.clock.schedule_once(self._prewarm_tick, PREWARM_INTERVAL)
+
+    @property
+    def prewarming(self):
+        return bool(self._prewarm_queue)
+
+    def _prewarm_tick(self, dt):
+        profiler = self._app.frame_profiler
+        start = profiler.start() if profiler else None
+
+        name = self._prewarm_queue.popleft()
+        self[name].build()
+
+        if profiler:
+            profiler.stop("clock:prewarm", start)
+
+        if self._prewarm_queue:
+            pyglet.clock.schedule_once(self._prewarm_tick, PREWARM_INTERVAL)
+        elif self._app.texture_memory:
+            # Images that no game state shows are kept in texture memory while prewarming (see TextureMemory.enforce())
+            self._app.texture_memory.enforce()
+
+    def targets(self, name):
+        """
+        Get the names of the game states that the named game state has transitions to, without loading any of them
+
+        :param name: name of the source game state
+
+        :return names: list of target game state names
+        """
+        return [target_name for source_name, target_name in self._transitions if source_name == name]
+
+    def _load(self, name):
+        module_name, class_name = self._registered[name]
+
+        start = time.perf_counter()
+        game_state = getattr(importlib.import_module(module_name), class_name)(name, self._app)
+        self._import_times[name] = time.perf_counter() - start
+        metrics.timer("game_state_load_seconds", "Time taken to import and instantiate a game state",
+                      {"state": name}).observe(self._import_times[name])
+
+        self._loaded[name] = game_state
+
+        # Wire up every registered transition that now has both of its game states loaded, in registration order
+        for source_name, target_name in self._transitions:
+            if name in (source_name, target_name) and source_name in self._loaded and target_name in self._loaded:
+                self._loaded[source_name].add_transition(self._loaded[target_name])
+
+        return game_state
+
+    def __getitem__(self, name):
+        game_state = self._loaded.get(name)
+
+        if game_state is None:
+            if name not in self._registered:
+                raise KeyError(name)
+
+            game_state = self._load(name)
+
+        return game_state
+
+    def __contains__(self, name):
+        return name in self._registered
+
+    def __iter__(self):
+        return iter(self._registered)
+
+    def __len__(self):
+        return len(self._registered)
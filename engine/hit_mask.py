@@ -0,0 +1,154 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       hit_mask.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Hit mask class, a compact bitmask derived from an image's alpha channel used for hit testing, hit
+                  masks are derived by the asset pipeline and stored next to the images (see asset_pipeline.py) so
+                  that they need not be derived every time the game starts
+"""
+
+# Imports
+import zlib
+import base64
+import hashlib
+from engine.consts import *
+
+
+# Consts
+# Globals
+# Functions
+def image_hash(data):
+    """
+    Establish the hash of an image file, eg. to tell whether a stored hit mask was derived from the image as it is now
+
+    :param data: bytes of the image file
+
+    :return hash: hex digest of the hash
+    """
+    return hashlib.sha1(data).hexdigest()
+
+
+
+# Classes
+class HitMask:
+    def __init__(self, width, height, cell_size, bits):
+        """
+        Initialiser for the HitMask class, use HitMask.from_image() to derive a hit mask from an image
+
+        :attr _width: width of the source image in pixels
+        :attr _height: height of the source image in pixels
+        :attr _cell_size: size in pixels of the square cell of the source image each bit covers
+        :attr _columns: number of cells across the width of the source image
+        :attr _rows: number of cells up the height of the source image
+        :attr _bits: bytearray of 1 bit per cell, row by row from the bottom of the image, a set bit means the cell
+                     contains at least one pixel that is considered opaque
+
+        :param width: width of the source image in pixels
+        :param height: height of the source image in pixels
+        :param cell_size: size in pixels of the square cell each bit covers
+        :param bits: bytearray of the packed cell bits
+        """
+        self._width = width
+        self._height = height
+        self._cell_size = cell_size
+        self._columns = -(-width // cell_size)
+        self._rows = -(-height // cell_size)
+        self._bits = bits
+
+    @staticmethod
+    def from_image(image, cell_size=HIT_MASK_CELL_SIZE, threshold=HIT_MASK_ALPHA_THRESHOLD):
+        """
+        Derive a hit mask from the alpha channel of the supplied image, a cell is set if any pixel within it has an
+        alpha greater than the threshold
+
+        :param image: pyglet image (or texture) to derive the hit mask from
+        :param cell_size: size in pixels of the square cell each bit covers
+        :param threshold: alpha value (0 -> 255) above which a pixel is considered opaque
+
+        :return hit_mask: new HitMask object
+        """
+        width = image.width
+        height = image.height
+        columns = -(-width // cell_size)
+        rows = -(-height // cell_size)
+        bits = bytearray((columns * rows + 7) // 8)
+
+        # Reduce the alpha channel to a 0 or 1 byte per pixel, rows run from the bottom of the image upwards, the alpha
+        # bytes are sliced out of the image data in its own format (having pyglet convert it to "A" is far slower) and
+        # an image without an alpha channel is opaque throughout
+        opaque = bytes(0 if alpha <= threshold else 1 for alpha in range(256))
+        image_data = image.get_image_data()
+        fmt = image_data.format
+
+        if "A" in fmt:
+            alpha = image_data.get_data(fmt, len(fmt) * width)[fmt.index("A")::len(fmt)].translate(opaque)
+        else:
+            alpha = b"\x01" * (width * height)
+
+        for row in range(rows):
+            # OR together all pixel rows that fall within this row of cells
+            combined = 0
+            for y in range(row * cell_size, min(height, (row + 1) * cell_size)):
+                combined |= int.from_bytes(alpha[y * width:(y + 1) * width], "big")
+
+            combined = combined.to_bytes(width, "big")
+
+            for column in range(columns):
+                if any(combined[column * cell_size:(column + 1) * cell_size]):
+                    index = row * columns + column
+                    bits[index >> 3] |= 1 << (index & 7)
+
+        return HitMask(width, height, cell_size, bits)
+
+    @staticmethod
+    def from_data(data):
+        """
+        Recreate a hit mask from the data returned by to_data(), eg. as stored by the asset pipeline
+
+        :param data: dictionary of the hit mask's data
+
+        :return hit_mask: new HitMask object
+        """
+        return HitMask(data["width"], data["height"], data["cell_size"],
+                       bytearray(zlib.decompress(base64.b64decode(data["bits"]))))
+
+    def to_data(self):
+        """
+        Get the data of this hit mask in a form that can be stored as JSON, the bits are compressed (most cells are set
+        or clear in long runs) and base64 encoded
+
+        :return data: dictionary of "width", "height", "cell_size" and "bits"
+        """
+        return {"width": self._width, "height": self._height, "cell_size": self._cell_size,
+                "bits": base64.b64encode(zlib.compress(bytes(self._bits), 9)).decode("ascii")}
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    def contains(self, x, y):
+        """
+        Returns True if the supplied position falls within an opaque cell of the hit mask
+
+        :param x: x position in unscaled pixels of the source image (0 is the left edge)
+        :param y: y position in unscaled pixels of the source image (0 is the bottom edge)
+
+        :return: True if the position is opaque, otherwise False
+        """
+        if x < 0 or y < 0 or x >= self._width or y >= self._height:
+            return False
+
+        index = (int(y) // self._cell_size) * self._columns + int(x) // self._cell_size
+        return (self._bits[index >> 3] >> (index & 7)) & 1 == 1
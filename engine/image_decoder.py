@@ -0,0 +1,139 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       image_decoder.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Image decoder, decodes the game app's image files in a pool of worker processes as decoding is CPU
+                  bound (pyglet's PNG decoder is pure Python), the decoded pixels of each image are handed back through
+                  a block of shared memory rather than being pickled, so the main process only copies them out of the
+                  shared memory and uploads them as textures
+                - The shared memory blocks are created (and unlinked) by the main process, which keeps them open while
+                  the workers decode into them (on Windows a block is destroyed as soon as no process has it open), each
+                  block is sized from the image's PNG header for the largest decoded form of the image, ie. RGBA
+"""
+
+# Imports
+import os
+import struct
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+import pyglet
+from engine.consts import *
+
+
+# Consts
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+# Globals
+# Functions
+def _init_worker():
+    # A worker process that is started afresh (rather than forked, eg. on Windows and macOS) first imports the main
+    # module, which must itself keep pyglet from creating its shadow window if it imports the game app (see launcher.py),
+    # otherwise this is in time as pyglet.gl is only imported once the worker decodes its first image
+    pyglet.options["shadow_window"] = False
+
+
+def _decoded_size(filename):
+    # The decoded pixels of a PNG image take at most 4 channels (ie. RGBA) of 1 byte, or 2 bytes for a 16 bit image
+    with open(filename, "rb") as image_file:
+        header = image_file.read(26)
+
+    if len(header) < 26 or not header.startswith(PNG_SIGNATURE) or header[12:16] != b"IHDR":
+        return None
+
+    width, height, bit_depth = struct.unpack(">IIB", header[16:25])
+    return width * height * 4 * (2 if bit_depth > 8 else 1)
+
+
+def _decode_into_shared_memory(filename, name):
+    image = decode_image(filename)
+    data = image.get_data(image.format, image.pitch)
+
+    memory = shared_memory.SharedMemory(name=name)
+
+    try:
+        memory.buf[:len(data)] = data
+    finally:
+        memory.close()
+
+    return len(data), image.width, image.height, image.format, image.pitch
+
+
+def decode_image(filename):
+    """
+    Decode a single image file in this process
+
+    :param filename: path of the image file
+
+    :return image: pyglet.image.ImageData object
+    """
+    return pyglet.image.load(filename).get_image_data()
+
+
+def decode_images(filenames, processes=IMAGE_DECODE_PROCESSES):
+    """
+    Decode image files in a pool of worker processes, the images are decoded in this process if there is only a single
+    process to decode them with (eg. on a single core machine) or if worker processes cannot be started, images that are
+    not PNG images (or that a worker failed to decode) are decoded in this process
+
+    :param filenames: paths of the image files
+    :param processes: number of worker processes, 0 for one per CPU core
+
+    :return images: dictionary of path to the decoded image as a pyglet.image.ImageData object
+    """
+    sizes = {filename: _decoded_size(filename) for filename in dict.fromkeys(filenames)}
+    images = {filename: None for filename in sizes}
+    pooled = [filename for filename, size in sizes.items() if size]
+    processes = min(processes or os.cpu_count() or 1, len(pooled))
+
+    if processes > 1:
+        try:
+            # The workers must share this process's resource tracker (rather than each starting one of their own) so
+            # that the shared memory they attach to is only tracked until this process unlinks it, only POSIX systems
+            # track shared memory
+            if os.name == "posix":
+                resource_tracker.ensure_running()
+
+            pool = multiprocessing.Pool(processes, initializer=_init_worker)
+        except OSError:
+            pool = None
+
+        if pool:
+            with pool:
+                memories = {filename: shared_memory.SharedMemory(create=True, size=sizes[filename])
+                            for filename in pooled}
+
+                try:
+                    results = [pool.apply_async(_decode_into_shared_memory, (filename, memories[filename].name))
+                               for filename in pooled]
+
+                    # Each decoded image is copied out of its shared memory (which is then released) as soon as it is
+                    # ready, ie. while the workers are still decoding the images after it
+                    for filename, result in zip(pooled, results):
+                        try:
+                            size, width, height, fmt, pitch = result.get()
+                        except Exception:
+                            # The image is decoded again below, in this process, so that any error is raised from here
+                            continue
+
+                        memory = memories.pop(filename)
+                        images[filename] = pyglet.image.ImageData(width, height, fmt, bytes(memory.buf[:size]), pitch)
+                        memory.close()
+                        memory.unlink()
+                finally:
+                    for memory in memories.values():
+                        memory.close()
+                        memory.unlink()
+
+    for filename, image in images.items():
+        if image is None:
+            images[filename] = decode_image(filename)
+
+    return images
+
+
+# Classes
@@ -0,0 +1,248 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       input_router.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Input router class, the single event handler a game state pushes onto the game window event stack,
+                  it dispatches mouse events only to the UI objects under the cursor (found using a spatial grid) before
+                  passing events on to the game objects and the game state itself
+"""
+
+# Imports
+import pyglet
+from engine.consts import *
+from engine.spatial_grid import SpatialGrid
+
+
+# Consts
+# Globals
+# Functions
+
+
+# Classes
+class InputRouter:
+    def __init__(self, game_state, cell_size=SPATIAL_GRID_CELL_SIZE):
+        """
+        Initialiser for the InputRouter class, the order in which handlers receive an event matches the order they
+        would have had on the game window event stack, ie. UI objects (last added first), then game objects (last added
+        first) and finally the game state, an event stops being dispatched as soon as a handler returns
+        pyglet.event.EVENT_HANDLED
+
+        :attr _game_state: game state whose game and UI objects this router dispatches events to
+        :attr _input_state: the app's engine.input_state.InputState, every input event is recorded in it before being
+                            dispatched
+        :attr _grid: engine.spatial_grid.SpatialGrid of the bounds of the game state's UI objects
+        :attr _priority: dictionary of each UI object to its index in the game state's UI objects list, higher index UI
+                         objects receive events first
+        :attr _hovered: list of UI objects that currently have the mouse inside them, these receive mouse motion events
+                        even when the mouse is no longer within their bounds so that on_mouse_left() fires
+        :attr _stale: True if the spatial grid no longer matches the bounds of the UI objects, ie. it must be rebuilt
+                      before it is next used
+
+        :param game_state: game state to route events for
+        :param cell_size: size in pixels of the cells of the spatial grid
+        """
+        self._game_state = game_state
+        self._input_state = game_state.app.input_state
+        self._grid = SpatialGrid(cell_size)
+        self._priority = {}
+        self._hovered = []
+        self._stale = True
+
+    @property
+    def grid(self):
+        return self._grid
+
+    @property
+    def stale(self):
+        return self._stale
+
+    @property
+    def hovered(self):
+        return self._hovered
+
+    @property
+    def widget_hovered(self):
+        """
+        Use this to establish whether the mouse is currently inside any active and enabled UI object, eg. so game
+        objects beneath the UI can ignore input aimed at the UI
+
+        :return boolean: True if the mouse is inside an active and enabled UI object, otherwise False
+        """
+        for obj in self._hovered:
+            if obj.active and obj.enabled and obj.mouse_inside:
+                return True
+
+        return False
+
+    def invalidate(self):
+        """
+        Flag that the spatial grid must be rebuilt before it is next used, this must be called whenever UI objects are
+        moved or rescaled (eg. when the game state's layout is applied)
+
+        :return nothing:
+        """
+        self._stale = True
+
+    def rebuild(self):
+        """
+        Rebuild the spatial grid from the current bounds of the game state's UI objects
+
+        :return nothing:
+        """
+        self._grid.clear()
+        self._priority.clear()
+
+        for index, obj in enumerate(self._game_state.ui_objects):
+            self._priority[obj] = index
+            self._grid.insert(obj, obj.bounds)
+
+        self._stale = False
+        self._hovered = [obj for obj in self._game_state.ui_objects if obj.mouse_inside]
+
+    def refresh(self):
+        """
+        Bring the router up to date with the game state's UI objects, it is called every time the game state pushes its
+        handlers, the spatial grid is only rebuilt if it has been invalidated or UI objects have been added or removed
+        since it was built, otherwise only the UI objects that have the mouse inside them are found again
+
+        :return nothing:
+        """
+        if self._stale or len(self._priority) != len(self._game_state.ui_objects):
+            self.rebuild()
+        else:
+            self._hovered = [obj for obj in self._game_state.ui_objects if obj.mouse_inside]
+
+    def _widgets_at(self, x, y):
+        widgets = self._grid.query_point(x, y)
+
+        if len(widgets) > 1:
+            widgets.sort(key=self._priority.__getitem__, reverse=True)
+
+        return widgets
+
+    def _dispatch_to(self, handlers, event_type, *args):
+        for handler in handlers:
+            method = getattr(handler, event_type, None)
+
+            if method and method(*args):
+                return pyglet.event.EVENT_HANDLED
+
+        return pyglet.event.EVENT_UNHANDLED
+
+    def _dispatch_to_game(self, event_type, *args):
+        # Game objects and then the game state receive every event that the UI objects did not handle
+        if self._dispatch_to(reversed(self._game_state.game_objects), event_type, *args):
+            return pyglet.event.EVENT_HANDLED
+
+        return self._dispatch_to((self._game_state,), event_type, *args)
+
+    def dispatch(self, event_type, *args):
+        """
+        Dispatch a non positional event (eg. a key press) to all UI objects, game objects and the game state
+
+        :param event_type: name of the event, eg. "on_key_press"
+        :param args: arguments of the event
+
+        :return: pyglet.event.EVENT_HANDLED if any handler handled the event, otherwise pyglet.event.EVENT_UNHANDLED
+        """
+        profiler = self._game_state.app.frame_profiler
+        start = profiler.start()
+
+        handled = self._dispatch_to(reversed(self._game_state.ui_objects), event_type, *args) or \
+            self._dispatch_to_game(event_type, *args)
+
+        profiler.stop("events", start)
+        return handled
+
+    def dispatch_at(self, event_type, x, y, *args):
+        """
+        Dispatch a positional mouse event to only those UI objects under the cursor, then to the game objects and the
+        game state
+
+        :param event_type: name of the event, eg. "on_mouse_press"
+        :param x: x position of the mouse
+        :param y: y position of the mouse
+        :param args: remaining arguments of the event
+
+        :return: pyglet.event.EVENT_HANDLED if any handler handled the event, otherwise pyglet.event.EVENT_UNHANDLED
+        """
+        profiler = self._game_state.app.frame_profiler
+        start = profiler.start()
+
+        handled = self._dispatch_to(self._widgets_at(x, y), event_type, x, y, *args) or \
+            self._dispatch_to_game(event_type, x, y, *args)
+
+        profiler.stop("events", start)
+        return handled
+
+    def on_mouse_motion(self, x, y, dx, dy):
+        self._input_state.on_mouse_motion(x, y, dx, dy)
+
+        profiler = self._game_state.app.frame_profiler
+        start = profiler.start()
+
+        widgets = self._widgets_at(x, y)
+
+        # Previously hovered UI objects that the mouse has moved away from must still see the motion so that they fire
+        # on_mouse_left(), they do not stop the event reaching the UI objects now under the cursor
+        for obj in self._hovered:
+            if obj not in widgets:
+                obj.on_mouse_motion(x, y, dx, dy)
+
+        handled = self._dispatch_to(widgets, "on_mouse_motion", x, y, dx, dy)
+
+        hovered = [obj for obj in widgets if obj.mouse_inside]
+        hovered.extend(obj for obj in self._hovered if obj.mouse_inside and obj not in hovered)
+        self._hovered = hovered
+
+        handled = handled or self._dispatch_to_game("on_mouse_motion", x, y, dx, dy)
+
+        profiler.stop("events", start)
+        return handled
+
+    def on_mouse_press(self, x, y, button, modifiers):
+        self._input_state.on_mouse_press(x, y, button, modifiers)
+        return self.dispatch_at("on_mouse_press", x, y, button, modifiers)
+
+    def on_mouse_release(self, x, y, button, modifiers):
+        self._input_state.on_mouse_release(x, y, button, modifiers)
+        return self.dispatch_at("on_mouse_release", x, y, button, modifiers)
+
+    def on_mouse_drag(self, x, y, dx, dy, buttons, modifiers):
+        self._input_state.on_mouse_drag(x, y, dx, dy, buttons, modifiers)
+        return self.dispatch_at("on_mouse_drag", x, y, dx, dy, buttons, modifiers)
+
+    def on_mouse_scroll(self, x, y, scroll_x, scroll_y):
+        return self.dispatch_at("on_mouse_scroll", x, y, scroll_x, scroll_y)
+
+    def on_mouse_enter(self, x, y):
+        return self.dispatch("on_mouse_enter", x, y)
+
+    def on_mouse_leave(self, x, y):
+        return self.dispatch("on_mouse_leave", x, y)
+
+    def on_key_press(self, symbol, modifiers):
+        self._input_state.on_key_press(symbol, modifiers)
+        return self.dispatch("on_key_press", symbol, modifiers)
+
+    def on_key_release(self, symbol, modifiers):
+        self._input_state.on_key_release(symbol, modifiers)
+        return self.dispatch("on_key_release", symbol, modifiers)
+
+    def on_deactivate(self):
+        # Keys and mouse buttons released while the game window does not have the focus are never seen
+        self._input_state.reset()
+        return self.dispatch("on_deactivate")
+
+    def on_text(self, text):
+        return self.dispatch("on_text", text)
+
+    def on_text_motion(self, motion):
+        return self.dispatch("on_text_motion", motion)
+
+    def on_text_motion_select(self, motion):
+        return self.dispatch("on_text_motion_select", motion)
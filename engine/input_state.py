@@ -0,0 +1,194 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       input_state.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Input state class, the single record of which keys and mouse buttons are held down (kept as compact
+                  bitsets) and where the mouse is, owned by the game app and queried by game states and widgets rather
+                  than each widget tracking the keyboard itself, a snapshot of the input state is taken once per frame
+                  so the update of every widget in that frame reads the same input
+"""
+
+# Imports
+import collections
+from engine.consts import *
+
+
+# Consts
+# Globals
+# Key symbols are given bits in the keys bitset in the order they are first pressed, pyglet key symbols are sparse
+# (eg. the function keys are in the 0xffxx range) so using a symbol as its own bit position would make a large bitset
+_key_bits = {}
+
+
+# Functions
+def _key_bit(symbol):
+    bit = _key_bits.get(symbol)
+
+    if bit is None:
+        bit = _key_bits[symbol] = 1 << len(_key_bits)
+
+    return bit
+
+
+# Classes
+class InputSnapshot(collections.namedtuple("InputSnapshot", ["keys", "buttons", "modifiers", "mouse_x", "mouse_y"])):
+    """
+    Snapshot of the input state taken at the start of a frame
+
+    :attr keys: bitset of the keys held down, use key_pressed() to test for a key
+    :attr buttons: bitset of the mouse buttons held down, ie. pyglet.window.mouse button values or'd together
+    :attr modifiers: bitset of the modifier keys held down, ie. pyglet.window.key modifier values or'd together
+    :attr mouse_x: x position of the mouse in the game window
+    :attr mouse_y: y position of the mouse in the game window
+    """
+    __slots__ = ()
+
+    def key_pressed(self, symbol):
+        bit = _key_bits.get(symbol)
+        return bit is not None and bool(self.keys & bit)
+
+    def button_pressed(self, button):
+        return bool(self.buttons & button)
+
+
+class InputState:
+    def __init__(self):
+        """
+        Initialiser for the InputState class, the current game state's input router passes every input event to the
+        input state before dispatching it (see engine.input_router.InputRouter), so the input state sees events even
+        when a handler handles them, it never handles events itself
+
+        :attr _keys: bitset of the keys currently held down
+        :attr _buttons: bitset of the mouse buttons currently held down
+        :attr _modifiers: bitset of the modifier keys currently held down
+        :attr _mouse_x: current x position of the mouse
+        :attr _mouse_y: current y position of the mouse
+        :attr _frame: number of snapshots captured, ie. frames
+        :attr _snapshot: engine.input_state.InputSnapshot captured at the start of the current frame
+        :attr _changed: True if the input has changed since the snapshot was captured, otherwise the snapshot is reused
+        """
+        self._keys = 0
+        self._buttons = 0
+        self._modifiers = 0
+        self._mouse_x = 0
+        self._mouse_y = 0
+        self._frame = 0
+        self._snapshot = InputSnapshot(0, 0, 0, 0, 0)
+        self._changed = False
+
+    @property
+    def keys(self):
+        return self._keys
+
+    @property
+    def buttons(self):
+        return self._buttons
+
+    @property
+    def modifiers(self):
+        return self._modifiers
+
+    @property
+    def mouse_x(self):
+        return self._mouse_x
+
+    @property
+    def mouse_y(self):
+        return self._mouse_y
+
+    @property
+    def frame(self):
+        return self._frame
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def key_pressed(self, symbol):
+        """
+        Check whether a key is currently held down, during an update use the snapshot instead so that every widget
+        sees the same input for the frame
+
+        :param symbol: pyglet.window.key symbol of the key
+
+        :return boolean: True if the key is held down, otherwise False
+        """
+        bit = _key_bits.get(symbol)
+        return bit is not None and bool(self._keys & bit)
+
+    def button_pressed(self, button):
+        """
+        Check whether a mouse button is currently held down
+
+        :param button: pyglet.window.mouse button, eg. pyglet.window.mouse.LEFT
+
+        :return boolean: True if the button is held down, otherwise False
+        """
+        return bool(self._buttons & button)
+
+    def capture(self):
+        """
+        Capture the snapshot for a new frame, called once per frame by the app's redraw scheduler before the game
+        logic is advanced, the previous snapshot is kept if the input has not changed since it was captured
+
+        :return snapshot: engine.input_state.InputSnapshot object
+        """
+        self._frame += 1
+
+        if self._changed:
+            self._changed = False
+            self._snapshot = InputSnapshot(self._keys, self._buttons, self._modifiers, self._mouse_x, self._mouse_y)
+
+        return self._snapshot
+
+    def reset(self):
+        """
+        Release all keys and mouse buttons, eg. when the game window loses the focus and so will not see them being
+        released
+
+        :return nothing:
+        """
+        self._keys = 0
+        self._buttons = 0
+        self._modifiers = 0
+        self._changed = True
+
+    def on_key_press(self, symbol, modifiers):
+        self._keys |= _key_bit(symbol)
+        self._modifiers = modifiers
+        self._changed = True
+
+    def on_key_release(self, symbol, modifiers):
+        self._keys &= ~_key_bit(symbol)
+        self._modifiers = modifiers
+        self._changed = True
+
+    def on_mouse_motion(self, x, y, dx, dy):
+        self._mouse_x = x
+        self._mouse_y = y
+        self._changed = True
+
+    def on_mouse_drag(self, x, y, dx, dy, buttons, modifiers):
+        self._mouse_x = x
+        self._mouse_y = y
+        self._buttons = buttons
+        self._modifiers = modifiers
+        self._changed = True
+
+    def on_mouse_press(self, x, y, button, modifiers):
+        self._mouse_x = x
+        self._mouse_y = y
+        self._buttons |= button
+        self._modifiers = modifiers
+        self._changed = True
+
+    def on_mouse_release(self, x, y, button, modifiers):
+        self._mouse_x = x
+        self._mouse_y = y
+        self._buttons &= ~button
+        self._modifiers = modifiers
+        self._changed = True
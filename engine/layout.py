@@ -0,0 +1,340 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       layout.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Layout class, the retained layout of a game state's sprites in design coordinates (ie. pixels of the
+                  design resolution that the screen images are drawn at), when applied to a window size the layout sets
+                  the position and scale of every sprite and rescales the hit area of every UI sprite in a single pass,
+                  the window coordinates computed for each window size are cached so that switching back to a window
+                  size that has been used before does no layout computation
+                - A layout is described declaratively by a layout definition (see assets/data/layouts.json), which is a
+                  dictionary of:
+                    "layers": dictionary of layer name to {"parent": parent layer name, "order": drawing order}, these
+                              are render layers beneath the game state's own "game_objects" and "ui_objects" layers
+                              (or beneath an earlier declared layer)
+                    "items": dictionary of item name to {"layer": layer name, "x": x, "y": y, "anchor": anchor name,
+                             "width": width, "height": height, "fill": boolean}, all optional, an item with no position
+                             only names the layer of its sprite (eg. an object that lays itself out)
+                - Anchors are the point of the window that an item keeps its distance from (in design pixels scaled by
+                  the smaller of the horizontal and vertical scales) when the window is not the design aspect ratio,
+                  eg. a "bottom_right" button stays in the bottom right corner and is not stretched out of shape, at the
+                  design aspect ratio every anchor gives the same placement
+"""
+
+# Imports
+from engine.consts import *
+
+
+# Consts
+ANCHORS = {
+    "bottom_left": (0.0, 0.0),
+    "bottom": (0.5, 0.0),
+    "bottom_right": (1.0, 0.0),
+    "left": (0.0, 0.5),
+    "center": (0.5, 0.5),
+    "right": (1.0, 0.5),
+    "top_left": (0.0, 1.0),
+    "top": (0.5, 1.0),
+    "top_right": (1.0, 1.0)
+}
+
+DEFAULT_LAYER = "game_objects"
+DEFAULT_ANCHOR = "bottom_left"
+
+
+# Globals
+# Functions
+
+
+# Classes
+class LayoutItem:
+    __slots__ = ("sprite", "x", "y", "width", "height", "anchor")
+
+    def __init__(self, sprite, x, y, width=None, height=None, anchor=DEFAULT_ANCHOR):
+        """
+        Initialiser for the LayoutItem class, the placement of a single sprite in design coordinates
+
+        :attr sprite: sprite placed by this item
+        :attr x: x position in design coordinates
+        :attr y: y position in design coordinates
+        :attr width: width in design coordinates that the sprite's image is stretched to, None to keep the image's own
+                     width (ie. the sprite is scaled by the layout scale only)
+        :attr height: height in design coordinates that the sprite's image is stretched to, None to keep the image's
+                      own height
+        :attr anchor: (x fraction, y fraction) tuple of the point of the window the sprite is anchored to, see ANCHORS
+
+        :exception KeyError: raised if the anchor is not a known anchor name
+        """
+        self.sprite = sprite
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.anchor = ANCHORS[anchor]
+
+
+class Layout:
+    def __init__(self, render_graph=None, layers=None, definition=None, design_width=DESIGN_WIDTH,
+                 design_height=DESIGN_HEIGHT):
+        """
+        Initialiser for the Layout class
+
+        :attr _design_width: width of the design resolution
+        :attr _design_height: height of the design resolution
+        :attr _layers: dictionary of layer name to engine.render_graph.RenderLayer, ie. the given layers followed by the
+                       layers declared by the definition
+        :attr _specs: dictionary of item name to its item definition (see the module notes)
+        :attr _items: dictionary of sprite to its engine.layout.LayoutItem, in the order the sprites were placed
+        :attr _listeners: list of functions called with the window size whenever the layout is applied, for objects
+                          that lay themselves out (eg. the game main board, which the player pans and zooms)
+        :attr _cache: dictionary of (window width, window height) tuple to the computed placements for that window size,
+                      a list of (sprite, x, y, scale x, scale y, width, height) tuples in window coordinates where width
+                      and height are None if the sprite keeps its image's own size
+        :attr _applied: window size the layout was last applied to, None if it has not been applied since it changed
+
+        :param render_graph: engine.render_graph.RenderGraph to create the declared layers in, only needed if the
+                             definition declares layers
+        :param layers: dictionary of layer name to the existing RenderLayer objects that items and declared layers may
+                       be put in, eg. a game state's "game_objects" and "ui_objects" layers
+        :param definition: layout definition dictionary, see the module notes for its format
+        :param design_width: width of the design resolution
+        :param design_height: height of the design resolution
+
+        :exception KeyError: raised if the definition refers to a layer that does not exist
+        """
+        definition = definition or {}
+
+        self._design_width = design_width
+        self._design_height = design_height
+        self._layers = dict(layers or {})
+        self._specs = dict(definition.get("items", {}))
+        self._items = {}
+        self._listeners = []
+        self._cache = {}
+        self._applied = None
+
+        # Declared layers are created in the order they are declared, so a layer's parent must be declared before it
+        for name, spec in definition.get("layers", {}).items():
+            parent = self._layers[spec.get("parent", DEFAULT_LAYER)]
+            self._layers[name] = render_graph.layer(name, order=spec.get("order", 0), parent=parent)
+
+        for name, spec in self._specs.items():
+            layer = spec.get("layer", DEFAULT_LAYER)
+
+            if layer not in self._layers:
+                raise KeyError("layout item {0} is in unknown layer {1}".format(name, layer))
+
+    @property
+    def design_width(self):
+        return self._design_width
+
+    @property
+    def design_height(self):
+        return self._design_height
+
+    @property
+    def layers(self):
+        return self._layers
+
+    @property
+    def items(self):
+        return list(self._items.values())
+
+    @property
+    def applied(self):
+        return self._applied
+
+    def layer(self, name):
+        """
+        Get a layer of this layout by its name
+
+        :param name: name of the layer, eg. "ui_objects"
+
+        :return layer: engine.render_graph.RenderLayer object
+
+        :exception KeyError: raised if there is no such layer
+        """
+        return self._layers[name]
+
+    def group(self, name):
+        """
+        Get the layer that a defined item is drawn in, ie. the group to create the item's sprite with
+
+        :param name: name of the item as given in the layout definition
+
+        :return layer: engine.render_graph.RenderLayer object
+
+        :exception KeyError: raised if the item is not defined
+        """
+        return self._layers[self._specs[name].get("layer", DEFAULT_LAYER)]
+
+    def bind(self, name, sprite):
+        """
+        Place a sprite as a defined item (replacing any previous placement of the sprite), an item defined without a
+        position only names the sprite's layer and so the sprite is not placed
+
+        :param name: name of the item as given in the layout definition
+        :param sprite: sprite to place
+
+        :return item: engine.layout.LayoutItem object, None if the item has no position
+
+        :exception KeyError: raised if the item is not defined
+        """
+        spec = self._specs[name]
+
+        if spec.get("fill"):
+            return self.fill(sprite)
+
+        if "x" not in spec and "y" not in spec:
+            return None
+
+        return self.place(sprite, spec.get("x", 0), spec.get("y", 0), spec.get("width"), spec.get("height"),
+                          spec.get("anchor", DEFAULT_ANCHOR))
+
+    def place(self, sprite, x=0, y=0, width=None, height=None, anchor=DEFAULT_ANCHOR):
+        """
+        Place a sprite (replacing any previous placement of it), the placement takes effect the next time the layout is
+        applied
+
+        :param sprite: sprite to place
+        :param x: x position in design coordinates
+        :param y: y position in design coordinates
+        :param width: width in design coordinates to stretch the sprite's image to, None to keep the image's own width
+        :param height: height in design coordinates to stretch the sprite's image to, None to keep the image's own
+                       height
+        :param anchor: name of the point of the window the sprite is anchored to, see ANCHORS
+
+        :return item: engine.layout.LayoutItem object
+        """
+        item = self._items[sprite] = LayoutItem(sprite, x, y, width, height, anchor)
+        self.invalidate()
+        return item
+
+    def fill(self, sprite):
+        """
+        Place a sprite so that it fills the whole window, eg. a screen background
+
+        :param sprite: sprite to place
+
+        :return item: engine.layout.LayoutItem object
+        """
+        return self.place(sprite, 0, 0, self._design_width, self._design_height)
+
+    def remove(self, sprite):
+        """
+        Remove the placement of a sprite, no-op if the sprite is not placed
+
+        :param sprite: sprite to remove
+
+        :return nothing:
+        """
+        if self._items.pop(sprite, None):
+            self.invalidate()
+
+    def add_listener(self, callback):
+        """
+        Add a function to be called with the window size (as width, height) whenever the layout is applied
+
+        :param callback: function to call
+
+        :return nothing:
+        """
+        self._listeners.append(callback)
+
+    def invalidate(self):
+        """
+        Discard the cached placements, eg. when a placement changes
+
+        :return nothing:
+        """
+        self._cache.clear()
+        self._applied = None
+
+    def compute(self, width, height):
+        """
+        Compute (or get from the cache) the placements of the sprites for a window size, stretched sprites are stretched
+        with the window while other sprites keep their aspect ratio and their distance from their anchor
+
+        :param width: width of the window
+        :param height: height of the window
+
+        :return placements: list of (sprite, x, y, scale x, scale y, width, height) tuples in window coordinates
+        """
+        placements = self._cache.get((width, height))
+
+        if placements is None:
+            scale_x = width / self._design_width
+            scale_y = height / self._design_height
+            scale = min(scale_x, scale_y)
+            placements = self._cache[(width, height)] = []
+
+            for item in self._items.values():
+                if item.width is not None or item.height is not None:
+                    placements.append((item.sprite, item.x * scale_x, item.y * scale_y, scale_x, scale_y,
+                                       None if item.width is None else item.width * scale_x,
+                                       None if item.height is None else item.height * scale_y))
+                else:
+                    anchor_x, anchor_y = item.anchor
+                    placements.append((item.sprite,
+                                       anchor_x * width + (item.x - anchor_x * self._design_width) * scale,
+                                       anchor_y * height + (item.y - anchor_y * self._design_height) * scale,
+                                       scale, scale, None, None))
+
+        return placements
+
+    def apply(self, width, height, force=False):
+        """
+        Set the position and scale of every placed sprite (and rescale the hit area of every UI sprite) for a window
+        size, this is a no-op if the layout has already been applied to that window size and nothing has changed since
+
+        :param width: width of the window
+        :param height: height of the window
+        :param force: if True then the layout is applied even if it has already been applied to the window size
+
+        :return boolean: True if the layout was applied, otherwise False
+        """
+        if not force and self._applied == (width, height):
+            return False
+
+        for placement in self.compute(width, height):
+            self._apply_placement(*placement)
+
+        for callback in self._listeners:
+            callback(width, height)
+
+        self._applied = (width, height)
+        return True
+
+    def refresh(self, sprite):
+        """
+        Apply the current placement of a single sprite again, eg. after its image has changed size
+
+        :param sprite: sprite to refresh
+
+        :return nothing:
+        """
+        if self._applied:
+            for placement in self.compute(*self._applied):
+                if placement[0] is sprite:
+                    self._apply_placement(*placement)
+                    break
+
+    @staticmethod
+    def _apply_placement(sprite, x, y, scale_x, scale_y, width, height):
+        # Stretched sprites are scaled from their current image's size, which can differ from placement to placement
+        if width is not None:
+            scale_x = width / sprite.image.width
+
+        if height is not None:
+            scale_y = height / sprite.image.height
+
+        # UI sprites must rescale their hit area along with their image
+        if hasattr(sprite, "change_scale"):
+            sprite.update(x=x, y=y)
+            sprite.change_scale(scale_x, scale_y)
+        else:
+            sprite.update(x=x, y=y, scale_x=scale_x, scale_y=scale_y)
@@ -0,0 +1,454 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       metrics.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Lightweight metrics (counters, gauges and timers) for the hot paths of the game, these can be
+                  exported on an interval as JSON lines or as a Prometheus text file so that event handling latency
+                  and asset load times can be seen without attaching a profiler, this module does not depend on pyglet
+                  (the clock to export on is passed in) so that the data model can record metrics without it
+                - The registry used by the game app is disabled until the game app enables it (see
+                  engine.game_app.GameApp), so metrics recorded outside the game (eg. by scripts using the data model)
+                  cost nothing
+"""
+
+# Imports
+import os
+import json
+import time
+import bisect
+from engine.consts import *
+
+
+# Consts
+COUNTER = "counter"
+GAUGE = "gauge"
+TIMER = "timer"
+
+
+# Globals
+# Functions
+def _label_key(labels):
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+
+    if not pairs:
+        return ""
+
+    return "{" + ",".join('{0}="{1}"'.format(name, str(value).replace('"', '\\"')) for name, value in pairs) + "}"
+
+
+# Classes
+class Counter:
+    def __init__(self, registry, name, labels):
+        """
+        Initialiser for the Counter class, a counter only ever goes up, use Metrics.counter() to create one
+
+        :attr _registry: the engine.metrics.Metrics registry this counter belongs to
+        :attr _name: name of the metric
+        :attr _labels: tuple of sorted (label name, label value) tuples
+        :attr _value: current count
+
+        :param registry: registry this counter belongs to
+        :param name: name of the metric
+        :param labels: tuple of sorted (label name, label value) tuples
+        """
+        self._registry = registry
+        self._name = name
+        self._labels = labels
+        self._value = 0
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def labels(self):
+        return self._labels
+
+    @property
+    def value(self):
+        return self._value
+
+    def inc(self, amount=1):
+        """
+        Increase the count, no-op if the registry is disabled
+
+        :param amount: amount to increase the count by
+
+        :return nothing:
+        """
+        if self._registry.enabled:
+            self._value += amount
+
+    def snapshot(self):
+        return {"value": self._value}
+
+
+class Gauge:
+    def __init__(self, registry, name, labels):
+        """
+        Initialiser for the Gauge class, a gauge holds a value that can go up or down, use Metrics.gauge() to create one
+
+        :attr _registry: the engine.metrics.Metrics registry this gauge belongs to
+        :attr _name: name of the metric
+        :attr _labels: tuple of sorted (label name, label value) tuples
+        :attr _value: current value
+
+        :param registry: registry this gauge belongs to
+        :param name: name of the metric
+        :param labels: tuple of sorted (label name, label value) tuples
+        """
+        self._registry = registry
+        self._name = name
+        self._labels = labels
+        self._value = 0
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def labels(self):
+        return self._labels
+
+    @property
+    def value(self):
+        return self._value
+
+    def set(self, value):
+        """
+        Set the value, no-op if the registry is disabled
+
+        :param value: new value
+
+        :return nothing:
+        """
+        if self._registry.enabled:
+            self._value = value
+
+    def snapshot(self):
+        return {"value": self._value}
+
+
+class Timer:
+    def __init__(self, registry, name, labels, buckets=METRICS_TIMER_BUCKETS):
+        """
+        Initialiser for the Timer class, a timer records durations into a histogram of fixed buckets, use
+        Metrics.timer() to create one, a duration is measured by calling start() before the timed code and stop()
+        after it
+
+        :attr _registry: the engine.metrics.Metrics registry this timer belongs to
+        :attr _name: name of the metric
+        :attr _labels: tuple of sorted (label name, label value) tuples
+        :attr _buckets: tuple of ascending bucket upper bounds in seconds
+        :attr _bucket_counts: list of number of durations that fell in each bucket, the final entry counts durations
+                              above the largest bucket
+        :attr _count: number of durations recorded
+        :attr _sum: total of all durations recorded in seconds
+        :attr _max: longest duration recorded in seconds
+
+        :param registry: registry this timer belongs to
+        :param name: name of the metric
+        :param labels: tuple of sorted (label name, label value) tuples
+        :param buckets: tuple of ascending bucket upper bounds in seconds
+        """
+        self._registry = registry
+        self._name = name
+        self._labels = labels
+        self._buckets = buckets
+        self._bucket_counts = [0] * (len(buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def labels(self):
+        return self._labels
+
+    @property
+    def buckets(self):
+        return self._buckets
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def sum(self):
+        return self._sum
+
+    @property
+    def max(self):
+        return self._max
+
+    def start(self):
+        """
+        Mark the start of a timed duration
+
+        :return start: start time to pass to stop(), or None if the registry is disabled
+        """
+        return time.perf_counter() if self._registry.enabled else None
+
+    def stop(self, start):
+        """
+        Mark the end of a timed duration and record it
+
+        :param start: value returned by the matching call to start()
+
+        :return nothing:
+        """
+        if start is not None:
+            self.observe(time.perf_counter() - start)
+
+    def observe(self, duration):
+        """
+        Record a duration, no-op if the registry is disabled
+
+        :param duration: duration in seconds
+
+        :return nothing:
+        """
+        if not self._registry.enabled:
+            return
+
+        self._bucket_counts[bisect.bisect_left(self._buckets, duration)] += 1
+        self._count += 1
+        self._sum += duration
+
+        if duration > self._max:
+            self._max = duration
+
+    def snapshot(self):
+        return {"count": self._count, "sum": self._sum, "max": self._max,
+                "buckets": dict(zip([str(bucket) for bucket in self._buckets] + ["+Inf"], self._bucket_counts))}
+
+
+class Metrics:
+    def __init__(self, enabled=True):
+        """
+        Initialiser for the Metrics class, the registry of all metrics, metrics are normally created once (eg. when the
+        owning object is created) and then updated on the hot path, requesting the same name and labels again returns
+        the existing metric
+
+        :attr _enabled: True if metrics are being recorded, otherwise False, when False counters and gauges do not
+                        change and timers do not read the clock
+        :attr _families: dictionary of metric name to a (type, help text, dictionary of label key to metric) tuple
+        :attr _export_path: path of the file metrics are exported to, None if not exporting
+        :attr _export_format: format metrics are exported in, either METRICS_FORMAT_JSON or METRICS_FORMAT_PROMETHEUS
+        :attr _export_clock: pyglet.clock.Clock the metrics are exported on, None if not exporting
+
+        :param enabled: initial enabled state as a boolean
+        """
+        self._enabled = enabled
+        self._families = {}
+        self._export_path = None
+        self._export_format = None
+        self._export_clock = None
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        self._enabled = value
+
+    @property
+    def exporting(self):
+        return self._export_path is not None
+
+    def _metric(self, metric_type, metric_class, name, help_text, labels):
+        family = self._families.get(name)
+
+        if family is None:
+            family = self._families[name] = (metric_type, help_text, {})
+        elif family[0] != metric_type:
+            raise ValueError("metric {0} is already registered as a {1}".format(name, family[0]))
+
+        key = _label_key(labels)
+        metric = family[2].get(key)
+
+        if metric is None:
+            metric = family[2][key] = metric_class(self, name, key)
+
+        return metric
+
+    def counter(self, name, help_text="", labels=None):
+        """
+        Get (creating if need be) a counter
+
+        :param name: name of the metric, by convention counters end in "_total"
+        :param help_text: description of the metric
+        :param labels: dictionary of label name to label value, or None for no labels
+
+        :return counter: engine.metrics.Counter object
+        """
+        return self._metric(COUNTER, Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text="", labels=None):
+        """
+        Get (creating if need be) a gauge
+
+        :param name: name of the metric
+        :param help_text: description of the metric
+        :param labels: dictionary of label name to label value, or None for no labels
+
+        :return gauge: engine.metrics.Gauge object
+        """
+        return self._metric(GAUGE, Gauge, name, help_text, labels)
+
+    def timer(self, name, help_text="", labels=None):
+        """
+        Get (creating if need be) a timer
+
+        :param name: name of the metric, by convention timers end in "_seconds"
+        :param help_text: description of the metric
+        :param labels: dictionary of label name to label value, or None for no labels
+
+        :return timer: engine.metrics.Timer object
+        """
+        return self._metric(TIMER, Timer, name, help_text, labels)
+
+    def snapshot(self):
+        """
+        Get the current value of every metric
+
+        :return snapshot: list of dictionaries, one per metric, each with its name, type, labels and values
+        """
+        snapshot = []
+
+        for name, (metric_type, help_text, metrics) in sorted(self._families.items()):
+            for metric in metrics.values():
+                entry = {"name": name, "type": metric_type, "labels": dict(metric.labels)}
+                entry.update(metric.snapshot())
+                snapshot.append(entry)
+
+        return snapshot
+
+    def to_json_line(self):
+        """
+        Get the current value of every metric as a single line of JSON
+
+        :return line: JSON text (without a trailing newline)
+        """
+        return json.dumps({"timestamp": time.time(), "metrics": self.snapshot()})
+
+    def to_prometheus(self):
+        """
+        Get the current value of every metric in the Prometheus text exposition format, timers are exposed as
+        histograms
+
+        :return text: Prometheus text
+        """
+        lines = []
+
+        for name, (metric_type, help_text, metrics) in sorted(self._families.items()):
+            if help_text:
+                lines.append("# HELP {0} {1}".format(name, help_text))
+
+            lines.append("# TYPE {0} {1}".format(name, "histogram" if metric_type == TIMER else metric_type))
+
+            for metric in metrics.values():
+                if metric_type != TIMER:
+                    lines.append("{0}{1} {2}".format(name, _format_labels(metric.labels), metric.value))
+                    continue
+
+                cumulative = 0
+                for bucket, count in zip(list(metric.buckets) + ["+Inf"], metric._bucket_counts):
+                    cumulative += count
+                    lines.append("{0}_bucket{1} {2}".format(name, _format_labels(metric.labels, ("le", bucket)),
+                                                           cumulative))
+
+                lines.append("{0}_sum{1} {2}".format(name, _format_labels(metric.labels), metric.sum))
+                lines.append("{0}_count{1} {2}".format(name, _format_labels(metric.labels), metric.count))
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, path=None, export_format=None):
+        """
+        Export the current value of every metric, JSON lines are appended to the file whereas the Prometheus text file
+        is replaced (atomically, so a scraper never reads a partly written file)
+
+        :param path: path of the file to export to, None to use the path given to start_exporting()
+        :param export_format: METRICS_FORMAT_JSON or METRICS_FORMAT_PROMETHEUS, None to use the format given to
+                              start_exporting()
+
+        :return nothing:
+        """
+        path = path or self._export_path
+        export_format = export_format or self._export_format
+
+        if export_format == METRICS_FORMAT_PROMETHEUS:
+            temp_path = path + ".tmp"
+
+            with open(temp_path, "w") as metrics_file:
+                metrics_file.write(self.to_prometheus())
+
+            os.replace(temp_path, path)
+        else:
+            with open(path, "a") as metrics_file:
+                metrics_file.write(self.to_json_line() + "\n")
+
+    def _export_tick(self, dt):
+        self.export()
+
+    def start_exporting(self, clock, path, export_format=METRICS_FORMAT_JSON, interval=METRICS_EXPORT_INTERVAL):
+        """
+        Export the metrics on an interval using a pyglet clock
+
+        :param clock: pyglet.clock.Clock to export on, eg. pyglet.clock.get_default()
+        :param path: path of the file to export to
+        :param export_format: METRICS_FORMAT_JSON or METRICS_FORMAT_PROMETHEUS
+        :param interval: interval in seconds between exports
+
+        :return nothing:
+        """
+        self.stop_exporting()
+        self._export_path = path
+        self._export_format = export_format
+        self._export_clock = clock
+        clock.schedule_interval(self._export_tick, interval)
+
+    def stop_exporting(self):
+        """
+        Stop exporting the metrics on an interval, a final export is made so that nothing recorded is lost
+
+        :return nothing:
+        """
+        if self._export_path is not None:
+            self._export_clock.unschedule(self._export_tick)
+            self.export()
+            self._export_path = None
+            self._export_format = None
+            self._export_clock = None
+
+
+# The registry used by the game app, use the functions below to reach it, it is disabled until the game app enables it
+_registry = Metrics(enabled=False)
+
+
+def registry():
+    return _registry
+
+
+def counter(name, help_text="", labels=None):
+    return _registry.counter(name, help_text, labels)
+
+
+def gauge(name, help_text="", labels=None):
+    return _registry.gauge(name, help_text, labels)
+
+
+def timer(name, help_text="", labels=None):
+    return _registry.timer(name, help_text, labels)
@@ -0,0 +1,130 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       redraw_scheduler.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Redraw scheduler class that only updates and redraws the game window when the current game state is
+                  dirty (or continuously if so configured)
+"""
+
+# Imports
+import pyglet
+from engine.consts import *
+
+
+# Consts
+# Globals
+# Functions
+
+
+# Classes
+class RedrawScheduler:
+    def __init__(self, app, interval=1 / DEFAULT_REFRESH_RATE, continuous=False):
+        """
+        Initialiser for the RedrawScheduler class
+
+        :attr _app: reference to the main game app object
+        :attr _interval: interval (in seconds) between update ticks whilst the scheduler is running, 0 means a tick on
+                         every pass of the event loop
+        :attr _continuous: if True then the game window is updated and redrawn on every tick irrespective of whether
+                           the current game state is dirty or not, ie. the scheduler never idles
+        :attr _running: True if the update tick is currently scheduled with the pyglet clock, otherwise False
+
+        :param app: main game app object
+        :param interval: interval (in seconds) between update ticks
+        :param continuous: initial continuous redraw mode as a boolean
+        """
+        self._app = app
+        self._interval = interval
+        self._continuous = continuous
+        self._running = False
+
+    @property
+    def interval(self):
+        return self._interval
+
+    @interval.setter
+    def interval(self, value):
+        # A running update tick is rescheduled with the new interval, eg. when vsync is turned on or off
+        if value == self._interval:
+            return
+
+        self._interval = value
+
+        if self._running:
+            self.sleep()
+            self.wake()
+
+    @property
+    def continuous(self):
+        return self._continuous
+
+    @continuous.setter
+    def continuous(self, value):
+        self._continuous = value
+
+        if value:
+            self.wake()
+
+    @property
+    def running(self):
+        return self._running
+
+    def wake(self):
+        """
+        Ensure the update tick is scheduled, this is called whenever a game state is marked as dirty and is a no-op if
+        the scheduler is already running
+
+        :return nothing:
+        """
+        if not self._running:
+            self._running = True
+            self._app.game_loop.reset()
+
+            if self._interval:
+                pyglet.clock.schedule_interval(self._tick, self._interval)
+            else:
+                pyglet.clock.schedule(self._tick)
+
+    def sleep(self):
+        """
+        Remove the update tick from the pyglet clock so that the game app idles until the next call to wake()
+
+        :return nothing:
+        """
+        if self._running:
+            self._running = False
+            pyglet.clock.unschedule(self._tick)
+
+    def _tick(self, dt):
+        """
+        Update tick, advances the game loop and redraws the current game state if it is dirty (or if running in
+        continuous mode), otherwise the scheduler goes to sleep
+
+        :param dt: delta time in seconds since last tick
+
+        :return nothing:
+        """
+        game_state = self._app.current_game_state
+
+        if not game_state or not (self.continuous or game_state.dirty):
+            self.sleep()
+            return
+
+        profiler = self._app.frame_profiler
+        profiler.record_frame(dt)
+        start = profiler.start()
+
+        # Clear the dirty flag before the update so that any change made during the update (or the draw) will cause a
+        # further tick
+        game_state.dirty = False
+
+        # Input is read once per frame, every logic step and widget of the frame sees the same snapshot
+        self._app.input_state.capture()
+        self._app.game_loop.advance(dt)
+        self._app.game_window.draw(dt)
+
+        profiler.stop("clock:redraw_tick", start)
@@ -0,0 +1,200 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       render_graph.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Render graph class, a single drawing batch shared by all game states with a tree of ordered render
+                  layers (eg. a root layer per game state with its game object and UI object layers beneath it), only
+                  the visible root layers are drawn, within a layer the batch consolidates drawables that share the
+                  same texture, shader program and blend state into a single draw call, the draw calls and render
+                  state changes of each frame are counted for the frame profiler
+                - Render sprite group class, the sprite group of the game's sprites, which stays removable from the
+                  batch once its texture has been deleted (eg. evicted from texture memory)
+"""
+
+# Imports
+import bisect
+import pyglet
+from engine.consts import *
+
+
+# Consts
+# Globals
+# Functions
+
+
+# Classes
+class RenderLayer(pyglet.graphics.Group):
+    def __init__(self, name, order=0, parent=None):
+        """
+        Initialiser for the RenderLayer class, unlike a plain pyglet.graphics.Group (which is equal to any other group
+        with the same order and parent, and so would be merged with it in a batch) every render layer is distinct, so
+        that the layers of different game states are never merged in the shared batch
+
+        :attr _name: name of this layer, eg. "ui_objects"
+
+        :param name: name of this layer
+        :param order: drawing order of this layer amongst its siblings, lower orders are drawn first (ie. beneath)
+        :param parent: parent RenderLayer, None for a root layer
+        """
+        super().__init__(order=order, parent=parent)
+        self._name = name
+
+    @property
+    def name(self):
+        return self._name
+
+    def __eq__(self, other):
+        return self is other
+
+    def __hash__(self):
+        return id(self)
+
+    def __repr__(self):
+        return "{0}({1}, order={2})".format(self.__class__.__name__, self._name, self.order)
+
+
+class RenderSpriteGroup(pyglet.sprite.SpriteGroup):
+    def __init__(self, texture, blend_src, blend_dest, program, parent=None):
+        """
+        Initialiser for the RenderSpriteGroup class, a pyglet.sprite.SpriteGroup is hashed by the id of its texture,
+        which a deleted texture no longer has, so the batch could no longer find (and so remove) the group once a sprite
+        has moved off a deleted texture, this group keeps the hash it was created with, its equality is unchanged so the
+        group of a deleted texture is never merged with a group of a texture that has since been given the same id
+
+        :attr _hash: hash of the group when it was created
+
+        :param texture: pyglet.image.Texture to draw with
+        :param blend_src: OpenGL blend source mode
+        :param blend_dest: OpenGL blend destination mode
+        :param program: shader program to draw with
+        :param parent: parent group, eg. a RenderLayer
+        """
+        super().__init__(texture, blend_src, blend_dest, program, parent)
+        self._hash = super().__hash__()
+
+    def __hash__(self):
+        return self._hash
+
+
+class RenderGraph:
+    def __init__(self):
+        """
+        Initialiser for the RenderGraph class
+
+        :attr _batch: the single pyglet.graphics.Batch that all drawables of all game states are added to
+        :attr _layers: dictionary of (parent layer, layer name) tuple to RenderLayer object
+        :attr _roots: list of the root RenderLayer objects in drawing order, kept sorted as root layers are created (so
+                      that neither showing layers nor counting a draw needs to sort them)
+        :attr _draw_calls: number of draw calls made by the last call to draw() (only counted when asked for)
+        :attr _state_changes: number of render state changes (ie. group set_state() and unset_state() calls) made by the
+                              last call to draw() (only counted when asked for)
+        """
+        self._batch = pyglet.graphics.Batch()
+        self._layers = {}
+        self._roots = []
+        self._draw_calls = 0
+        self._state_changes = 0
+
+    @property
+    def batch(self):
+        return self._batch
+
+    @property
+    def draw_calls(self):
+        return self._draw_calls
+
+    @property
+    def state_changes(self):
+        return self._state_changes
+
+    def layer(self, name, order=0, parent=None, visible=True):
+        """
+        Get (creating if need be) a render layer, drawables are put in a layer by passing it (or a group whose parent is
+        the layer) as their group along with the render graph's batch
+
+        :param name: name of the layer, unique amongst the layers with the same parent
+        :param order: drawing order of the layer amongst its siblings, used only when the layer is created
+        :param parent: parent RenderLayer, None for a root layer
+        :param visible: initial visibility of the layer, used only when the layer is created
+
+        :return layer: engine.render_graph.RenderLayer object
+        """
+        layer = self._layers.get((parent, name))
+
+        if layer is None:
+            layer = self._layers[(parent, name)] = RenderLayer(name, order=order, parent=parent)
+            layer.visible = visible
+
+            # Root layers of the same order are kept in the order they were created
+            if parent is None:
+                self._roots.insert(bisect.bisect_right([root.order for root in self._roots], order), layer)
+
+        return layer
+
+    def show_only(self, *layers):
+        """
+        Make the given root layers visible and every other root layer invisible, eg. when the current game state
+        changes, the batch only rebuilds its draw list if the visibility of a layer actually changes
+
+        :param layers: root RenderLayer objects to show
+
+        :return nothing:
+        """
+        for layer in self._roots:
+            visible = any(layer is shown for shown in layers)
+
+            if layer.visible != visible:
+                layer.visible = visible
+
+    def draw(self, count=False):
+        """
+        Draw all visible layers
+
+        :param count: if True then the draw calls and state changes of this draw are counted (this walks the layer tree
+                      so it is only done when asked for, eg. while the frame profiler is enabled)
+
+        :return nothing:
+        """
+        self._batch.draw()
+
+        if count:
+            self._draw_calls, self._state_changes = self.count()
+
+    def count(self):
+        """
+        Count the draw calls and render state changes that drawing the visible layers makes, this mirrors the way the
+        batch builds its draw list, ie. each visible group sets and unsets its state once and draws each of its
+        non-empty vertex domains in a single call
+
+        :return counts: tuple of (draw calls, state changes)
+        """
+        batch = self._batch
+
+        def visit(group):
+            draw_calls = sum(1 for domain in batch.group_map.get(group, {}).values() if not domain.is_empty)
+            state_changes = 0
+
+            for child in batch.group_children.get(group, ()):
+                if child.visible:
+                    child_draw_calls, child_state_changes = visit(child)
+                    draw_calls += child_draw_calls
+                    state_changes += child_state_changes
+
+            if draw_calls:
+                state_changes += 2
+
+            return draw_calls, state_changes
+
+        totals = [0, 0]
+
+        for group in self._roots:
+            if group.visible:
+                draw_calls, state_changes = visit(group)
+                totals[0] += draw_calls
+                totals[1] += state_changes
+
+        return tuple(totals)
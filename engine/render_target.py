@@ -0,0 +1,111 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       render_target.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Render target class, an offscreen framebuffer with a texture attached so that a scene can be drawn
+                  straight into a texture on the GPU, ie. without reading the game window back to the CPU
+"""
+
+# Imports
+import pyglet
+from pyglet.gl import *
+from engine.consts import *
+
+
+# Consts
+# Globals
+# Functions
+
+
+# Classes
+class RenderTarget:
+    def __init__(self, window, scale=1.0):
+        """
+        Initialiser for the RenderTarget class, the texture is sized to the game window multiplied by the scale and the
+        window's projection is kept when drawing into it, therefore a scene drawn into the render target is the whole
+        window's view downsampled to the size of the texture
+
+        :attr _window: game window whose view is drawn into the render target
+        :attr _scale: scale of the texture relative to the game window
+        :attr _texture: pyglet.image.Texture that the scene is drawn into, it is linearly filtered so that it smooths
+                        rather than blocks when it is stretched back up to the window size
+        :attr _framebuffer: pyglet.image.buffer.Framebuffer with the texture attached as its colour buffer
+
+        :param window: game window whose view is drawn into the render target
+        :param scale: scale of the texture relative to the game window (0.0 -> 1.0)
+        """
+        self._window = window
+        self._scale = scale
+
+        width = max(1, int(window.width * scale))
+        height = max(1, int(window.height * scale))
+        self._texture = pyglet.image.Texture.create(width, height, min_filter=GL_LINEAR, mag_filter=GL_LINEAR)
+        self._framebuffer = pyglet.image.buffer.Framebuffer()
+        self._framebuffer.attach_texture(self._texture)
+
+    @property
+    def window(self):
+        return self._window
+
+    @property
+    def scale(self):
+        return self._scale
+
+    @property
+    def texture(self):
+        return self._texture
+
+    @property
+    def width(self):
+        return self._texture.width
+
+    @property
+    def height(self):
+        return self._texture.height
+
+    def matches(self, window, scale):
+        """
+        Establish whether this render target can be reused for the supplied game window and scale, eg. it cannot if the
+        window has been resized since the render target was created
+
+        :param window: game window whose view is to be drawn into the render target
+        :param scale: scale of the texture relative to the game window
+
+        :return boolean: True if the render target can be reused, otherwise False
+        """
+        return (window is self._window and scale == self._scale and
+                self._texture.width == max(1, int(window.width * scale)) and
+                self._texture.height == max(1, int(window.height * scale)))
+
+    def render(self, draw):
+        """
+        Draw a scene into the texture of this render target, the previous contents of the texture are cleared first
+
+        :param draw: callable that takes no arguments and draws the scene, eg. draws a game state's batches
+
+        :return texture: the texture of this render target
+        """
+        self._framebuffer.bind()
+        glViewport(0, 0, self._texture.width, self._texture.height)
+        glClear(GL_COLOR_BUFFER_BIT)
+
+        try:
+            draw()
+        finally:
+            self._framebuffer.unbind()
+            glViewport(0, 0, *self._window.get_framebuffer_size())
+
+        return self._texture
+
+    def delete(self):
+        """
+        Release the GPU resources of this render target
+
+        :return nothing:
+        """
+        self._framebuffer.delete()
+        self._texture.delete()
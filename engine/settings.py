@@ -0,0 +1,286 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       settings.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Settings class, typed game app settings backed by a ConfigParser, parsed values are cached, changes
+                  are notified to listeners and written to the settings file on a background thread (debounced, so a
+                  burst of changes causes a single write, and atomic, so the file is never left partly written)
+"""
+
+# Imports
+import io
+import os
+import tempfile
+import threading
+from configparser import ConfigParser
+from engine.consts import *
+
+
+# Consts
+# Globals
+# Functions
+def _to_string(value):
+    # ConfigParser only holds strings, booleans are written the way getboolean() reads them back
+    return str(value).lower() if isinstance(value, bool) else str(value)
+
+
+# Classes
+class Settings:
+    def __init__(self, path=None, write_delay=SETTINGS_WRITE_DELAY):
+        """
+        Initialiser for the Settings class, each option is defined with its type and default value and is then read
+        with get() and changed with set()
+
+        :attr _config: ConfigParser holding the settings as strings, this is what is written to the settings file
+        :attr _path: path of the settings file, None if the settings are not to be written
+        :attr _types: dictionary of (section, option) to the type of the option's value (bool, int, float or str)
+        :attr _values: dictionary of (section, option) to the parsed value of the option, ie. a cache so that each
+                       option is only parsed once after it is read or changed
+        :attr _listeners: list of (callback, section, option) tuples, the callback is called with the section, option
+                          and new value whenever a matching option changes, a section or option of None matches all
+        :attr _write_delay: time (in seconds) a write waits for further changes before it goes ahead
+        :attr _write_timer: threading.Timer of the pending write, None if there is no pending write
+        :attr _lock: threading.Lock guarding the ConfigParser and the pending write between the main thread and the
+                     background writer thread
+        :attr _write_lock: threading.Lock held for the whole of a write (snapshot, write and replace), so that a write
+                           on the calling thread (eg. on close) and a write on the background thread never overlap
+
+        :param path: path of the settings file
+        :param write_delay: time (in seconds) a write waits for further changes before it goes ahead
+        """
+        self._config = ConfigParser(strict=False)
+        self._path = path
+        self._types = {}
+        self._values = {}
+        self._listeners = []
+        self._write_delay = write_delay
+        self._write_timer = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @property
+    def config(self):
+        return self._config
+
+    @property
+    def path(self):
+        return self._path
+
+    @path.setter
+    def path(self, value):
+        self._path = value
+
+    @property
+    def write_pending(self):
+        return self._write_timer is not None
+
+    def read_string(self, text):
+        """
+        Read settings from a string in the settings file format, any previously parsed values are discarded
+
+        :param text: settings text
+
+        :return nothing:
+        """
+        with self._lock:
+            self._config.read_string(text)
+            self._values.clear()
+
+    def write_string(self):
+        """
+        Get the settings as a string in the settings file format
+
+        :return text: settings text
+        """
+        with self._lock:
+            text = io.StringIO()
+            self._config.write(text)
+
+        return text.getvalue()
+
+    def add_section(self, section):
+        """
+        Ensure a section exists, even if it has no options
+
+        :param section: name of the section
+
+        :return nothing:
+        """
+        with self._lock:
+            if not self._config.has_section(section):
+                self._config.add_section(section)
+
+    def define(self, section, option, value_type, default):
+        """
+        Define the type of an option and give it its default value if it has no value
+
+        :param section: name of the section
+        :param option: name of the option
+        :param value_type: type of the option's value, one of bool, int, float or str
+        :param default: default value of the option
+
+        :return nothing:
+        """
+        self.add_section(section)
+
+        with self._lock:
+            self._types[(section, option)] = value_type
+            self._values.pop((section, option), None)
+
+            if not self._config.has_option(section, option):
+                self._config[section][option] = _to_string(default)
+
+    def get(self, section, option):
+        """
+        Get the value of an option, parsed to the option's defined type (str if the option is not defined)
+
+        :param section: name of the section
+        :param option: name of the option
+
+        :return value: value of the option
+        """
+        try:
+            return self._values[(section, option)]
+        except KeyError:
+            pass
+
+        value_type = self._types.get((section, option), str)
+
+        if value_type is bool:
+            value = self._config.getboolean(section, option)
+        elif value_type is int:
+            value = self._config.getint(section, option)
+        elif value_type is float:
+            value = self._config.getfloat(section, option)
+        else:
+            value = self._config.get(section, option)
+
+        self._values[(section, option)] = value
+        return value
+
+    def set(self, section, option, value):
+        """
+        Change the value of an option, listeners are notified and a write of the settings file is scheduled, no-op if
+        the value has not changed
+
+        :param section: name of the section
+        :param option: name of the option
+        :param value: new value of the option
+
+        :return nothing:
+        """
+        if self._config.has_option(section, option) and self.get(section, option) == value:
+            return
+
+        self.add_section(section)
+
+        with self._lock:
+            self._config[section][option] = _to_string(value)
+            self._values.pop((section, option), None)
+
+        value = self.get(section, option)
+
+        for callback, listen_section, listen_option in list(self._listeners):
+            if listen_section in (None, section) and listen_option in (None, option):
+                callback(section, option, value)
+
+        self.schedule_write()
+
+    def add_listener(self, callback, section=None, option=None):
+        """
+        Add a listener that is called whenever a matching option changes
+
+        :param callback: function with the signature callback(section, option, value)
+        :param section: name of the section to listen to, None for all sections
+        :param option: name of the option to listen to, None for all options
+
+        :return nothing:
+        """
+        self._listeners.append((callback, section, option))
+
+    def remove_listener(self, callback):
+        """
+        Remove all listeners that use the supplied callback
+
+        :param callback: callback function of the listeners to remove
+
+        :return nothing:
+        """
+        self._listeners = [listener for listener in self._listeners if listener[0] != callback]
+
+    def schedule_write(self):
+        """
+        Schedule a write of the settings file on a background thread, if a write is already pending it is put back so
+        that a burst of changes results in a single write
+
+        :return nothing:
+        """
+        if self._path is None:
+            return
+
+        with self._lock:
+            if self._write_timer:
+                self._write_timer.cancel()
+
+            self._write_timer = threading.Timer(self._write_delay, self._write)
+            self._write_timer.daemon = True
+            self._write_timer.start()
+
+    def flush(self):
+        """
+        Write the settings file now (on the calling thread) if a write is pending, eg. when the game app closes
+
+        :return nothing:
+        """
+        with self._lock:
+            pending = self._write_timer is not None
+
+            if pending:
+                self._write_timer.cancel()
+                self._write_timer = None
+
+        if pending:
+            self._write()
+
+    def write(self):
+        """
+        Write the settings file now (on the calling thread) irrespective of whether a write is pending
+
+        :return nothing:
+        """
+        with self._lock:
+            if self._write_timer:
+                self._write_timer.cancel()
+                self._write_timer = None
+
+        self._write()
+
+    def _write(self):
+        # A cancelled timer may already be running this on the background thread, the write lock makes it wait for (or
+        # be waited for by) the write on the calling thread rather than both writing at once
+        with self._write_lock:
+            with self._lock:
+                # Only the pending write's own timer clears it, a newer timer may have been scheduled since this began
+                if threading.current_thread() is self._write_timer:
+                    self._write_timer = None
+
+            text = self.write_string()
+
+            # Write to a uniquely named temporary file alongside the settings file and then replace it in a single step
+            fd, temp_path = tempfile.mkstemp(suffix=".tmp", prefix=os.path.basename(self._path) + ".",
+                                             dir=os.path.dirname(self._path) or os.curdir)
+
+            try:
+                with os.fdopen(fd, "w") as sf:
+                    sf.write(text)
+
+                os.replace(temp_path, self._path)
+            except OSError:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+                raise
@@ -0,0 +1,152 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       spatial_grid.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Uniform grid spatial index of axis aligned bounding boxes
+"""
+
+# Imports
+from engine.consts import *
+
+
+# Consts
+# Globals
+# Functions
+
+
+# Classes
+class SpatialGrid:
+    def __init__(self, cell_size=SPATIAL_GRID_CELL_SIZE):
+        """
+        Initialiser for the SpatialGrid class
+
+        :attr _cell_size: size in pixels of each square cell of the grid
+        :attr _cells: dictionary of (column, row) cell keys to the list of items whose bounds overlap that cell
+        :attr _bounds: dictionary of each item in the grid to its (min x, min y, max x, max y) bounds
+
+        :param cell_size: size in pixels of each square cell of the grid
+        """
+        self._cell_size = cell_size
+        self._cells = {}
+        self._bounds = {}
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    def __len__(self):
+        return len(self._bounds)
+
+    def __contains__(self, item):
+        return item in self._bounds
+
+    def _cell_range(self, bounds):
+        min_x, min_y, max_x, max_y = bounds
+        return (range(int(min_x // self._cell_size), int(max_x // self._cell_size) + 1),
+                range(int(min_y // self._cell_size), int(max_y // self._cell_size) + 1))
+
+    def clear(self):
+        """
+        Remove all items from the grid
+
+        :return nothing:
+        """
+        self._cells.clear()
+        self._bounds.clear()
+
+    def insert(self, item, bounds):
+        """
+        Add an item to the grid with the supplied bounds, if the item is already in the grid then it is moved to the
+        new bounds
+
+        :param item: item to add, this must be hashable
+        :param bounds: (min x, min y, max x, max y) bounds of the item
+
+        :return nothing:
+        """
+        if item in self._bounds:
+            self.remove(item)
+
+        self._bounds[item] = bounds
+        columns, rows = self._cell_range(bounds)
+
+        for column in columns:
+            for row in rows:
+                self._cells.setdefault((column, row), []).append(item)
+
+    def remove(self, item):
+        """
+        Remove an item from the grid, no-op if the item is not in the grid
+
+        :param item: item to remove
+
+        :return nothing:
+        """
+        bounds = self._bounds.pop(item, None)
+
+        if bounds is None:
+            return
+
+        columns, rows = self._cell_range(bounds)
+
+        for column in columns:
+            for row in rows:
+                cell = self._cells[(column, row)]
+                cell.remove(item)
+
+                if not cell:
+                    del self._cells[(column, row)]
+
+    def query_point(self, x, y):
+        """
+        Find all items whose bounds contain the supplied point, only the single cell holding the point is examined
+
+        :param x: x coordinate of the point
+        :param y: y coordinate of the point
+
+        :return items: list of matching items (in the order they were inserted into the cell)
+        """
+        cell = self._cells.get((int(x // self._cell_size), int(y // self._cell_size)))
+
+        if not cell:
+            return []
+
+        items = []
+        for item in cell:
+            min_x, min_y, max_x, max_y = self._bounds[item]
+
+            if min_x <= x <= max_x and min_y <= y <= max_y:
+                items.append(item)
+
+        return items
+
+    def query_rect(self, bounds):
+        """
+        Find all items whose bounds overlap the supplied bounds
+
+        :param bounds: (min x, min y, max x, max y) bounds to test against
+
+        :return items: list of matching items, each item appears only once
+        """
+        min_x, min_y, max_x, max_y = bounds
+        columns, rows = self._cell_range(bounds)
+        items = []
+        seen = set()
+
+        for column in columns:
+            for row in rows:
+                for item in self._cells.get((column, row), ()):
+                    if item in seen:
+                        continue
+
+                    seen.add(item)
+                    item_min_x, item_min_y, item_max_x, item_max_y = self._bounds[item]
+
+                    if item_min_x <= max_x and min_x <= item_max_x and item_min_y <= max_y and min_y <= item_max_y:
+                        items.append(item)
+
+        return items
@@ -0,0 +1,88 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       startup_report.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Startup report, shows the time taken to import each module the game app needs before its window
+                  opens (measured by Python's own -X importtime option in a separate interpreter) and the time taken
+                  to load each game state, so that time to first frame can be kept small as game states are added
+"""
+
+# Imports
+import sys
+import subprocess
+from engine.consts import *
+
+
+# Consts
+STARTUP_REPORT_MODULE = "engine.game_app"
+STARTUP_REPORT_TOP = 25
+
+
+# Globals
+# Functions
+def import_times(module_name=STARTUP_REPORT_MODULE):
+    """
+    Import a module in a fresh interpreter with -X importtime and collect the time taken by each module it imports
+
+    :param module_name: name of the module to import, eg. "engine.game_app"
+
+    :return times: list of (module name, self time in seconds, cumulative time in seconds) tuples in import order
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                             "import pyglet; pyglet.options['shadow_window'] = False; import " + module_name],
+                            stderr=subprocess.PIPE, universal_newlines=True)
+    times = []
+
+    for line in result.stderr.splitlines():
+        # Each line is "import time: <self us> | <cumulative us> | <indented module name>"
+        if not line.startswith("import time:"):
+            continue
+
+        fields = line[len("import time:"):].split("|")
+
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+
+        times.append((fields[2].strip(), int(fields[0]) / 1000000, int(fields[1]) / 1000000))
+
+    return times
+
+
+def print_startup_report(module_name=STARTUP_REPORT_MODULE, top=STARTUP_REPORT_TOP, game_states=None):
+    """
+    Print the startup report to standard output
+
+    :param module_name: name of the module whose imports are reported, eg. "engine.game_app"
+    :param top: number of slowest modules (by self time) to list
+    :param game_states: engine.game_state_registry.GameStateRegistry whose game state load times are reported, None
+                        to leave these out
+
+    :return nothing:
+    """
+    times = import_times(module_name)
+    total = sum(self_time for name, self_time, cumulative in times)
+
+    print("Imports of {0}: {1} modules in {2:.1f} ms".format(module_name, len(times), total * 1000))
+    print("{0:>10}  {1:>10}  {2}".format("self ms", "cumul. ms", "module"))
+
+    for name, self_time, cumulative in sorted(times, key=lambda entry: entry[1], reverse=True)[:top]:
+        print("{0:>10.2f}  {1:>10.2f}  {2}".format(self_time * 1000, cumulative * 1000, name))
+
+    # Game state modules should not appear above as they are only imported when first needed
+    eager = [name for name, self_time, cumulative in times if name.startswith("game_states.")]
+    print()
+    print("Game state modules imported at startup: {0}".format(", ".join(eager) if eager else "none"))
+
+    if game_states is not None:
+        print()
+        print("Game state load times (import and instantiation)")
+
+        for name in game_states:
+            game_states[name]
+
+        for name, load_time in sorted(game_states.import_times.items(), key=lambda entry: entry[1], reverse=True):
+            print("{0:>10.2f}  {1}".format(load_time * 1000, name))
@@ -0,0 +1,410 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       texture_memory.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Image cache class, the game app's dictionaries of game and UI object images, each image is loaded from
+                  its path once however many names it is loaded under, images can be defined up front and loaded
+                  together (eg. once all their image files have been decoded in parallel), an evictable image can be
+                  deleted from texture memory and is loaded again when it is next looked up or shown
+                - Texture memory class, accounts the texture memory of every loaded image (per image file) and of every
+                  game state (the images shown by its game and UI objects and the render targets it draws into), reports
+                  it on the debug HUD and as metrics and, if a texture budget is set, evicts the images and releases the
+                  render targets of inactive game states (least recently entered first) until the texture memory is
+                  back within the budget, the game and UI objects of those game states are kept and are shown their
+                  images again when their game state is next entered
+"""
+
+# Imports
+import weakref
+from engine.consts import *
+from engine.tiled_image import TiledImage
+from engine import metrics
+
+
+# Consts
+# Globals
+# Functions
+def texture_bytes(image):
+    """
+    Establish the texture memory taken by an image
+
+    :param image: pyglet image (or texture region) or engine.tiled_image.TiledImage
+
+    :return bytes: number of bytes
+    """
+    if isinstance(image, TiledImage):
+        return int(sum(texture.owner.width * texture.owner.height for x, y, texture in image.tiles) *
+                   TEXTURE_BYTES_PER_PIXEL * TEXTURE_MIPMAP_FACTOR)
+
+    return image.width * image.height * TEXTURE_BYTES_PER_PIXEL
+
+
+# Classes
+class ImageCache(dict):
+    def __init__(self, loader, evictable=False):
+        """
+        Initialiser for the ImageCache class, a dictionary of image name to image
+
+        :attr _loader: function called with an image path to load the image
+        :attr _evictable: True if the images of this cache can be evicted, ie. each is its own texture (rather than a
+                          region of a texture atlas shared with other images)
+        :attr _paths: dictionary of image name to the path the image is loaded from
+        :attr _loaders: dictionary of image path to the function that loads it, for those images not loaded by _loader
+        :attr _images: dictionary of image path to the loaded image, ie. the images currently in texture memory
+        :attr _evicted: dictionary (with weak keys) of evicted image to its path, for as long as anything (eg. a sprite)
+                        still refers to the evicted image, so that the image can be loaded again in its place
+        :attr _version: number of times an image has been loaded or evicted, so that users of the cache can tell when
+                        it has changed
+
+        :param loader: function called with an image path to load the image
+        :param evictable: True if the loaded images can be evicted
+        """
+        super().__init__()
+        self._loader = loader
+        self._evictable = evictable
+        self._paths = {}
+        self._loaders = {}
+        self._images = {}
+        self._evicted = weakref.WeakKeyDictionary()
+        self._version = 0
+
+    @property
+    def evictable(self):
+        return self._evictable
+
+    @property
+    def images(self):
+        return self._images
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def paths(self):
+        return list(dict.fromkeys(self._paths.values()))
+
+    def define(self, name, path, loader=None):
+        """
+        Define an image under a name without loading it, it is loaded by load_all() or when it is first looked up
+
+        :param name: name to look the image up by, eg. "back_screen"
+        :param path: resource path of the image
+        :param loader: function called with the path to load the image, None to use the cache's loader
+
+        :return nothing:
+        """
+        self._paths[name] = path
+
+        if loader:
+            self._loaders[path] = loader
+
+    def load(self, name, path, loader=None):
+        """
+        Load an image under a name, if the image has already been loaded under another name then it is shared
+
+        :param name: name to look the image up by, eg. "back_screen"
+        :param path: resource path of the image
+        :param loader: function called with the path to load the image, None to use the cache's loader
+
+        :return image: the loaded image
+        """
+        self.define(name, path, loader)
+        return self[name]
+
+    def load_all(self):
+        """
+        Load every defined image that is not already loaded, in the order they were defined
+
+        :return nothing:
+        """
+        for name in self._paths:
+            if name not in self:
+                self[name] = self._image(self._paths[name])
+
+    def path(self, name):
+        """
+        Get the path an image is loaded from
+
+        :param name: name of the image
+
+        :return path: resource path of the image
+
+        :exception KeyError: raised if no image has been loaded under the name
+        """
+        return self._paths[name]
+
+    def evict(self, path):
+        """
+        Delete an image from texture memory, the image is loaded again when it is next looked up under any of its names
+
+        :param path: resource path of the image
+
+        :return nothing:
+
+        :exception TypeError: raised if the images of this cache are not evictable
+        """
+        if not self._evictable:
+            raise TypeError("images in texture atlases cannot be evicted")
+
+        image = self._images.pop(path, None)
+
+        if image is None:
+            return
+
+        for name in [name for name, image_path in self._paths.items() if image_path == path]:
+            self.pop(name, None)
+
+        self._evicted[image] = path
+        image.delete()
+        self._version += 1
+
+    def reloaded(self, image):
+        """
+        Get the image to show in place of an image, ie. the image itself unless it is an image of this cache that has
+        been evicted, in which case it is loaded again
+
+        :param image: image to show
+
+        :return image: the image itself or the image loaded again in its place
+        """
+        path = self._evicted.get(image)
+        return image if path is None else self._image(path)
+
+    def _image(self, path):
+        image = self._images.get(path)
+
+        if image is None:
+            image = self._images[path] = self._loaders.get(path, self._loader)(path)
+            self._version += 1
+
+        return image
+
+    def __missing__(self, name):
+        # Evicted images are loaded again on demand, names that were never loaded are still a KeyError
+        if name not in self._paths:
+            raise KeyError(name)
+
+        image = self[name] = self._image(self._paths[name])
+        return image
+
+
+class TextureMemory:
+    def __init__(self, app, budget=DEFAULT_TEXTURE_BUDGET * TEXTURE_BUDGET_UNIT):
+        """
+        Initialiser for the TextureMemory class
+
+        :attr _app: reference to the main game app object
+        :attr _budget: texture memory budget in bytes, 0 for no budget
+        :attr _asset_bytes: dictionary of image path to the texture memory of the image, for the images currently in
+                            texture memory
+        :attr _image_paths: dictionary of id of each image currently in texture memory to its path
+        :attr _versions: versions of the app's image caches when the images were last accounted
+        :attr _state_assets: dictionary of game state name to the frozenset of paths of the images its game and UI
+                             objects show
+        :attr _state_images: dictionary of game state name to the ids of the images its game and UI objects showed when
+                             its images were last established
+        :attr _entries: dictionary of game state name to the entry count when it was last entered, so that the images of
+                        the game states can be evicted least recently entered first
+        :attr _entry_count: number of game state entries
+        :attr _evictions: engine.metrics.Counter of the number of images evicted
+
+        :param app: main game app object
+        :param budget: texture memory budget in bytes, 0 for no budget
+        """
+        self._app = app
+        self._budget = budget
+        self._asset_bytes = {}
+        self._image_paths = {}
+        self._versions = None
+        self._state_assets = {}
+        self._state_images = {}
+        self._entries = {}
+        self._entry_count = 0
+        self._evictions = metrics.counter("texture_evictions_total", "Number of images evicted from texture memory")
+
+    @property
+    def budget(self):
+        return self._budget
+
+    @budget.setter
+    def budget(self, value):
+        self._budget = value
+        self.enforce()
+
+    @property
+    def asset_bytes(self):
+        self._account_assets()
+        return dict(self._asset_bytes)
+
+    @property
+    def resident_bytes(self):
+        self._account_assets()
+        return sum(self._asset_bytes.values()) + sum(self._target_bytes(game_state)
+                                                     for game_state in self._app.game_states.loaded())
+
+    def state_bytes(self, game_state):
+        """
+        Establish the texture memory of the images shown by a game state's game and UI objects and of the render
+        targets it draws into
+
+        :param game_state: game state to account
+
+        :return bytes: number of bytes
+        """
+        self._account_assets()
+        return (sum(self._asset_bytes.get(path, 0) for path in self._assets_of(game_state)) +
+                self._target_bytes(game_state))
+
+    def _caches(self):
+        return self._app.game_object_images, self._app.ui_object_images
+
+    def _account_assets(self):
+        # The images are only accounted again if an image has been loaded or evicted since they were last accounted
+        versions = tuple(cache.version for cache in self._caches())
+
+        if versions == self._versions:
+            return
+
+        self._versions = versions
+        self._image_paths.clear()
+        self._state_assets.clear()
+        asset_bytes = {}
+
+        for cache in self._caches():
+            for path, image in cache.images.items():
+                self._image_paths[id(image)] = path
+                asset_bytes[path] = self._asset_bytes.get(path) or texture_bytes(image)
+
+        # Evicted images are reported as taking no texture memory
+        for path in set(self._asset_bytes) | set(asset_bytes):
+            if self._asset_bytes.get(path) != asset_bytes.get(path):
+                self._gauge({"asset": path}).set(asset_bytes.get(path, 0))
+
+        self._asset_bytes = asset_bytes
+
+    @staticmethod
+    def _gauge(labels):
+        return metrics.gauge("texture_bytes", "Texture memory of an image or a game state in bytes", labels)
+
+    @staticmethod
+    def _images_of(game_state):
+        return [image for obj in game_state.game_objects + game_state.ui_objects for image in obj.images]
+
+    @staticmethod
+    def _target_bytes(game_state):
+        return sum(texture_bytes(render_target.texture) for render_target in game_state.render_targets)
+
+    def _assets_of(self, game_state):
+        # The images of a game state are only established again if the images its game and UI objects show have changed
+        # (eg. a sprite has been given another image) or images have been loaded or evicted since
+        self._account_assets()
+        images = tuple(id(image) for image in self._images_of(game_state))
+
+        if self._state_images.get(game_state.name) != images or game_state.name not in self._state_assets:
+            self._state_images[game_state.name] = images
+            self._state_assets[game_state.name] = frozenset(
+                self._image_paths[image] for image in images if image in self._image_paths)
+
+        return self._state_assets[game_state.name]
+
+    def entered(self, game_state):
+        """
+        Account a game state as it is entered, ie. it is now the current game state, any of the images its game and UI
+        objects show that have been evicted are loaded again (before it is drawn), this also enforces the budget
+
+        :param game_state: game state that has been entered
+
+        :return nothing:
+        """
+        self._entry_count += 1
+        self._entries[game_state.name] = self._entry_count
+
+        for obj in game_state.game_objects + game_state.ui_objects:
+            obj.reload_images(self._reloaded)
+
+        self.enforce()
+
+        resident_bytes = self.resident_bytes
+        state_bytes = self.state_bytes(game_state)
+        metrics.gauge("texture_resident_bytes", "Texture memory of all loaded images and render targets in bytes").set(
+            resident_bytes)
+        self._gauge({"state": game_state.name}).set(state_bytes)
+
+        self._app.debug_hud.set("textures", "textures: {0:.1f} MB  state: {1:.1f} MB  budget: {2}",
+                                resident_bytes / TEXTURE_BUDGET_UNIT, state_bytes / TEXTURE_BUDGET_UNIT,
+                                "{0:.0f} MB".format(self._budget / TEXTURE_BUDGET_UNIT) if self._budget else "none")
+
+    def enforce(self):
+        """
+        If the texture memory is over the budget then evict the images that no game state shows (unless game states are
+        still waiting to be prewarmed) and then those of the inactive game states, least recently entered (or never
+        entered) first, also releasing their render targets, until the texture memory is back within the budget, only
+        images of evictable caches are evicted (ie. the screens rather than the UI images packed into texture atlases)
+        and the images (including render target textures) shown by the current game state are never evicted, the game
+        and UI objects of the inactive game states are kept (along with any game play on them) and are shown their
+        images again when their game state is next entered
+
+        :return nothing:
+        """
+        if not self._budget or self.resident_bytes <= self._budget:
+            return
+
+        # Images that no game state shows (eg. those of game states that have not been built yet) go first, but not
+        # while game states are still waiting to be prewarmed, as which images they show is only known once they are
+        # built (the budget is enforced again once prewarming has finished)
+        if not self._app.game_states.prewarming:
+            self._evict_unused()
+
+        current = self._app.current_game_state
+        current_assets = self._assets_of(current) if current else frozenset()
+        current_images = {id(image) for image in self._images_of(current)} if current else set()
+
+        candidates = [game_state for game_state in self._app.game_states.loaded() if game_state is not current]
+        candidates.sort(key=lambda game_state: self._entries.get(game_state.name, 0))
+
+        for game_state in candidates:
+            if self.resident_bytes <= self._budget:
+                break
+
+            self._evict(self._assets_of(game_state) - current_assets)
+
+            # Render targets go once the game state's images have, unless the current game state shows their texture
+            # (eg. the game play menu state shows the game play state's screen capture)
+            if self.resident_bytes > self._budget and not any(id(render_target.texture) in current_images
+                                                              for render_target in game_state.render_targets):
+                game_state.release_render_targets()
+
+    def _evict_unused(self):
+        shown = set()
+
+        for game_state in self._app.game_states.loaded():
+            shown.update(self._assets_of(game_state))
+
+        self._evict({path for cache in self._caches() for path in cache.images if path not in shown})
+
+    def _evict(self, paths):
+        # Only the images of evictable caches are evicted, until the texture memory is back within the budget
+        for cache in self._caches():
+            if not cache.evictable:
+                continue
+
+            for path in [path for path in cache.images if path in paths]:
+                if self.resident_bytes <= self._budget:
+                    return
+
+                cache.evict(path)
+                self._evictions.inc()
+
+    def _reloaded(self, image):
+        for cache in self._caches():
+            reloaded = cache.reloaded(image)
+
+            if reloaded is not image:
+                return reloaded
+
+        return image
@@ -0,0 +1,139 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       tiled_image.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Tiled image class, a large image split into square tiles so that only the tiles in view need to be
+                  drawn, each tile has its own mipmapped texture so it minifies cleanly when zoomed out, the texture
+                  of a tile is clamped at its edges and surrounded by a gutter of its neighbouring tiles' pixels, so
+                  that filtering across the tile boundaries samples the right pixels and no seams show
+"""
+
+# Imports
+import math
+from pyglet.gl import *
+from engine.consts import *
+
+
+# Consts
+# Globals
+# Functions
+
+
+# Classes
+class TiledImage:
+    def __init__(self, image_data, tile_size=TILE_SIZE, gutter=TILE_GUTTER):
+        """
+        Initialiser for the TiledImage class
+
+        :attr _width: width of the whole image in pixels
+        :attr _height: height of the whole image in pixels
+        :attr _tile_size: size in pixels of each square tile, tiles along the right and top edges may be smaller
+        :attr _columns: number of tiles across the width of the image
+        :attr _rows: number of tiles up the height of the image
+        :attr _tiles: list of (x, y, texture) tuples, one per tile (row by row from the bottom left of the image), x and
+                      y give the position of the bottom left of the tile within the whole image, texture is the region
+                      of a mipmapped pyglet.image.Texture (its owner, which also holds the tile's gutter) that is the
+                      tile itself, ie. each tile carries its own pyramid of progressively halved levels
+
+        :param image_data: pyglet.image.ImageData of the whole image
+        :param tile_size: size in pixels of each square tile
+        :param gutter: size in pixels of the gutter of neighbouring pixels around each tile's texture
+        """
+        self._width = image_data.width
+        self._height = image_data.height
+        self._tile_size = tile_size
+        self._columns = math.ceil(self._width / tile_size)
+        self._rows = math.ceil(self._height / tile_size)
+        self._tiles = []
+
+        for y in range(0, self._height, tile_size):
+            for x in range(0, self._width, tile_size):
+                width = min(tile_size, self._width - x)
+                height = min(tile_size, self._height - y)
+
+                # The gutter only extends into neighbouring tiles, at the edges of the whole image the clamping suffices
+                left = min(gutter, x)
+                bottom = min(gutter, y)
+                right = min(gutter, self._width - x - width)
+                top = min(gutter, self._height - y - height)
+
+                texture = self._mipmapped_texture(image_data.get_region(x - left, y - bottom, left + width + right,
+                                                                        bottom + height + top))
+                self._tiles.append((x, y, texture.get_region(left, bottom, width, height)))
+
+    @staticmethod
+    def _mipmapped_texture(image):
+        # The mipmaps are generated from the texture once the pixels have been uploaded (get_mipmapped_texture() in
+        # pyglet generates them from the blank texture before the upload, which some drivers reject as an invalid
+        # operation and others silently leave as empty minified levels)
+        texture = image.get_texture()
+        glBindTexture(texture.target, texture.id)
+        glTexParameteri(texture.target, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
+        glTexParameteri(texture.target, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(texture.target, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glGenerateMipmap(texture.target)
+
+        return texture
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def tile_size(self):
+        return self._tile_size
+
+    @property
+    def columns(self):
+        return self._columns
+
+    @property
+    def rows(self):
+        return self._rows
+
+    @property
+    def tiles(self):
+        return self._tiles
+
+    def delete(self):
+        """
+        Delete the textures of all the tiles
+
+        :return nothing:
+        """
+        for x, y, texture in self._tiles:
+            texture.owner.delete()
+
+        self._tiles.clear()
+
+    def tiles_in_view(self, x, y, scale, view_width, view_height):
+        """
+        Establish which tiles intersect the view when the whole image is drawn with its bottom left at (x, y) and at the
+        given scale
+
+        :param x: x position of the bottom left of the whole image within the view
+        :param y: y position of the bottom left of the whole image within the view
+        :param scale: scale the whole image is drawn at
+        :param view_width: width of the view, eg. the game window
+        :param view_height: height of the view, eg. the game window
+
+        :return indices: set of indices into the tiles list of the tiles in view
+        """
+        scaled_tile_size = self._tile_size * scale
+
+        first_column = max(0, int((0 - x) // scaled_tile_size))
+        last_column = min(self._columns - 1, int((view_width - x) // scaled_tile_size))
+        first_row = max(0, int((0 - y) // scaled_tile_size))
+        last_row = min(self._rows - 1, int((view_height - y) // scaled_tile_size))
+
+        return {row * self._columns + column
+                for row in range(first_row, last_row + 1)
+                for column in range(first_column, last_column + 1)}
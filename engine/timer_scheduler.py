@@ -0,0 +1,225 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       timer_scheduler.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Timer scheduler class, a single heap of timed callbacks for the UI (eg. a push button returning to its
+                  hover image after being pressed) that is driven by one entry on the pyglet clock, timers can be
+                  cancelled, timers scheduled with the same key are coalesced into one and finished timers are pooled
+                  and reused, so rapid clicking or repeat firing buttons neither allocate closures nor churn the pyglet
+                  clock
+"""
+
+# Imports
+import heapq
+import pyglet
+from engine.consts import *
+from engine import metrics
+
+
+# Consts
+# Globals
+_fired_counter = metrics.counter("ui_timers_fired_total", "Number of UI timers fired")
+
+# Functions
+
+
+# Classes
+class ScheduledCallback:
+    __slots__ = ("callback", "args", "due", "interval", "key", "generation", "active")
+
+    def __init__(self):
+        """
+        Initialiser for the ScheduledCallback class, the handle of a timer, handles are pooled by the timer scheduler
+        so a handle is only valid until its timer fires (unless it repeats) or is cancelled, use a key to refer to a
+        timer for longer than that
+
+        :attr callback: function to call when the timer fires, it is called with the timer's args
+        :attr args: tuple of arguments to call the callback with
+        :attr due: clock time at which the timer is next due to fire
+        :attr interval: interval (in seconds) at which the timer repeats, None if it fires only once
+        :attr key: key the timer was scheduled with, None if it has no key
+        :attr generation: incremented whenever the timer is rescheduled or released, entries in the scheduler's heap
+                          for an earlier generation are stale and are skipped
+        :attr active: True if the timer is scheduled, otherwise False (ie. the handle is in the pool)
+        """
+        self.callback = None
+        self.args = ()
+        self.due = 0.0
+        self.interval = None
+        self.key = None
+        self.generation = 0
+        self.active = False
+
+
+class TimerScheduler:
+    def __init__(self, clock=None):
+        """
+        Initialiser for the TimerScheduler class
+
+        :attr _clock: pyglet.clock.Clock the scheduler is driven by
+        :attr _heap: heap of (due time, sequence number, generation, ScheduledCallback) tuples, the sequence number
+                     keeps timers due at the same time in the order they were scheduled
+        :attr _keys: dictionary of key to the ScheduledCallback of the active timer scheduled with that key
+        :attr _pool: list of released ScheduledCallback objects ready for reuse
+        :attr _sequence: sequence number of the next heap entry
+        :attr _armed: clock time the scheduler's tick is scheduled on the pyglet clock for, None if not scheduled
+
+        :param clock: pyglet.clock.Clock to use, None for pyglet's default clock
+        """
+        self._clock = clock or pyglet.clock.get_default()
+        self._heap = []
+        self._keys = {}
+        self._pool = []
+        self._sequence = 0
+        self._armed = None
+
+    @property
+    def pending(self):
+        return sum(1 for due, sequence, generation, handle in self._heap
+                   if handle.active and handle.generation == generation)
+
+    @property
+    def pooled(self):
+        return len(self._pool)
+
+    def schedule(self, callback, delay, *args, key=None, interval=None):
+        """
+        Schedule a callback to be called after a delay, if a timer with the same key is already scheduled then it is
+        replaced (ie. coalesced) rather than a second timer being scheduled
+
+        :param callback: function to call, it is called with the args
+        :param delay: delay in seconds
+        :param args: arguments to call the callback with
+        :param key: any hashable value that identifies the timer (eg. a tuple of the owning widget and a name), None
+                    for a timer that is never coalesced
+        :param interval: interval in seconds at which the callback is repeated after it first fires, None to fire once
+
+        :return handle: engine.timer_scheduler.ScheduledCallback of the timer
+        """
+        handle = self._keys.get(key) if key is not None else None
+
+        if handle is None:
+            handle = self._pool.pop() if self._pool else ScheduledCallback()
+
+            if key is not None:
+                self._keys[key] = handle
+
+        handle.generation += 1
+        handle.callback = callback
+        handle.args = args
+        handle.due = self._clock.time() + delay
+        handle.interval = interval
+        handle.key = key
+        handle.active = True
+
+        self._push(handle)
+        return handle
+
+    def cancel(self, key=None, handle=None):
+        """
+        Cancel a timer, no-op if the timer is not scheduled
+
+        :param key: key of the timer to cancel
+        :param handle: handle of the timer to cancel (if it has no key), only valid until the timer fires
+
+        :return boolean: True if a timer was cancelled, otherwise False
+        """
+        handle = self._keys.get(key) if key is not None else handle
+
+        if handle is None or not handle.active:
+            return False
+
+        self._release(handle)
+        return True
+
+    def is_scheduled(self, key):
+        """
+        Check whether a timer with the given key is scheduled
+
+        :param key: key of the timer
+
+        :return boolean: True if the timer is scheduled, otherwise False
+        """
+        return key in self._keys
+
+    def clear(self):
+        """
+        Cancel all timers
+
+        :return nothing:
+        """
+        for due, sequence, generation, handle in self._heap:
+            if handle.active:
+                self._release(handle)
+
+        self._heap.clear()
+        self._clock.unschedule(self._tick)
+        self._armed = None
+
+    def _push(self, handle):
+        heapq.heappush(self._heap, (handle.due, self._sequence, handle.generation, handle))
+        self._sequence += 1
+
+        if self._armed is None or handle.due < self._armed:
+            self._arm(handle.due)
+
+    def _arm(self, due):
+        # The scheduler only ever has a single entry on the pyglet clock, for its earliest timer
+        if self._armed is not None:
+            self._clock.unschedule(self._tick)
+
+        self._armed = due
+        self._clock.schedule_once(self._tick, max(0.0, due - self._clock.time()))
+
+    def _release(self, handle):
+        handle.active = False
+        handle.generation += 1
+
+        if handle.key is not None and self._keys.get(handle.key) is handle:
+            del self._keys[handle.key]
+
+        handle.callback = None
+        handle.args = ()
+        handle.key = None
+        self._pool.append(handle)
+
+    def _tick(self, dt):
+        self._armed = None
+        now = self._clock.time()
+
+        while self._heap and self._heap[0][0] <= now:
+            due, sequence, generation, handle = heapq.heappop(self._heap)
+
+            if not handle.active or handle.generation != generation:
+                continue
+
+            callback, args = handle.callback, handle.args
+
+            if handle.interval:
+                # A repeating timer that has fallen behind is not fired again to catch up, it just waits an interval
+                handle.due = max(due + handle.interval, now + handle.interval / 2)
+                self._push(handle)
+            else:
+                self._release(handle)
+
+            _fired_counter.inc()
+            callback(*args)
+
+        # Drop stale entries from the top of the heap and schedule the tick for the earliest remaining timer
+        while self._heap and (not self._heap[0][3].active or self._heap[0][3].generation != self._heap[0][2]):
+            heapq.heappop(self._heap)
+
+        if self._heap and self._armed is None:
+            self._arm(self._heap[0][0])
+
+
+# The scheduler shared by all UI widgets, use the function below to reach it
+_scheduler = TimerScheduler()
+
+
+def scheduler():
+    return _scheduler
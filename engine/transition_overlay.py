@@ -0,0 +1,133 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       transition_overlay.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Transition overlay class, draws the most recent transition firings from the transition history with
+                  the time spent in the guard, leave() and enter() of each, firings that took longer than the frame
+                  budget (ie. caused a frame hitch) are marked
+"""
+
+# Imports
+import pyglet
+from engine.consts import *
+from fsm import transition_history
+
+
+# Consts
+OVERLAY_MARGIN = 8
+OVERLAY_WIDTH = 560
+OVERLAY_FONT_SIZE = 10
+OVERLAY_LINE_HEIGHT = 16
+OVERLAY_MAX_RECORDS = 12
+HITCH_MARKER = "!"
+
+
+# Globals
+# Functions
+
+
+# Classes
+class TransitionOverlay:
+    def __init__(self, app, visible=False):
+        """
+        Initialiser for the TransitionOverlay class, the overlay text is only rebuilt when a transition has been
+        recorded since it was last drawn
+
+        :attr _app: reference to the main game app object
+        :attr _visible: True if the overlay is drawn, otherwise False
+        :attr _batch: drawing batch for the overlay, built on the first draw
+        :attr _background: translucent pyglet.shapes.Rectangle behind the overlay
+        :attr _label: multiline pyglet.text.Label of the recent transition firings
+        :attr _recorded: number of firings the transition history had recorded when the overlay was last refreshed,
+                         None to force a refresh
+
+        :param app: main game app object
+        :param visible: initial visibility as a boolean
+        """
+        self._app = app
+        self._visible = visible
+        self._batch = None
+        self._background = None
+        self._label = None
+        self._recorded = None
+
+    @property
+    def visible(self):
+        return self._visible
+
+    @visible.setter
+    def visible(self, value):
+        self._visible = value
+        self._recorded = None
+
+    def invalidate(self):
+        """
+        Discard the overlay so that it is rebuilt for the current size of the game window when it is next drawn
+
+        :return nothing:
+        """
+        self._batch = None
+        self._recorded = None
+
+    def _build(self):
+        window = self._app.game_window
+        self._batch = pyglet.graphics.Batch()
+        background = pyglet.graphics.Group(0)
+        foreground = pyglet.graphics.Group(1)
+
+        height = OVERLAY_LINE_HEIGHT * (OVERLAY_MAX_RECORDS + 2) + OVERLAY_MARGIN * 2
+        left = window.width - OVERLAY_WIDTH - OVERLAY_MARGIN
+        top = window.height - OVERLAY_MARGIN
+
+        self._background = pyglet.shapes.Rectangle(left, top - height, OVERLAY_WIDTH, height, color=(0, 0, 0, 192),
+                                                   batch=self._batch, group=background)
+
+        self._label = pyglet.text.Label("", font_size=OVERLAY_FONT_SIZE, color=(255, 255, 255, 255),
+                                        x=left + OVERLAY_MARGIN, y=top - OVERLAY_MARGIN,
+                                        anchor_y="top", width=OVERLAY_WIDTH - OVERLAY_MARGIN * 2,
+                                        multiline=True, batch=self._batch, group=foreground)
+
+    def _refresh(self):
+        history = transition_history.history()
+        budget = self._app.frame_profiler.frame_budget
+        hitches = len(history.over(budget))
+
+        lines = ["transitions: {0}   hitches (> {1:.1f} ms): {2}".format(history.recorded, budget * 1000, hitches),
+                 "  {0:<44}{1:>9}{2:>9}{3:>9}{4:>9}  ms".format("transition", "guard", "leave", "enter", "total")]
+
+        for record in reversed(history.records[-OVERLAY_MAX_RECORDS:]):
+            marker = HITCH_MARKER if record.total_time > budget else " "
+            name = "{0}->{1}".format(record.source, record.target)
+
+            if record.outcome != transition_history.FIRED:
+                name += " ({0})".format(record.outcome)
+
+            lines.append("{0} {1:<44}{2:>9.2f}{3:>9.2f}{4:>9.2f}{5:>9.2f}".format(
+                marker, name[:44], record.guard_time * 1000, record.leave_time * 1000, record.enter_time * 1000,
+                record.total_time * 1000))
+
+        self._label.text = "\n".join(lines)
+
+    def draw(self):
+        """
+        Draw the overlay if it is visible
+
+        :return nothing:
+        """
+        if not self._visible:
+            return
+
+        if not self._batch:
+            self._build()
+
+        recorded = transition_history.history().recorded
+
+        if recorded != self._recorded:
+            self._recorded = recorded
+            self._refresh()
+
+        self._batch.draw()
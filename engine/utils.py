@@ -56,3 +56,41 @@ def direction(x, y):
         return math.pi / 2
 
     return 0  # No direction
+
+
+def polygon_edges(polygon):
+    """
+    Precomputes the non-horizontal edges of a polygon for use with point_in_polygon(), each edge is returned as a tuple
+    of (x1, y1, y2, dx/dy) so that no division is needed when testing a point
+
+    :param polygon: list of (x, y) coordinates of the polygon, it may or may not repeat the first coordinate at the end
+
+    :return: list of edge tuples
+    """
+    edges = []
+
+    for (x1, y1), (x2, y2) in zip(polygon, polygon[1:] + polygon[:1]):
+        if y1 != y2:
+            edges.append((x1, y1, y2, (x2 - x1) / (y2 - y1)))
+
+    return edges
+
+
+def point_in_polygon(x, y, edges):
+    """
+    Returns True if the point lies inside the polygon with the supplied precomputed edges (see polygon_edges()), this
+    uses an even-odd ray casting test
+
+    :param x: x coordinate of the point
+    :param y: y coordinate of the point
+    :param edges: list of edge tuples as returned by polygon_edges()
+
+    :return: True if the point is inside the polygon, otherwise False
+    """
+    inside = False
+
+    for x1, y1, y2, dxdy in edges:
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * dxdy:
+            inside = not inside
+
+    return inside
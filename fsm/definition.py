@@ -0,0 +1,181 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       definition.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - State machine definition class, the states and transitions of a state machine as data (eg. loaded
+                  from a JSON file), the definition is validated when it is created and compiled into a
+                  fsm.transition_table.TransitionTable, the format of the data is:
+
+                  {
+                      "initial": "state name",
+                      "terminal": ["state name", ...],
+                      "states": [{"name": "state name", ...any other state data...}, ...],
+                      "transitions": [{"source": "state name", "target": "state name", "weight": number}, ...]
+                  }
+
+                  "terminal" lists the states that are allowed to have no transitions out of them and "weight" is the
+                  relative likelihood of a transition being fired, both are optional
+"""
+
+# Imports
+import json
+from fsm.transition_table import TransitionTable
+from fsm.exceptions import InvalidDefinitionError
+
+
+# Consts
+# Globals
+# Functions
+
+
+# Classes
+class StateMachineDefinition:
+    def __init__(self, data):
+        """
+        Initialiser for the StateMachineDefinition class
+
+        :attr _initial: name of the state the state machine starts in
+        :attr _terminal: frozenset of names of the states that are allowed to have no transitions out of them
+        :attr _states: dictionary of state name to its state data (a dictionary of the entries for the state other
+                       than its name), in the order the states are defined
+        :attr _transitions: tuple of (source name, target name) tuples in the order the transitions are defined
+        :attr _weights: dictionary of (source name, target name) tuple to the weight of that transition, for those
+                        transitions that have a weight
+        :attr _table: fsm.transition_table.TransitionTable compiled from the transitions
+
+        :param data: dictionary of the definition, see the module notes for its format
+
+        :exception InvalidDefinitionError: raised if the definition has any problems, these are all reported at once
+        """
+        self._initial = data.get("initial")
+        self._terminal = frozenset(data.get("terminal", ()))
+        self._states = {}
+        self._weights = {}
+
+        problems = []
+
+        # Entries are numbered from 0 in the problems reported, as they are indexed in the data, incomplete entries are
+        # reported and then left out of the definition
+        for index, state_data in enumerate(data.get("states", ())):
+            state_data = dict(state_data)
+            name = state_data.pop("name", None)
+
+            if name is None:
+                problems.append("state entry {0} has no name".format(index))
+                continue
+
+            if name in self._states:
+                problems.append("state {0} is defined more than once".format(name))
+
+            self._states[name] = state_data
+
+        transitions = []
+
+        for index, transition_data in enumerate(data.get("transitions", ())):
+            pair = (transition_data.get("source"), transition_data.get("target"))
+            missing = [key for key, name in zip(("source", "target"), pair) if name is None]
+
+            if missing:
+                problems.append("transition entry {0} has no {1}".format(index, "/".join(missing)))
+                continue
+
+            if pair in transitions:
+                # Adding this transition to the source state would raise a fsm.exceptions.DuplicateTransitionError
+                problems.append("transition {0}->{1} is defined more than once".format(*pair))
+                continue
+
+            transitions.append(pair)
+
+            if "weight" in transition_data:
+                self._weights[pair] = transition_data["weight"]
+
+        self._transitions = tuple(transitions)
+
+        problems.extend(self._validate())
+
+        if problems:
+            raise InvalidDefinitionError(problems)
+
+        self._table = TransitionTable(self._transitions, self._weights)
+
+    @classmethod
+    def from_file(cls, definition_file):
+        """
+        Create a state machine definition from a JSON file
+
+        :param definition_file: file object open for reading, or the path of the file as a string
+
+        :return definition: fsm.definition.StateMachineDefinition object
+        """
+        if isinstance(definition_file, str):
+            with open(definition_file) as json_file:
+                return cls(json.load(json_file))
+
+        return cls(json.load(definition_file))
+
+    @property
+    def initial(self):
+        return self._initial
+
+    @property
+    def terminal(self):
+        return self._terminal
+
+    @property
+    def states(self):
+        return tuple(self._states)
+
+    @property
+    def transitions(self):
+        return self._transitions
+
+    @property
+    def table(self):
+        return self._table
+
+    def state_data(self, name):
+        """
+        Get the data a state was defined with (other than its name)
+
+        :param name: name of the state
+
+        :return data: dictionary of the state's data
+
+        :exception KeyError: raised if the state is not defined
+        """
+        return self._states[name]
+
+    def _validate(self):
+        problems = []
+
+        if self._initial not in self._states:
+            problems.append("initial state {0} is not defined".format(self._initial))
+
+        for name in sorted(self._terminal - set(self._states)):
+            problems.append("terminal state {0} is not defined".format(name))
+
+        for source_name, target_name in self._transitions:
+            for name in (source_name, target_name):
+                if name not in self._states:
+                    problems.append("transition {0}->{1} has undefined state {2}".format(source_name, target_name,
+                                                                                           name))
+
+        if problems:
+            return problems
+
+        sources = set(source_name for source_name, target_name in self._transitions)
+        table = TransitionTable(self._transitions)
+        reachable = table.reachable(self._initial) if self._initial in table else frozenset()
+
+        for name in self._states:
+            if name != self._initial and name not in reachable:
+                problems.append("state {0} cannot be reached from initial state {1}".format(name, self._initial))
+
+            if name not in sources and name not in self._terminal:
+                problems.append("state {0} is a dead end but is not a terminal state".format(name))
+
+        return problems
@@ -96,3 +96,14 @@ class DuplicateTransitionError(Exception):
     @property
     def state1(self):
         return self._state1
+
+
+class InvalidDefinitionError(Exception):
+    def __init__(self, problems):
+        msg = "State machine definition is invalid: " + "; ".join(problems)
+        super().__init__(msg)
+        self._problems = problems
+
+    @property
+    def problems(self):
+        return self._problems
@@ -28,19 +28,26 @@ class State(IdentifiedEntity):
 
         :attr _name: name associated with this state, read only property
 
-        :attr _transitions: set of all transitions from this (source state) state to other states (target states), this
-                            is a private property and should not be accessed directly to ensure integrity
+        :attr _transitions: dictionary of target state uid to the transition from this (source state) state to that
+                            target state, kept in the order the transitions were added so that the first transition
+                            can be fired without naming its target, this is a private property and should not be
+                            accessed directly to ensure integrity
 
         :param name: name of this state as a string
         """
         super().__init__()
         self._name = name
-        self._transitions = []
+        self._transitions = {}
 
     @property
     def name(self):
         return self._name
 
+    @property
+    def transitions(self):
+        # Read only view of the transitions, use add_transition() and remove_transition() to change them
+        return tuple(self._transitions.values())
+
     def __eq__(self, other):
         """
         Equality predicate method to check this state against another supplied state
@@ -62,8 +69,8 @@ class State(IdentifiedEntity):
     def add_transition(self, target_state, guard=None):
         """
         Add a new fsm.transition.Transition object that has the provided target state object as its target state, this
-        transition is then added to the set of transitions for this state, NOTE: since a set is being added    to, any
-        duplicate transitions are disregarded and not added to the set
+        transition is then added to the transitions for this state, NOTE: a state has at most one transition to each
+        target state so any duplicate transition is not added
 
         :param target_state: fsm.state.State object to provide the target state of the transition being added
         :param guard: function object that acts as a guard for this transition
@@ -72,12 +79,10 @@ class State(IdentifiedEntity):
 
         :exception DuplicateTransitionError: raised if transition to be added is already in set of transitions
         """
-        transition = Transition(self, target_state, guard=guard)
-
-        if transition in self._transitions:
+        if target_state.uid in self._transitions:
             raise DuplicateTransitionError(self, target_state)
 
-        self._transitions.append(transition)
+        self._transitions[target_state.uid] = Transition(self, target_state, guard=guard)
 
     def get_transition(self, target_state):
         """
@@ -89,11 +94,7 @@ class State(IdentifiedEntity):
         :return transition: fsm.transition.Transition object returned if it is in the state's transitions set or None if
                             it does not
         """
-        for transition in self._transitions:
-            if transition.source == self and transition.target == target_state:
-                return transition
-
-        return None
+        return self._transitions.get(target_state.uid)
 
     def remove_transition(self, target_state):
         """
@@ -106,11 +107,7 @@ class State(IdentifiedEntity):
 
         :exception TransitionNotFoundError: raised if no matching transition is found
         """
-        transition = self.get_transition(target_state)
-
-        if transition :
-            self._transitions.remove(transition)
-        else:
+        if self._transitions.pop(target_state.uid, None) is None:
             raise TransitionNotFoundError(self, target_state)
 
     def clear_transitions(self):
@@ -150,7 +147,7 @@ class State(IdentifiedEntity):
             else:
                 raise TransitionNotFoundError(self, target_state)
         else:
-            return self._transitions[0].fire(one_off_guard=guard)
+            return next(iter(self._transitions.values())).fire(one_off_guard=guard)
 
     def enter(self, state):
         """
@@ -10,8 +10,10 @@ Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leade
 """
 
 # Imports
+import time
 from data_model.identified_entity import IdentifiedEntity
 from fsm.exceptions import GuardFailedException
+from fsm import transition_history
 
 
 # Consts
@@ -98,19 +100,39 @@ class Transition(IdentifiedEntity):
         :exception GuardFailedException: raised if the guard prohibits the transaction as it is being processed
         """
         active_guard = one_off_guard if one_off_guard else self.guard
+        source_name = getattr(self.source, "name", self.source)
+        target_name = getattr(self.target, "name", self.target)
 
-        if active_guard and not active_guard(self.source, self.target):
-            # Cannot transition at this time as the active guard function has prohibited it, this will also raise a
-            # fsm.exceptions.GuardFailedException exception to indicate this
-            raise GuardFailedException(self.source, self.target, self)
+        # Every firing is recorded in the transition history along with the time spent in each of its steps
+        guard_time = 0.0
+
+        if active_guard:
+            start = time.perf_counter()
+            guard_passed = active_guard(self.source, self.target)
+            guard_time = time.perf_counter() - start
+
+            if not guard_passed:
+                # Cannot transition at this time as the active guard function has prohibited it, this will also raise a
+                # fsm.exceptions.GuardFailedException exception to indicate this
+                transition_history.history().record(source_name, target_name, transition_history.GUARD_FAILED,
+                                                    guard_time=guard_time)
+                raise GuardFailedException(self.source, self.target, self)
 
         # Guard function must have passed so process this transition
         if self.source == self.target and apply_short_circuit:
             # This transition is a 'short-circuit', the apply_short_circuit parameter determines if the leave() and
             # enter() methods are invoked for such a circumstance (by default they are not)
+            transition_history.history().record(source_name, target_name, transition_history.SHORT_CIRCUIT,
+                                                guard_time=guard_time)
             return self.target
 
+        start = time.perf_counter()
         self.source.leave(self.target)
+        left = time.perf_counter()
         self.target.enter(self.source)
+        entered = time.perf_counter()
+
+        transition_history.history().record(source_name, target_name, transition_history.FIRED,
+                                            guard_time=guard_time, leave_time=left - start, enter_time=entered - left)
 
         return self.target
@@ -0,0 +1,163 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       transition_history.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Transition history class, a ring buffer of the most recent transition firings with the time spent
+                  in the guard and in leaving the source state and entering the target state, so that the transitions
+                  that cause frame hitches (eg. a first entry that builds all of a state's sprites) can be found,
+                  listeners are called with each firing as it is recorded (eg. to count firings as metrics) so that this
+                  package does not depend on whatever observes it
+"""
+
+# Imports
+import time
+import collections
+
+
+# Consts
+DEFAULT_CAPACITY = 64
+
+FIRED = "fired"
+GUARD_FAILED = "guard_failed"
+SHORT_CIRCUIT = "short_circuit"
+
+
+# Globals
+# Functions
+
+
+# Classes
+class TransitionRecord(collections.namedtuple("TransitionRecord", ["timestamp", "source", "target", "outcome",
+                                                                   "guard_time", "leave_time", "enter_time"])):
+    """
+    Record of a single transition firing
+
+    :attr timestamp: time (from time.time()) the transition was fired
+    :attr source: name of the source state
+    :attr target: name of the target state
+    :attr outcome: FIRED, GUARD_FAILED (the guard prohibited the transition) or SHORT_CIRCUIT (the source state is the
+                   target state so it was neither left nor entered)
+    :attr guard_time: time (in seconds) spent in the guard, 0.0 if there is no guard
+    :attr leave_time: time (in seconds) spent in the source state's leave()
+    :attr enter_time: time (in seconds) spent in the target state's enter()
+    """
+    __slots__ = ()
+
+    @property
+    def total_time(self):
+        return self.guard_time + self.leave_time + self.enter_time
+
+
+class TransitionHistory:
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Initialiser for the TransitionHistory class
+
+        :attr _records: ring buffer (a collections.deque) of fsm.transition_history.TransitionRecord objects, oldest
+                        first
+        :attr _recorded: number of firings recorded since the history was created or last reset, unlike the length of
+                         the ring buffer this keeps going up once the ring buffer is full so it can be used to tell
+                         whether anything new has been recorded
+        :attr _listeners: list of functions called with each fsm.transition_history.TransitionRecord as it is recorded
+
+        :param capacity: number of records kept in the ring buffer, older records are discarded
+        """
+        self._records = collections.deque(maxlen=capacity)
+        self._recorded = 0
+        self._listeners = []
+
+    @property
+    def capacity(self):
+        return self._records.maxlen
+
+    @property
+    def recorded(self):
+        return self._recorded
+
+    @property
+    def records(self):
+        return list(self._records)
+
+    def record(self, source, target, outcome, guard_time=0.0, leave_time=0.0, enter_time=0.0):
+        """
+        Record a transition firing
+
+        :param source: name of the source state
+        :param target: name of the target state
+        :param outcome: FIRED, GUARD_FAILED or SHORT_CIRCUIT
+        :param guard_time: time (in seconds) spent in the guard
+        :param leave_time: time (in seconds) spent in the source state's leave()
+        :param enter_time: time (in seconds) spent in the target state's enter()
+
+        :return record: the fsm.transition_history.TransitionRecord object recorded
+        """
+        record = TransitionRecord(time.time(), source, target, outcome, guard_time, leave_time, enter_time)
+        self._records.append(record)
+        self._recorded += 1
+
+        for callback in list(self._listeners):
+            callback(record)
+
+        return record
+
+    def add_listener(self, callback):
+        """
+        Add a listener that is called with each transition firing as it is recorded
+
+        :param callback: function called with the fsm.transition_history.TransitionRecord object recorded
+
+        :return nothing:
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """
+        Remove a listener added by add_listener(), no-op if it was not added
+
+        :param callback: function to remove
+
+        :return nothing:
+        """
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def slowest(self, count=1):
+        """
+        Get the slowest transition firings still held in the ring buffer
+
+        :param count: maximum number of records to return
+
+        :return records: list of fsm.transition_history.TransitionRecord objects, slowest first
+        """
+        return sorted(self._records, key=lambda record: record.total_time, reverse=True)[:count]
+
+    def over(self, duration):
+        """
+        Get the transition firings still held in the ring buffer that took longer than a duration, eg. the frame budget
+
+        :param duration: duration in seconds
+
+        :return records: list of fsm.transition_history.TransitionRecord objects, oldest first
+        """
+        return [record for record in self._records if record.total_time > duration]
+
+    def reset(self):
+        """
+        Discard all records
+
+        :return nothing:
+        """
+        self._records.clear()
+        self._recorded = 0
+
+
+# The history that every transition records its firings in, use the function below to reach it
+_history = TransitionHistory()
+
+
+def history():
+    return _history
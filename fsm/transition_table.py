@@ -0,0 +1,213 @@
+"""
+Author:     Chris Knowles
+Date:       Oct 2020
+Copyright:  University of Sunderland, (c) 2020
+File:       transition_table.py
+Version:    1.0.0
+Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leader Games
+            URL - https://www.tauleadergames.com/deep-space-d6/
+                - Transition table class, a compiled (read only) table of all of the transitions of a state machine
+                  by state name, this answers whether a transition exists, which states can be reached from a state
+                  and the shortest sequence of transitions between two states without needing the states themselves to
+                  exist (eg. game states that have not yet been loaded), transitions can be weighted by how likely
+                  they are to be fired so that the likely next states of a state can be prepared ahead of time
+"""
+
+# Imports
+import collections
+
+
+# Consts
+# Globals
+# Functions
+
+
+# Classes
+class TransitionTable:
+    def __init__(self, transitions, weights=None):
+        """
+        Initialiser for the TransitionTable class, the table is compiled once from the transitions supplied and does
+        not change afterwards
+
+        :attr _names: tuple of state names in the order they first appear in the transitions
+        :attr _targets: dictionary of state name to the tuple of names of its target states, in the order the
+                        transitions were supplied (every state has an entry, even those with no transitions out)
+        :attr _pairs: frozenset of (source name, target name) tuples, ie. every transition
+        :attr _likely: dictionary of state name to the tuple of names of its target states, most likely first (ties
+                       are kept in the order the transitions were supplied)
+        :attr _reachable: dictionary of state name to the frozenset of names of the states that can be reached from it,
+                          filled in as each state is first queried
+
+        :param transitions: iterable of (source name, target name) tuples
+        :param weights: dictionary of (source name, target name) tuple to the relative likelihood of that transition
+                        being fired (a number), transitions with no weight have a weight of 1, None for no weights
+        """
+        weights = weights or {}
+        targets = {}
+
+        for source_name, target_name in transitions:
+            targets.setdefault(source_name, [])
+            targets.setdefault(target_name, [])
+
+            if target_name not in targets[source_name]:
+                targets[source_name].append(target_name)
+
+        self._names = tuple(targets)
+        self._targets = {name: tuple(names) for name, names in targets.items()}
+        self._pairs = frozenset((source_name, target_name) for source_name, names in self._targets.items()
+                                for target_name in names)
+        self._likely = {name: tuple(sorted(names, key=lambda target_name: -weights.get((name, target_name), 1)))
+                        for name, names in self._targets.items()}
+        self._reachable = {}
+
+    @property
+    def names(self):
+        return self._names
+
+    @property
+    def transitions(self):
+        return [(source_name, target_name) for source_name in self._names
+                for target_name in self._targets[source_name]]
+
+    def __contains__(self, name):
+        return name in self._targets
+
+    def __len__(self):
+        return len(self._names)
+
+    def targets(self, name):
+        """
+        Get the names of the states that a state has transitions to
+
+        :param name: name of the source state
+
+        :return names: tuple of target state names
+
+        :exception KeyError: raised if the state is not in the table
+        """
+        return self._targets[name]
+
+    def likely_next(self, name):
+        """
+        Get the names of the states that a state has transitions to, most likely first
+
+        :param name: name of the source state
+
+        :return names: tuple of target state names
+
+        :exception KeyError: raised if the state is not in the table
+        """
+        return self._likely[name]
+
+    def likely_reachable(self, name):
+        """
+        Get the names of all of the states that can be reached from a state in the order they are likely to be reached,
+        ie. breadth first with the targets of each state visited most likely first
+
+        :param name: name of the source state
+
+        :return names: list of state names, not including the source state
+
+        :exception KeyError: raised if the state is not in the table
+        """
+        names = []
+        visited = {name}
+        queue = collections.deque([name])
+
+        while queue:
+            for target_name in self._likely[queue.popleft()]:
+                if target_name not in visited:
+                    visited.add(target_name)
+                    names.append(target_name)
+                    queue.append(target_name)
+
+        return names
+
+    def has_transition(self, source_name, target_name):
+        """
+        Check whether there is a transition between two states
+
+        :param source_name: name of the source state
+        :param target_name: name of the target state
+
+        :return boolean: True if the transition exists, otherwise False
+        """
+        return (source_name, target_name) in self._pairs
+
+    def reachable(self, name):
+        """
+        Get the names of all of the states that can be reached from a state by firing one or more transitions (the
+        state itself is only included if there is a way back to it)
+
+        :param name: name of the source state
+
+        :return names: frozenset of state names
+
+        :exception KeyError: raised if the state is not in the table
+        """
+        reachable = self._reachable.get(name)
+
+        if reachable is None:
+            found = set()
+            queue = collections.deque(self._targets[name])
+
+            while queue:
+                target_name = queue.popleft()
+
+                if target_name not in found:
+                    found.add(target_name)
+                    queue.extend(self._targets[target_name])
+
+            reachable = self._reachable[name] = frozenset(found)
+
+        return reachable
+
+    def is_reachable(self, source_name, target_name):
+        """
+        Check whether a state can be reached from another state
+
+        :param source_name: name of the source state
+        :param target_name: name of the target state
+
+        :return boolean: True if the target state can be reached (or is the source state), otherwise False
+        """
+        return source_name == target_name or target_name in self.reachable(source_name)
+
+    def shortest_path(self, source_name, target_name):
+        """
+        Breadth first search for the shortest sequence of transitions from the source state to the target state
+
+        :param source_name: name of the state to start from
+        :param target_name: name of the state to reach
+
+        :return names: list of names of the states to fire transitions to in turn (empty if the source state is the
+                       target state), or None if the target state cannot be reached
+
+        :exception KeyError: raised if the source state is not in the table
+        """
+        if source_name == target_name:
+            return []
+
+        previous = {source_name: None}
+        queue = collections.deque([source_name])
+
+        while queue:
+            name = queue.popleft()
+
+            for next_name in self._targets[name]:
+                if next_name in previous:
+                    continue
+
+                previous[next_name] = name
+
+                if next_name == target_name:
+                    path = [target_name]
+
+                    while previous[path[-1]] != source_name:
+                        path.append(previous[path[-1]])
+
+                    return list(reversed(path))
+
+                queue.append(next_name)
+
+        return None
@@ -24,29 +24,53 @@ from engine.game_sprite import GameSprite
 class GameMainBoardSprite(GameSprite):
     def __init__(self, game_play_state, game_board_images, *args, **kwargs):
         """
-        Initialiser for the GameMainBoardSprite class
+        Initialiser for the GameMainBoardSprite class, this sprite provides the position and scale of the game main
+        board but does not draw itself, instead a sprite per tile of the current engine.tiled_image.TiledImage is drawn
+        and only those tiles that are within the game window are kept in the drawing batch
 
         :attr _current_image_index: current index into the game board images list, ie. currently active game board image
         :attr _decorated_image_index: index into the game board images list of the current decorated game board image
         :attr _game_play_state: the game play state that contains this game board sprite
-        :attr _game_board_images: list of images for the game board such that:-
+        :attr _game_board_images: list of engine.tiled_image.TiledImage objects for the game board such that:-
                                     index 0 is main board
+        :attr _tile_sprites: list of sprites, one for each tile of the current game board image
+        :attr _culled_batch: drawing batch (which is never drawn) that holds the tile sprites not in view
 
         :param game_play_state: game play state that contains this game main board sprite
-        :param game_board_images: list of images for the game main board
+        :param game_board_images: list of tiled images for the game main board
         """
         self._decorated_image_index = 0
         self._current_image_index = self._decorated_image_index
-        super().__init__(img=game_board_images[self._current_image_index], *args, **kwargs)
+        super().__init__(img=game_board_images[self._current_image_index].tiles[0][2], *args, **kwargs)
         self._game_play_state = game_play_state
         self._game_board_images = game_board_images
+        self._tile_sprites = []
+        self._culled_batch = pyglet.graphics.Batch()
         self.image.anchor_x = 0
         self.image.anchor_y = 0
+        self.visible = False
+        self._build_tiles()
 
     @property
     def game_play_state(self):
         return self._game_play_state
 
+    @property
+    def tiled_image(self):
+        return self._game_board_images[self._current_image_index]
+
+    @property
+    def images(self):
+        return list(self._game_board_images)
+
+    @property
+    def width(self):
+        return self.tiled_image.width * self.scale
+
+    @property
+    def height(self):
+        return self.tiled_image.height * self.scale
+
     @property
     def unscaled_width(self):
         return self.width / self.scale
@@ -55,22 +79,105 @@ class GameMainBoardSprite(GameSprite):
     def unscaled_height(self):
         return self.height / self.scale
 
+    def reload_images(self, reload):
+        # The tile sprites are rebuilt for any game board image that has been evicted and loaded again, the position and
+        # scale of the game main board are kept
+        images = [reload(image) for image in self._game_board_images]
+
+        if any(image is not old_image for image, old_image in zip(images, self._game_board_images)):
+            self._game_board_images = images
+            self.image = self.tiled_image.tiles[0][2]
+            self.image.anchor_x = 0
+            self.image.anchor_y = 0
+            self._build_tiles()
+            self._view_changed()
+
     def reinitialise(self):
+        # The tile sprites are only rebuilt if the game board image has changed, eg. not when the game play state was
+        # prewarmed and is now entered for the first time
+        image_changed = self._current_image_index != 0
         self._decorated_image_index = 0
         self._current_image_index = self._decorated_image_index
-        self.image = self._game_board_images[self._current_image_index]
+
+        if image_changed or not self._tile_sprites:
+            self._build_tiles()
+
         self.update(x=0, y=0, scale=1.0)
+        self._view_changed()
+
+    def fit_window(self, width, height):
+        """
+        Keep the game main board within the game window after the size of the game window has changed, the scale of
+        the game main board is left as the player set it
+
+        :param width: new width of the game window
+        :param height: new height of the game window
+
+        :return nothing:
+        """
+        if self.width < width:
+            self.x = 0
+        else:
+            self._constrain_x()
+
+        if self.height < height:
+            self.y = 0
+        else:
+            self._constrain_y()
+
+        self._view_changed()
+
+    def delete(self):
+        for tile_sprite in self._tile_sprites:
+            tile_sprite.delete()
+
+        self._tile_sprites.clear()
+        super().delete()
+
+    def _build_tiles(self):
+        """
+        (Re)create the tile sprites for the current game board image, all start in the culled batch until the next
+        call to _view_changed()
+
+        :return nothing:
+        """
+        for tile_sprite in self._tile_sprites:
+            tile_sprite.delete()
+
+        self._tile_sprites = [GameSprite(window=self.window, img=texture, batch=self._culled_batch, group=self.group)
+                              for _, _, texture in self.tiled_image.tiles]
+
+    def _view_changed(self):
+        """
+        Call this whenever the position or scale of the game main board changes, it moves the tile sprites that are in
+        view into the drawing batch (and all others out of it), positions them and marks the game board as dirty
+
+        :return nothing:
+        """
+        in_view = self.tiled_image.tiles_in_view(self.x, self.y, self.scale, self.window.width, self.window.height)
+
+        for index, (tile_x, tile_y, _) in enumerate(self.tiled_image.tiles):
+            tile_sprite = self._tile_sprites[index]
+
+            if index in in_view:
+                if tile_sprite.batch is not self.batch:
+                    tile_sprite.batch = self.batch
+
+                tile_sprite.update(x=self.x + tile_x * self.scale, y=self.y + tile_y * self.scale, scale=self.scale)
+            elif tile_sprite.batch is not self._culled_batch:
+                tile_sprite.batch = self._culled_batch
+
+        self.mark_dirty()
 
     def updater(self, dt):
         super().updater(dt)
 
     def on_key_press(self, symbol, modifiers):
-        for obj in self.game_play_state.ui_objects:
-            if obj.active and obj.enabled and obj.mouse_inside:
-                return pyglet.event.EVENT_UNHANDLED
+        if self.game_play_state.input_router.widget_hovered:
+            return pyglet.event.EVENT_UNHANDLED
 
         if symbol == pyglet.window.key.ESCAPE:
-            self.game_play_state._screen_capture = pyglet.image.get_buffer_manager().get_color_buffer()
+            self.game_play_state.capture_screen()
             self.game_play_state.fire_transition(self.game_play_state.app.game_states["game_play_menu_screen"])
             return pyglet.event.EVENT_HANDLED
 
@@ -88,50 +195,51 @@ class GameMainBoardSprite(GameSprite):
         #     return pyglet.event.EVENT_HANDLED
 
     def on_text_motion(self, motion):
-        for obj in self.game_play_state.ui_objects:
-            if obj.active and obj.enabled and obj.mouse_inside:
-                return pyglet.event.EVENT_UNHANDLED
+        if self.game_play_state.input_router.widget_hovered:
+            return pyglet.event.EVENT_UNHANDLED
 
         if motion == pyglet.window.key.MOTION_UP:
             if not self.height < self.window.height:
                 self.y += 41
                 self._constrain_y()
+                self._view_changed()
             return pyglet.event.EVENT_HANDLED
 
         if motion == pyglet.window.key.MOTION_DOWN:
             if not self.height < self.window.height:
                 self.y -= 41
                 self._constrain_y()
+                self._view_changed()
             return pyglet.event.EVENT_HANDLED
 
         if motion == pyglet.window.key.MOTION_RIGHT:
             if not self.width < self.window.width:
                 self.x += 27
                 self._constrain_x()
+                self._view_changed()
             return pyglet.event.EVENT_HANDLED
 
         if motion == pyglet.window.key.MOTION_LEFT:
             if not self.width < self.window.width:
                 self.x -= 27
                 self._constrain_x()
+                self._view_changed()
             return pyglet.event.EVENT_HANDLED
 
     def on_mouse_press(self, x, y, button, modifiers):
-        for obj in self.game_play_state.ui_objects:
-            if obj.active and obj.enabled and obj.mouse_inside:
-                return pyglet.event.EVENT_UNHANDLED
+        if self.game_play_state.input_router.widget_hovered:
+            return pyglet.event.EVENT_UNHANDLED
 
         if not button == pyglet.window.mouse.MIDDLE:
             return pyglet.event.EVENT_UNHANDLED
 
-        self.game_play_state._screen_capture = pyglet.image.get_buffer_manager().get_color_buffer()
+        self.game_play_state.capture_screen()
         self.game_play_state.fire_transition(self.game_play_state.app.game_states["game_play_menu_screen"])
         return pyglet.event.EVENT_HANDLED
 
     def on_mouse_drag(self, x, y, dx, dy, buttons, modifiers):
-        for obj in self.game_play_state.ui_objects:
-            if obj.active and obj.enabled and obj.mouse_inside:
-                return pyglet.event.EVENT_UNHANDLED
+        if self.game_play_state.input_router.widget_hovered:
+            return pyglet.event.EVENT_UNHANDLED
 
         if buttons & pyglet.window.mouse.LEFT:
             if not self.width < self.window.width:
@@ -142,12 +250,12 @@ class GameMainBoardSprite(GameSprite):
                 self.y += dy
                 self._constrain_y()
 
+            self._view_changed()
             return pyglet.event.EVENT_HANDLED
 
     def on_mouse_scroll(self, x, y, scroll_x, scroll_y):
-        for obj in self.game_play_state.ui_objects:
-            if obj.active and obj.enabled and obj.mouse_inside:
-                return pyglet.event.EVENT_UNHANDLED
+        if self.game_play_state.input_router.widget_hovered:
+            return pyglet.event.EVENT_UNHANDLED
 
         if scroll_y:
             if scroll_y > 0:
@@ -167,13 +275,13 @@ class GameMainBoardSprite(GameSprite):
             else:
                 self._constrain_y()
 
+            self._view_changed()
+
         # :DEV: #
-        # Display some debug info on the window caption (if not full screen)
-        if not self.game_play_state.app.game_window.fullscreen:
-            obj = self.game_play_state.app.game_window
-            obj.set_caption("{0}   {1} [mouse:({2}, {3}) scale:{4:.2f}"
-                            "  offset:({5}, {6})]".format(WINDOW_CAPTION, self.game_play_state.name, x, y, self.scale,
-                                                          self.x, self.y))
+        # Display some debug info on the debug HUD (only during debug)
+        debug_hud = self.game_play_state.app.debug_hud
+        debug_hud.set("mouse", "mouse: ({0}, {1})", x, y)
+        debug_hud.set("board", "scale: {0:.2f}  offset: ({1}, {2})", self.scale, self.x, self.y)
         # :DEV: #
 
         return pyglet.event.EVENT_HANDLED
@@ -13,6 +13,7 @@ Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leade
 import pyglet
 from engine.game_state import GameState
 from engine.consts import *
+from engine.render_target import RenderTarget
 from game_objects.game_play_screen_sprite import GamePlayScreenSprite
 from game_objects.game_main_board_sprite import GameMainBoardSprite
 from ui.push_button import PushButton
@@ -30,7 +31,10 @@ class GSGamePlay(GameState):
         Initialiser for the GSGamePlay class
 
         :attr _screen_sprite: sprite for the game play screen
-        :attr _screen_capture: image of the current game play to use as back screen for game play menu state
+        :attr _screen_capture: texture of the current game play to use as back screen for game play menu state
+        :attr _render_target: engine.render_target.RenderTarget that the game play is drawn into to form the screen
+                              capture, it is created on the first capture and reused until the game window is resized
+                              (or until it is released while this state is inactive to free texture memory)
         :attr _btn_back: push button to move back from this state
         :attr _reentry: determines if the originating state forces an initialisation of the state (False) or not (True)
         :attr _game_main_board: the current game main board for this game play scenario
@@ -44,8 +48,8 @@ class GSGamePlay(GameState):
         # Game objects
         self._screen_sprite = None
         self._screen_capture = None
+        self._render_target = None
         self._game_main_board = None
-        self._ordered_groups = [pyglet.graphics.Group(i) for i in range(2)]
 
         # UI objects
         self._btn_back = None
@@ -61,10 +65,90 @@ class GSGamePlay(GameState):
     def screen_capture(self, value):
         self._screen_capture = value
 
+    def capture_screen(self, scale=PAUSE_BACKDROP_SCALE):
+        """
+        Capture the current game play into a texture to use as the back screen of the game play menu state, the game
+        and UI objects are drawn straight into an offscreen render target on the GPU so the game window is never read
+        back, the capture becomes the screen_capture property
+
+        :param scale: scale of the capture relative to the game window, values below 1.0 are cheaper and blur the back
+                      screen when it is stretched back up to the window size
+
+        :return texture: pyglet.image.Texture of the captured game play
+        """
+        if not self._render_target or not self._render_target.matches(self.app.game_window, scale):
+            if self._render_target:
+                self._render_target.delete()
+
+            self._render_target = RenderTarget(self.app.game_window, scale)
+
+        # The render graph only draws the layers of the current game state, ie. this game state
+        self._screen_capture = self._render_target.render(self.app.render_graph.draw)
+        return self._screen_capture
+
+    @property
+    def render_targets(self):
+        return [self._render_target] if self._render_target else []
+
+    def release_render_targets(self):
+        # The screen capture is the render target's texture so it goes too, the game play menu state shows the back
+        # screen instead until the game play is next captured
+        if self._render_target:
+            self._render_target.delete()
+            self._render_target = None
+            self._screen_capture = None
+
+    def build(self):
+        """
+        build method for the GSGamePlay game state, note: objects will only be instantiated if they currently are not
+        instantiated, therefore they are only instantiated on the first call (either when prewarmed or on the first
+        entry into this state)
+
+        :return nothing:
+        """
+        # Build game objects associated with this game state
+        if not self._screen_sprite:
+            self._screen_sprite = GamePlayScreenSprite(window=self.app.game_window,
+                                                       img=self.app.game_object_images["game_play_screen"],
+                                                       batch=self._game_objects_batch,
+                                                       group=self.layout.group("screen_sprite"))
+            self.layout.bind("screen_sprite", self._screen_sprite)
+            self.game_objects.append(self._screen_sprite)
+
+        if not self._game_main_board:
+            images = [self.app.game_object_images["game_main_board"]]
+            self._game_main_board = GameMainBoardSprite(game_play_state=self,
+                                                        game_board_images=images,
+                                                        window=self.app.game_window,
+                                                        batch=self._game_objects_batch,
+                                                        group=self.layout.group("game_main_board"))
+            self.layout.add_listener(self._game_main_board.fit_window)
+            self.game_objects.append(self._game_main_board)
+
+        # Build UI objects for the various functions of this game state
+        if not self._btn_back:
+            self._btn_back = PushButton(window=self.app.game_window,
+                                        img=self.app.ui_object_images["btn_back_e"],
+                                        disabled_image=self.app.ui_object_images["btn_back_d"],
+                                        enabled_image=self.app.ui_object_images["btn_back_e"],
+                                        hover_image=self.app.ui_object_images["btn_back_h"],
+                                        pressed_image=self.app.ui_object_images["btn_back_p"],
+                                        batch=self._ui_objects_batch,
+                                        group=self.layout.group("btn_back"),
+                                        command=None,
+                                        hit_area=None,
+                                        hit_mask=self.app.ui_object_hit_masks["btn_back_e"])
+            self.layout.bind("btn_back", self._btn_back)
+            self._ui_objects.append(self._btn_back)
+
+        # Lay out the game and UI objects for the current window size, a no-op if they are already laid out for it
+        self.apply_layout()
+
     def enter(self, state):
         """
-        enter() method for the GSGamePlay game state, note: objects will only be instantiated if they currently are not
-        instantiated, therefore only on the first entry into this state will new objects be instantiated
+        enter() method for the GSGamePlay game state, note: objects are built by build() (unless already built),
+        therefore entering only resets the game objects for a new game play, wires up the UI commands and pushes the
+        event handlers of this state
 
         :param state: fsm.state.State object that was left before entering this state
 
@@ -81,54 +165,16 @@ class GSGamePlay(GameState):
         # This state now becomes the current game state
         self.app.current_game_state = self
 
-        # :DEV: #
-        if not self.app.game_window.fullscreen:
-            self.app.game_window.set_caption("{0}   {1} - ({2}, {3})".format(WINDOW_CAPTION, self.name, 0, 0))
-        # :DEV: #
+        # Build the game and UI objects of this game state, a no-op if they were built ahead of time by prewarming
+        self.build()
 
         if not self._reentry:
-            # Build game objects associated with this game state
-            if not self._screen_sprite:
-                self._screen_sprite = GamePlayScreenSprite(window=self.app.game_window,
-                                                           img=self.app.game_object_images["game_play_screen"],
-                                                           batch=self._game_objects_batch,
-                                                           group=self._ordered_groups[0])
-                self.game_objects.append(self._screen_sprite)
-            else:
-                self._screen_sprite.image = self.app.game_object_images["game_play_screen"]
-
-            scale_x = self.app.game_window.width / self.app.game_object_images["game_play_screen"].width
-            scale_y = self.app.game_window.height / self.app.game_object_images["game_play_screen"].height
-            self._screen_sprite.update(x=0, y=self._screen_sprite.window.height - self._screen_sprite.height,
-                                       scale_x=scale_x, scale_y=scale_y)
-
-            if not self._game_main_board:
-                images = [self.app.game_object_images["game_main_board"]]
-                self._game_main_board = GameMainBoardSprite(game_play_state=self,
-                                                            game_board_images=images,
-                                                            window=self.app.game_window,
-                                                            batch=self._game_objects_batch,
-                                                            group=self._ordered_groups[1])
-                self.game_objects.append(self._game_main_board)
+            # Reset the game objects for the new game play
+            self._screen_sprite.image = self.app.game_object_images["game_play_screen"]
+            self.layout.refresh(self._screen_sprite)
 
             self._game_main_board.reinitialise()
 
-            # Build UI objects for the various functions of this game state
-            if not self._btn_back:
-                self._btn_back = PushButton(window=self.app.game_window,
-                                            img=self.app.ui_object_images["btn_back_e"],
-                                            disabled_image=self.app.ui_object_images["btn_back_d"],
-                                            enabled_image=self.app.ui_object_images["btn_back_e"],
-                                            hover_image=self.app.ui_object_images["btn_back_h"],
-                                            pressed_image=self.app.ui_object_images["btn_back_p"],
-                                            batch=self._ui_objects_batch,
-                                            command=None,
-                                            hit_area=None)
-                self._btn_back.x = 48 * self._screen_sprite.scale_x
-                self._btn_back.y = 27 * self._screen_sprite.scale_y
-                self._btn_back.change_scale(self._screen_sprite.scale_x, self._screen_sprite.scale_y)
-                self._ui_objects.append(self._btn_back)
-
         # Define the various UI commands
         def btn_back_cmd(source, data):
             x, y, button, modifiers = data
@@ -139,12 +185,7 @@ class GSGamePlay(GameState):
         self._btn_back.command = btn_back_cmd
 
         # Ensure all handlers for this game state are pushed onto the event stack of the game window
-        self.app.game_window.push_handlers(self)
-        for obj in self.game_objects:
-            self.app.game_window.push_handlers(obj)
-
-        for obj in self.ui_objects:
-            self.app.game_window.push_handlers(obj)
+        self.push_handlers()
 
     def leave(self, state):
         """
@@ -156,15 +197,12 @@ class GSGamePlay(GameState):
         """
         # Any event handlers specific to this game state that are on the event stack need to be removed from the game
         # window event stack so they don't fire
-        for _ in range(len(self.game_objects) + len(self.ui_objects) + 1):
-            self.app.game_window.pop_handlers()
+        self.pop_handlers()
 
     # :DEV: #
     def on_mouse_motion(self, x, y, dx, dy):
-        # Display some debug info on the window caption (if not full screen)
-        if not self.app.game_window.fullscreen:
-            obj = self.app.game_window
-            obj.set_caption("{0}   {1} [mouse:({2}, {3}) scale:{4:.2f}"
-                            "  offset:({5}, {6})]".format(WINDOW_CAPTION, self.name, x, y, self._game_main_board.scale,
-                                                          self._game_main_board.x, self._game_main_board.y))
-# :DEV: #
+        # Display some debug info on the debug HUD (only during debug)
+        self.app.debug_hud.set("mouse", "mouse: ({0}, {1})", x, y)
+        self.app.debug_hud.set("board", "scale: {0:.2f}  offset: ({1}, {2})", self._game_main_board.scale,
+                               self._game_main_board.x, self._game_main_board.y)
+    # :DEV: #
@@ -30,7 +30,8 @@ class GSGamePlayMenu(GameState):
         Initialiser for the GSGamePlayMenu class
 
         :attr _screen_sprite: sprite that is initialised from the game play screen captured at the time the game play
-                              menu state is transition to
+                              menu state is transition to, the capture may be smaller than the game window and so the
+                              sprite is scaled up to fill the window
         :attr _mask_sprite: a sprite for the overlay of the background screen for the game play menu
         :attr _game_play_menu_screen_sprite: a sprite for the background of the game play menu items
 
@@ -43,7 +44,6 @@ class GSGamePlayMenu(GameState):
         self._screen_sprite = None
         self._mask_sprite = None
         self._game_play_menu_screen_sprite = None
-        self._ordered_groups = [pyglet.graphics.Group(i) for i in range(3)]
 
         # UI objects
         self._btn_resume = None
@@ -56,61 +56,37 @@ class GSGamePlayMenu(GameState):
         if symbol == pyglet.window.key.ESCAPE:
             self.fire_transition(self.app.game_states["game_play_screen"])
 
-    def enter(self, state):
+    def build(self):
         """
-        enter method for the GSGamePlayMenu game state, note: objects will only be instantiated if they currently are not
-        instantiated, therefore only on the first entry into this state will new objects be instantiated
-
-        :param state: fsm.state.State object that was left before entering this state
+        build method for the GSGamePlayMenu game state, note: objects will only be instantiated if they currently are
+        not instantiated, therefore they are only instantiated on the first call (either when prewarmed or on the first
+        entry into this state), the back screen is shown until a screen capture is taken from the game play state
 
         :return nothing:
         """
-        # This state now becomes the current game state
-        self.app.current_game_state = self
-
-        # :DEV: #
-        if not self.app.game_window.fullscreen:
-            self.app.game_window.set_caption("{0}   {1} - ({2}, {3})".format(WINDOW_CAPTION, self.name, 0, 0))
-        # :DEV: #
-
         # Build game objects associated with this game state
         if not self._screen_sprite:
             self._screen_sprite = GamePlayMenuScreenSprite(window=self.app.game_window,
-                                                           img=state.screen_capture,
+                                                           img=self.app.game_object_images["back_screen"],
                                                            batch=self._game_objects_batch,
-                                                           group=self._ordered_groups[0])
-            self._screen_sprite.update(x=0,
-                                       y=self._screen_sprite.window.height - self._screen_sprite.height)
+                                                           group=self.layout.group("screen_sprite"))
+            self.layout.bind("screen_sprite", self._screen_sprite)
             self.game_objects.append(self._screen_sprite)
 
-        # Only renew the screen capture if entering directly from the game play state (as other states do not have the
-        # screen capture available)
-        from game_states.gs_game_play import GSGamePlay
-        if type(state) is GSGamePlay:
-            self._screen_sprite.image = state.screen_capture
-
         if not self._mask_sprite:
-            scale_x = self.app.game_window.width / self.app.game_object_images["game_play_menu_mask"].width
-            scale_y = self.app.game_window.height / self.app.game_object_images["game_play_menu_mask"].height
-
             self._mask_sprite = GameSprite(window=self.app.game_window,
                                            img=self.app.game_object_images["game_play_menu_mask"],
                                            batch=self._game_objects_batch,
-                                           group=self._ordered_groups[1])
-            self._mask_sprite.update(scale_x=scale_x, scale_y=scale_y)
-            self._mask_sprite.update(x=0, y=self._mask_sprite.window.height - self._mask_sprite.height)
+                                           group=self.layout.group("mask_sprite"))
+            self.layout.bind("mask_sprite", self._mask_sprite)
             self.game_objects.append(self._mask_sprite)
 
         if not self._game_play_menu_screen_sprite:
-            scale_x = self.app.game_window.width / self.app.game_object_images["game_play_menu_mask"].width
-            scale_y = self.app.game_window.height / self.app.game_object_images["game_play_menu_mask"].height
-
             self._game_play_menu_screen_sprite = GameSprite(window=self.app.game_window,
                                                             img=self.app.game_object_images["game_play_menu_screen"],
                                                             batch=self._game_objects_batch,
-                                                            group=self._ordered_groups[2])
-            self._game_play_menu_screen_sprite.update(scale_x=scale_x, scale_y=scale_y)
-            self._game_play_menu_screen_sprite.update(x=670 * scale_x, y=210 * scale_y)
+                                                            group=self.layout.group("game_play_menu_screen_sprite"))
+            self.layout.bind("game_play_menu_screen_sprite", self._game_play_menu_screen_sprite)
             self.game_objects.append(self._game_play_menu_screen_sprite)
 
         # Build UI objects for the various menu options
@@ -122,11 +98,11 @@ class GSGamePlayMenu(GameState):
                                           hover_image=self.app.ui_object_images["game_play_menu_btn_resume_h"],
                                           pressed_image=self.app.ui_object_images["game_play_menu_btn_resume_p"],
                                           batch=self._ui_objects_batch,
+                                          group=self.layout.group("btn_resume"),
                                           command=None,
-                                          hit_area=None)
-            self._btn_resume.x = 710 * self._mask_sprite.scale_x
-            self._btn_resume.y = 700 * self._mask_sprite.scale_y
-            self._btn_resume.change_scale(self._mask_sprite.scale_x, self._mask_sprite.scale_y)
+                                          hit_area=None,
+                                          hit_mask=self.app.ui_object_hit_masks["game_play_menu_btn_resume_e"])
+            self.layout.bind("btn_resume", self._btn_resume)
             self.ui_objects.append(self._btn_resume)
 
         if not self._btn_save:
@@ -137,11 +113,11 @@ class GSGamePlayMenu(GameState):
                                         hover_image=self.app.ui_object_images["game_play_menu_btn_save_h"],
                                         pressed_image=self.app.ui_object_images["game_play_menu_btn_save_p"],
                                         batch=self._ui_objects_batch,
+                                        group=self.layout.group("btn_save"),
                                         command=None,
-                                        hit_area=None)
-            self._btn_save.x = 710 * self._mask_sprite.scale_x
-            self._btn_save.y = 600 * self._mask_sprite.scale_y
-            self._btn_save.change_scale(self._mask_sprite.scale_x, self._mask_sprite.scale_y)
+                                        hit_area=None,
+                                        hit_mask=self.app.ui_object_hit_masks["game_play_menu_btn_save_e"])
+            self.layout.bind("btn_save", self._btn_save)
             self.ui_objects.append(self._btn_save)
 
         if not self._btn_load:
@@ -152,11 +128,11 @@ class GSGamePlayMenu(GameState):
                                         hover_image=self.app.ui_object_images["game_play_menu_btn_load_h"],
                                         pressed_image=self.app.ui_object_images["game_play_menu_btn_load_p"],
                                         batch=self._ui_objects_batch,
+                                        group=self.layout.group("btn_load"),
                                         command=None,
-                                        hit_area=None)
-            self._btn_load.x = 710 * self._mask_sprite.scale_x
-            self._btn_load.y = 500 * self._mask_sprite.scale_y
-            self._btn_load.change_scale(self._mask_sprite.scale_x, self._mask_sprite.scale_y)
+                                        hit_area=None,
+                                        hit_mask=self.app.ui_object_hit_masks["game_play_menu_btn_load_e"])
+            self.layout.bind("btn_load", self._btn_load)
             self.ui_objects.append(self._btn_load)
 
         if not self._btn_options:
@@ -167,11 +143,11 @@ class GSGamePlayMenu(GameState):
                                            hover_image=self.app.ui_object_images["game_play_menu_btn_options_h"],
                                            pressed_image=self.app.ui_object_images["game_play_menu_btn_options_p"],
                                            batch=self._ui_objects_batch,
+                                           group=self.layout.group("btn_options"),
                                            command=None,
-                                           hit_area=None)
-            self._btn_options.x = 710 * self._mask_sprite.scale_x
-            self._btn_options.y = 400 * self._mask_sprite.scale_y
-            self._btn_options.change_scale(self._mask_sprite.scale_x, self._mask_sprite.scale_y)
+                                           hit_area=None,
+                                           hit_mask=self.app.ui_object_hit_masks["game_play_menu_btn_options_e"])
+            self.layout.bind("btn_options", self._btn_options)
             self.ui_objects.append(self._btn_options)
 
         if not self._btn_main_menu:
@@ -182,13 +158,46 @@ class GSGamePlayMenu(GameState):
                                              hover_image=self.app.ui_object_images["game_play_menu_btn_main_h"],
                                              pressed_image=self.app.ui_object_images["game_play_menu_btn_main_p"],
                                              batch=self._ui_objects_batch,
+                                             group=self.layout.group("btn_main_menu"),
                                              command=None,
-                                             hit_area=None)
-            self._btn_main_menu.x = 710 * self._mask_sprite.scale_x
-            self._btn_main_menu.y = 300 * self._mask_sprite.scale_y
-            self._btn_main_menu.change_scale(self._mask_sprite.scale_x, self._mask_sprite.scale_y)
+                                             hit_area=None,
+                                             hit_mask=self.app.ui_object_hit_masks["game_play_menu_btn_main_e"])
+            self.layout.bind("btn_main_menu", self._btn_main_menu)
             self.ui_objects.append(self._btn_main_menu)
 
+        # Lay out the game and UI objects for the current window size, a no-op if they are already laid out for it
+        self.apply_layout()
+
+    def enter(self, state):
+        """
+        enter method for the GSGamePlayMenu game state, note: objects are built by build() (unless already built),
+        therefore entering only renews the screen capture, wires up the UI commands and pushes the event handlers of
+        this state
+
+        :param state: fsm.state.State object that was left before entering this state
+
+        :return nothing:
+        """
+        # This state now becomes the current game state
+        self.app.current_game_state = self
+
+        # Build the game and UI objects of this game state, a no-op if they were built ahead of time by prewarming
+        self.build()
+
+        # The screen capture is always taken from the game play state (other states do not have it), if there is no
+        # capture yet, eg. this state is entered first from the load game state, then the back screen is used instead
+        screen_capture = self.app.game_states["game_play_screen"].screen_capture or \
+            self.app.game_object_images["back_screen"]
+
+        # Only renew the screen capture if it has changed, ie. the game play state has captured the screen again or its
+        # capture has been released to free texture memory (see engine.texture_memory.TextureMemory)
+        if self._screen_sprite.image is not screen_capture:
+            self._screen_sprite.image = screen_capture
+
+        # The screen capture may not be the same size as the back screen, so the screen sprite's stretch to fill the
+        # window must be reapplied
+        self.layout.refresh(self._screen_sprite)
+
         # Define the various UI commands
         def btn_resume_cmd(source, data):
             x, y, button, modifiers = data
@@ -223,12 +232,7 @@ class GSGamePlayMenu(GameState):
         self._btn_main_menu.command = btn_main_menu_cmd
 
         # Ensure all handlers for this game state are pushed onto the event stack of the game window
-        self.app.game_window.push_handlers(self)
-        for obj in self.game_objects:
-            self.app.game_window.push_handlers(obj)
-
-        for obj in self.ui_objects:
-            self.app.game_window.push_handlers(obj)
+        self.push_handlers()
 
     def leave(self, state):
         """
@@ -240,8 +244,7 @@ class GSGamePlayMenu(GameState):
         """
         # Any event handlers specific to this game state that are on the event stack need to be removed from the game
         # window event stack so they don't fire
-        for _ in range(len(self.game_objects) + len(self.ui_objects) + 1):
-            self.app.game_window.pop_handlers()
+        self.pop_handlers()
 
     # :DEV: #
     def on_mouse_press(self, x, y, button, modifiers):
@@ -250,7 +253,6 @@ class GSGamePlayMenu(GameState):
 
     # :DEV: #
     def on_mouse_motion(self, x, y,    dx, dy):
-        # Display some debug info on the window caption (if not full screen)
-        if not self.app.game_window.fullscreen:
-            self.app.game_window.set_caption("{0}   {1} [mouse:({2}, {3})]".format(WINDOW_CAPTION, self.name, x, y))
+        # Display some debug info on the debug HUD (only during debug)
+        self.app.debug_hud.set("mouse", "mouse: ({0}, {1})", x, y)
     # :DEV: #
@@ -45,33 +45,21 @@ class GSMainMenu(GameState):
         self._btn_extras = None
         self._btn_quit = None
 
-    def enter(self, state):
+    def build(self):
         """
-        enter method for the GSMainMenu game state, note: objects will only be instantiated if they currently are not
-        instantiated, therefore only on the first entry into this state will new objects be instantiated
-
-        :param state: fsm.state.State object that was left before entering this state
+        build method for the GSMainMenu game state, note: objects will only be instantiated if they currently are not
+        instantiated, therefore they are only instantiated on the first call (either when prewarmed or on the first
+        entry into this state)
 
         :return nothing:
         """
-        # This state now becomes the current game state
-        self.app.current_game_state = self
-
-        # :DEV: #
-        if not self.app.game_window.fullscreen:
-            self.app.game_window.set_caption("{0}   {1} - ({2}, {3})".format(WINDOW_CAPTION, self.name, 0, 0))
-        # :DEV: #
-
         # Build game objects associated with this game state
         if not self._screen_sprite:
-            scale_x = self.app.game_window.width / self.app.game_object_images["main_menu_screen"].width
-            scale_y = self.app.game_window.height / self.app.game_object_images["main_menu_screen"].height
-
             self._screen_sprite = MainMenuSprite(window=self.app.game_window,
                                                  img=self.app.game_object_images["main_menu_screen"],
-                                                 batch=self._game_objects_batch)
-            self._screen_sprite.update(scale_x=scale_x, scale_y=scale_y)
-            self._screen_sprite.update(x=0, y=self._screen_sprite.window.height - self._screen_sprite.height)
+                                                 batch=self._game_objects_batch,
+                                                 group=self.layout.group("screen_sprite"))
+            self.layout.bind("screen_sprite", self._screen_sprite)
             self.game_objects.append(self._screen_sprite)
 
         # Build UI objects for the various menu options
@@ -83,11 +71,11 @@ class GSMainMenu(GameState):
                                        hover_image=self.app.ui_object_images["main_menu_btn_new_h"],
                                        pressed_image=self.app.ui_object_images["main_menu_btn_new_p"],
                                        batch=self._ui_objects_batch,
+                                       group=self.layout.group("btn_new"),
                                        command=None,
-                                       hit_area=None)
-            self._btn_new.x = 1250 * self._screen_sprite.scale_x
-            self._btn_new.y = 900 * self._screen_sprite.scale_y
-            self._btn_new.change_scale(self._screen_sprite.scale_x, self._screen_sprite.scale_y)
+                                       hit_area=None,
+                                       hit_mask=self.app.ui_object_hit_masks["main_menu_btn_new_e"])
+            self.layout.bind("btn_new", self._btn_new)
             self.ui_objects.append(self._btn_new)
 
         if not self._btn_load:
@@ -98,11 +86,11 @@ class GSMainMenu(GameState):
                                         hover_image=self.app.ui_object_images["main_menu_btn_load_h"],
                                         pressed_image=self.app.ui_object_images["main_menu_btn_load_p"],
                                         batch=self._ui_objects_batch,
+                                        group=self.layout.group("btn_load"),
                                         command=None,
-                                        hit_area=None)
-            self._btn_load.x = 1250 * self._screen_sprite.scale_x
-            self._btn_load.y = 780 * self._screen_sprite.scale_y
-            self._btn_load.change_scale(self._screen_sprite.scale_x, self._screen_sprite.scale_y)
+                                        hit_area=None,
+                                        hit_mask=self.app.ui_object_hit_masks["main_menu_btn_load_e"])
+            self.layout.bind("btn_load", self._btn_load)
             self.ui_objects.append(self._btn_load)
 
         if not self._btn_options:
@@ -113,11 +101,11 @@ class GSMainMenu(GameState):
                                            hover_image=self.app.ui_object_images["main_menu_btn_options_h"],
                                            pressed_image=self.app.ui_object_images["main_menu_btn_options_p"],
                                            batch=self._ui_objects_batch,
+                                           group=self.layout.group("btn_options"),
                                            command=None,
-                                           hit_area=None)
-            self._btn_options.x = 1250 * self._screen_sprite.scale_x
-            self._btn_options.y = 660 * self._screen_sprite.scale_y
-            self._btn_options.change_scale(self._screen_sprite.scale_x, self._screen_sprite.scale_y)
+                                           hit_area=None,
+                                           hit_mask=self.app.ui_object_hit_masks["main_menu_btn_options_e"])
+            self.layout.bind("btn_options", self._btn_options)
             self.ui_objects.append(self._btn_options)
 
         if not self._btn_credits:
@@ -128,11 +116,11 @@ class GSMainMenu(GameState):
                                            hover_image=self.app.ui_object_images["main_menu_btn_credits_h"],
                                            pressed_image=self.app.ui_object_images["main_menu_btn_credits_p"],
                                            batch=self._ui_objects_batch,
+                                           group=self.layout.group("btn_credits"),
                                            command=None,
-                                           hit_area=None)
-            self._btn_credits.x = 1250 * self._screen_sprite.scale_x
-            self._btn_credits.y = 540 * self._screen_sprite.scale_y
-            self._btn_credits.change_scale(self._screen_sprite.scale_x, self._screen_sprite.scale_y)
+                                           hit_area=None,
+                                           hit_mask=self.app.ui_object_hit_masks["main_menu_btn_credits_e"])
+            self.layout.bind("btn_credits", self._btn_credits)
             self.ui_objects.append(self._btn_credits)
 
         if not self._btn_extras:
@@ -143,11 +131,11 @@ class GSMainMenu(GameState):
                                           hover_image=self.app.ui_object_images["main_menu_btn_extras_h"],
                                           pressed_image=self.app.ui_object_images["main_menu_btn_extras_p"],
                                           batch=self._ui_objects_batch,
+                                          group=self.layout.group("btn_extras"),
                                           command=None,
-                                          hit_area=None)
-            self._btn_extras.x = 1250 * self._screen_sprite.scale_x
-            self._btn_extras.y = 420 * self._screen_sprite.scale_y
-            self._btn_extras.change_scale(self._screen_sprite.scale_x, self._screen_sprite.scale_y)
+                                          hit_area=None,
+                                          hit_mask=self.app.ui_object_hit_masks["main_menu_btn_extras_e"])
+            self.layout.bind("btn_extras", self._btn_extras)
             self.ui_objects.append(self._btn_extras)
 
         if not self._btn_quit:
@@ -158,13 +146,31 @@ class GSMainMenu(GameState):
                                         hover_image=self.app.ui_object_images["main_menu_btn_quit_h"],
                                         pressed_image=self.app.ui_object_images["main_menu_btn_quit_p"],
                                         batch=self._ui_objects_batch,
+                                        group=self.layout.group("btn_quit"),
                                         command=None,
-                                        hit_area=None)
-            self._btn_quit.x = 1250 * self._screen_sprite.scale_x
-            self._btn_quit.y = 300 * self._screen_sprite.scale_y
-            self._btn_quit.change_scale(self._screen_sprite.scale_x, self._screen_sprite.scale_y)
+                                        hit_area=None,
+                                        hit_mask=self.app.ui_object_hit_masks["main_menu_btn_quit_e"])
+            self.layout.bind("btn_quit", self._btn_quit)
             self.ui_objects.append(self._btn_quit)
 
+        # Lay out the game and UI objects for the current window size, a no-op if they are already laid out for it
+        self.apply_layout()
+
+    def enter(self, state):
+        """
+        enter method for the GSMainMenu game state, note: objects are built by build() (unless already built), therefore
+        entering only wires up the UI commands and pushes the event handlers of this state
+
+        :param state: fsm.state.State object that was left before entering this state
+
+        :return nothing:
+        """
+        # This state now becomes the current game state
+        self.app.current_game_state = self
+
+        # Build the game and UI objects of this game state, a no-op if they were built ahead of time by prewarming
+        self.build()
+
         # Define the various UI commands
         def btn_new_cmd(source, data):
             x, y, button, modifiers = data
@@ -205,12 +211,7 @@ class GSMainMenu(GameState):
         self._btn_quit.command = btn_quit_cmd
 
         # Ensure all handlers for this game state are pushed onto the event stack of the game window
-        self.app.game_window.push_handlers(self)
-        for obj in self.game_objects:
-            self.app.game_window.push_handlers(obj)
-
-        for obj in self.ui_objects:
-            self.app.game_window.push_handlers(obj)
+        self.push_handlers()
 
     def leave(self, state):
         """
@@ -222,8 +223,7 @@ class GSMainMenu(GameState):
         """
         # Any event handlers specific to this game state that are on the event stack need to be removed from the game
         # window event stack so they don't fire
-        for _ in range(len(self.game_objects) + len(self.ui_objects) + 1):
-            self.app.game_window.pop_handlers()
+        self.pop_handlers()
 
     # :DEV: #
     def on_mouse_press(self, x, y, button, modifiers):
@@ -232,7 +232,6 @@ class GSMainMenu(GameState):
 
     # :DEV: #
     def on_mouse_motion(self, x, y,    dx, dy):
-        # Display some debug info on the window caption (if not full screen)
-        if not self.app.game_window.fullscreen:
-            self.app.game_window.set_caption("{0}   {1} [mouse:({2}, {3})]".format(WINDOW_CAPTION, self.name, x, y))
+        # Display some debug info on the debug HUD (only during debug)
+        self.app.debug_hud.set("mouse", "mouse: ({0}, {1})", x, y)
     # :DEV: #
@@ -10,6 +10,7 @@ Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leade
 """
 
 # Imports
+import pyglet
 from engine.game_state import GameState
 from game_states.gs_main_menu import GSMainMenu
 from game_states.gs_game_play_menu import GSGamePlayMenu
@@ -42,33 +43,28 @@ class GSOptions(GameState):
         # UI objects
         self._btn_back = None
 
-    def enter(self, state):
-        """
-        enter method for the GSOptions game state, note: objects will only be instantiated if they currently are not
-        instantiated, therefore only on the first entry into this state will new objects be instantiated
+    def on_key_press(self, symbol, modifiers):
+        # Display settings are changed live, the game app applies them as soon as they change
+        if symbol == getattr(pyglet.window.key, OPTIONS_VSYNC_KEY):
+            self.app.settings.set("display", "vsync", not self.app.display_vsync)
+        elif symbol == getattr(pyglet.window.key, OPTIONS_CONTINUOUS_REDRAW_KEY):
+            self.app.settings.set("display", "continuous_redraw", not self.app.display_continuous_redraw)
 
-        :param state: fsm.state.State object that was left before entering this state
+    def build(self):
+        """
+        build method for the GSOptions game state, note: objects will only be instantiated if they currently are not
+        instantiated, therefore they are only instantiated on the first call (either when prewarmed or on the first
+        entry into this state)
 
         :return nothing:
         """
-        # This state now becomes the current game state
-        self.app.current_game_state = self
-
-        # :DEV: #
-        if not self.app.game_window.fullscreen:
-            self.app.game_window.set_caption("{0}   {1} - ({2}, {3})".format(WINDOW_CAPTION, self.name, 0, 0))
-        # :DEV: #
-
         # Build game objects associated with this game state
         if not self._screen_sprite:
-            scale_x = self.app.game_window.width / self.app.game_object_images["options_screen"].width
-            scale_y = self.app.game_window.height / self.app.game_object_images["options_screen"].height
-
             self._screen_sprite = OptionsScreenSprite(window=self.app.game_window,
                                                       img=self.app.game_object_images["options_screen"],
-                                                      batch=self._game_objects_batch)
-            self._screen_sprite.update(scale_x=scale_x, scale_y=scale_y)
-            self._screen_sprite.update(x=0, y=self._screen_sprite.window.height - self._screen_sprite.height)
+                                                      batch=self._game_objects_batch,
+                                                      group=self.layout.group("screen_sprite"))
+            self.layout.bind("screen_sprite", self._screen_sprite)
             self.game_objects.append(self._screen_sprite)
 
         # Build UI objects for the various functions of this game state
@@ -80,13 +76,31 @@ class GSOptions(GameState):
                                         hover_image=self.app.ui_object_images["btn_back_h"],
                                         pressed_image=self.app.ui_object_images["btn_back_p"],
                                         batch=self._ui_objects_batch,
+                                        group=self.layout.group("btn_back"),
                                         command=None,
-                                        hit_area=None)
-            self._btn_back.x = 48 * self._screen_sprite.scale_x
-            self._btn_back.y = 27 * self._screen_sprite.scale_y
-            self._btn_back.change_scale(self._screen_sprite.scale_x, self._screen_sprite.scale_y)
+                                        hit_area=None,
+                                        hit_mask=self.app.ui_object_hit_masks["btn_back_e"])
+            self.layout.bind("btn_back", self._btn_back)
             self.ui_objects.append(self._btn_back)
 
+        # Lay out the game and UI objects for the current window size, a no-op if they are already laid out for it
+        self.apply_layout()
+
+    def enter(self, state):
+        """
+        enter method for the GSOptions game state, note: objects are built by build() (unless already built), therefore
+        entering only wires up the UI commands and pushes the event handlers of this state
+
+        :param state: fsm.state.State object that was left before entering this state
+
+        :return nothing:
+        """
+        # This state now becomes the current game state
+        self.app.current_game_state = self
+
+        # Build the game and UI objects of this game state, a no-op if they were built ahead of time by prewarming
+        self.build()
+
         # Define the various UI commands
         def btn_back_cmd(source, data):
             x, y, button, modifiers = data
@@ -101,12 +115,7 @@ class GSOptions(GameState):
         self._btn_back.command = btn_back_cmd
 
         # Ensure all handlers for this game state are pushed onto the event stack of the game window
-        self.app.game_window.push_handlers(self)
-        for obj in self.game_objects:
-            self.app.game_window.push_handlers(obj)
-
-        for obj in self.ui_objects:
-            self.app.game_window.push_handlers(obj)
+        self.push_handlers()
 
     def leave(self, state):
         """
@@ -118,12 +127,10 @@ class GSOptions(GameState):
         """
         # Any event handlers specific to this game state that are on the event stack need to be removed from the game
         # window event stack so they don't fire
-        for _ in range(len(self.game_objects) + len(self.ui_objects) + 1):
-            self.app.game_window.pop_handlers()
+        self.pop_handlers()
 
     # :DEV: #
     def on_mouse_motion(self, x, y,    dx, dy):
-        # Display some debug info on the window caption (if not full screen)
-        if not self.app.game_window.fullscreen:
-            self.app.game_window.set_caption("{0}   {1} [mouse:({2}, {3})]".format(WINDOW_CAPTION, self.name, x, y))
+        # Display some debug info on the debug HUD (only during debug)
+        self.app.debug_hud.set("mouse", "mouse: ({0}, {1})", x, y)
     # :DEV: #
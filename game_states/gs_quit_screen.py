@@ -40,32 +40,21 @@ class GSQuitScreen(GameState):
         # UI objects
         self._btn_confirm = None
 
-    def enter(self, state):
+    def build(self):
         """
-        enter method for the GSQuitScreen game state
-
-        :param state: fsm.state.State object that was left before entering this state
+        build method for the GSQuitScreen game state, note: objects will only be instantiated if they currently are not
+        instantiated, therefore they are only instantiated on the first call (either when prewarmed or on the first
+        entry into this state)
 
         :return nothing:
         """
-        # This state now becomes the current game state
-        self.app.current_game_state = self
-
-        # :DEV: #
-        if not self.app.game_window.fullscreen:
-            self.app.game_window.set_caption("{0}   {1} - ({2}, {3})".format(WINDOW_CAPTION, self.name, 0, 0))
-        # :DEV: #
-
         # Build game objects associated with this game state
         if not self._screen_sprite:
-            scale_x = self.app.game_window.width / self.app.game_object_images["quit_screen"].width
-            scale_y = self.app.game_window.height / self.app.game_object_images["quit_screen"].height
-
             self._screen_sprite = QuitScreenSprite(window=self.app.game_window,
                                                    img=self.app.game_object_images["quit_screen"],
-                                                   batch=self._game_objects_batch)
-            self._screen_sprite.update(scale_x=scale_x, scale_y=scale_y)
-            self._screen_sprite.update(x=0, y=self._screen_sprite.window.height - self._screen_sprite.height)
+                                                   batch=self._game_objects_batch,
+                                                   group=self.layout.group("screen_sprite"))
+            self.layout.bind("screen_sprite", self._screen_sprite)
             self.game_objects.append(self._screen_sprite)
 
         # Build UI objects for the various functions of this game state
@@ -77,13 +66,31 @@ class GSQuitScreen(GameState):
                                            hover_image=self.app.ui_object_images["btn_confirm_h"],
                                            pressed_image=self.app.ui_object_images["btn_confirm_p"],
                                            batch=self._ui_objects_batch,
+                                           group=self.layout.group("btn_confirm"),
                                            command=None,
-                                           hit_area=None)
-            self._btn_confirm.x = 860 * self._screen_sprite.scale_x
-            self._btn_confirm.y = 27 * self._screen_sprite.scale_y
-            self._btn_confirm.change_scale(self._screen_sprite.scale_x, self._screen_sprite.scale_y)
+                                           hit_area=None,
+                                           hit_mask=self.app.ui_object_hit_masks["btn_confirm_e"])
+            self.layout.bind("btn_confirm", self._btn_confirm)
             self.ui_objects.append(self._btn_confirm)
 
+        # Lay out the game and UI objects for the current window size, a no-op if they are already laid out for it
+        self.apply_layout()
+
+    def enter(self, state):
+        """
+        enter method for the GSQuitScreen game state, note: objects are built by build() (unless already built),
+        therefore entering only wires up the UI commands and pushes the event handlers of this state
+
+        :param state: fsm.state.State object that was left before entering this state
+
+        :return nothing:
+        """
+        # This state now becomes the current game state
+        self.app.current_game_state = self
+
+        # Build the game and UI objects of this game state, a no-op if they were built ahead of time by prewarming
+        self.build()
+
         # Define the various UI commands
         def btn_confirm_cmd(source, data):
             x, y, button, modifiers = data
@@ -94,12 +101,7 @@ class GSQuitScreen(GameState):
         self._btn_confirm.command = btn_confirm_cmd
 
         # Ensure all handlers for this game state are pushed onto the event stack of the game window
-        self.app.game_window.push_handlers(self)
-        for obj in self.game_objects:
-            self.app.game_window.push_handlers(obj)
-
-        for obj in self.ui_objects:
-            self.app.game_window.push_handlers(obj)
+        self.push_handlers()
 
     def leave(self, state):
         """
@@ -111,12 +113,10 @@ class GSQuitScreen(GameState):
         """
         # Any event handlers specific to this game state that are on the event stack need to be removed from the game
         # window event stack so they don't fire
-        for _ in range(len(self.game_objects) + len(self.ui_objects) + 1):
-            self.app.game_window.pop_handlers()
+        self.pop_handlers()
 
     # :DEV: #
     def on_mouse_motion(self, x, y,    dx, dy):
-        # Display some debug info on the window caption (if not full screen)
-        if not self.app.game_window.fullscreen:
-            self.app.game_window.set_caption("{0}   {1} [mouse:({2}, {3})]".format(WINDOW_CAPTION, self.name, x, y))
+        # Display some debug info on the debug HUD (only during debug)
+        self.app.debug_hud.set("mouse", "mouse: ({0}, {1})", x, y)
     # :DEV: #
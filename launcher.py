@@ -10,6 +10,15 @@ Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leade
 """
 
 # Imports
+import sys
+import pyglet
+
+# Image decoding worker processes that are started afresh (rather than forked, eg. on Windows and macOS) import this
+# module as "__mp_main__", they only decode images so they must not create pyglet's shadow window, which importing the
+# game app would otherwise do before the worker could prevent it (see engine.image_decoder)
+if __name__ == "__mp_main__":
+    pyglet.options["shadow_window"] = False
+
 from engine.game_app import GameApp
 
 
@@ -26,6 +35,14 @@ def main():
     :return: nothing
     """
     game_app = GameApp()
+
+    # Report on startup import and game state load times rather than running the game
+    if "--startup-report" in sys.argv:
+        from engine.startup_report import print_startup_report
+        dict(game_app.startup_phases)["build_game_states"]()
+        print_startup_report(game_states=game_app.game_states)
+        return
+
     game_app.run()
 
 
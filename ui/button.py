@@ -28,6 +28,16 @@ class Button(UISprite):
         self._hover_image = hover_image if hover_image else self.image
         self._command = command
 
+    @property
+    def images(self):
+        return [self.image, self._disabled_image, self._enabled_image, self._hover_image]
+
+    def reload_images(self, reload):
+        super().reload_images(reload)
+        self._disabled_image = reload(self._disabled_image)
+        self._enabled_image = reload(self._enabled_image)
+        self._hover_image = reload(self._hover_image)
+
     @property
     def command(self):
         return self._command
@@ -47,6 +57,8 @@ class Button(UISprite):
 
     def on_mouse_entered(self):
         self.image = self._hover_image
+        self.mark_dirty()
 
     def on_mouse_left(self):
         self.image = self._enabled_image
+        self.mark_dirty()
@@ -11,6 +11,8 @@ Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leade
 
 # Imports
 import pyglet
+from engine.consts import *
+from engine import timer_scheduler
 from ui.button import Button
 
 
@@ -25,29 +27,50 @@ class PushButton(Button):
         super().__init__(*args, **kwargs)
         self._pressed_image = pressed_image if pressed_image else self.image
 
-    def on_mouse_press(self, x, y, button, modifiers):
-        def reset(dt):
-            # Only return to hover or enabled image if still enabled otherwise return to disabled image
-            if self.enabled:
-                # Only return to the hover image if mouse is inside the button otherwise return to enabled image, so
-                # check this and act accordingly
-                self.establish_mouse_inside(x, y)
-                if self.mouse_inside:
-                    self.image = self._hover_image
-                else:
-                    self.image = self._enabled_image
+    @property
+    def images(self):
+        return super().images + [self._pressed_image]
+
+    def reload_images(self, reload):
+        super().reload_images(reload)
+        self._pressed_image = reload(self._pressed_image)
+
+    def delete(self):
+        # Timers still pending for a deleted button must not fire
+        scheduler = timer_scheduler.scheduler()
+        scheduler.cancel(key=(self, "reset"))
+        scheduler.cancel(key=(self, "command"))
+        super().delete()
+
+    def _reset_image(self, x, y):
+        # Only return to hover or enabled image if still enabled otherwise return to disabled image
+        if self.enabled:
+            # Only return to the hover image if mouse is inside the button otherwise return to enabled image, so
+            # check this and act accordingly
+            self.establish_mouse_inside(x, y)
+            if self.mouse_inside:
+                self.image = self._hover_image
             else:
-                self.image = self._disabled_image
+                self.image = self._enabled_image
+        else:
+            self.image = self._disabled_image
 
-        def cmd(dt):
-            self.command(source=self, data=(x, y, button, modifiers))
+        self.mark_dirty()
 
+    def _fire_command(self, x, y, button, modifiers):
+        self.command(source=self, data=(x, y, button, modifiers))
+
+    def on_mouse_press(self, x, y, button, modifiers):
         # Only react to mouse button press if enabled and if the mouse button is a left button press
         if self.enabled and button == pyglet.window.mouse.LEFT:
             if self._mouse_inside:
                 self.image = self._pressed_image
-                pyglet.clock.schedule_once(reset, 0.1)
+                self.mark_dirty()
+
+                # The timers are keyed on this button so a rapid second click reschedules them rather than adding more
+                scheduler = timer_scheduler.scheduler()
+                scheduler.schedule(self._reset_image, PUSH_BUTTON_RESET_DELAY, x, y, key=(self, "reset"))
                 if self.command:
-                    pyglet.clock.schedule_once(cmd, 0.2)
+                    scheduler.schedule(self._fire_command, PUSH_BUTTON_COMMAND_DELAY, x, y, button, modifiers,
+                                       key=(self, "command"))
                 return pyglet.event.EVENT_HANDLED
-
@@ -11,18 +11,21 @@ Notes:      Digital version of the 'Deep Space D6' PnP board game from Tau Leade
 
 # Imports
 import pyglet
-from shapely.geometry import Point, Polygon
 from engine.game_sprite import GameSprite
+from engine.utils import polygon_edges, point_in_polygon
+from engine import metrics
 
 
 # Consts
 # Globals
+_mouse_motion_timer = metrics.timer("ui_mouse_motion_seconds", "Time taken by a UI sprite to handle mouse motion")
+
 # Functions
 
 
 # Classes
 class UISprite(GameSprite):
-    def __init__(self, enabled=True, hit_area=None, *args, **kwargs):
+    def __init__(self, enabled=True, hit_area=None, hit_mask=None, *args, **kwargs):
         """
         Initialiser for the UISprite class
 
@@ -34,8 +37,20 @@ class UISprite(GameSprite):
         :attr _hit_area: list of (x, y) coordinates that determines a "hittable" area for this UI sprite as it is
                          located within its container, for instance, this can be used to (in conjunction with the
                          mouse_inside property) establish if a mouse button event has occurred "inside" this UI widget,
-                         NOTE: these coordinates will be converted to a shapely.geometry.Polygon when applying
-                         any hit test
+                         NOTE: the hit geometry derived from these coordinates is cached, see _hit_bounds and _hit_edges
+
+        :attr _unscaled_hit_area: the hit area at a scale of 1.0, the hit area is always rescaled from this so that
+                                  change_scale() can be called again (eg. whenever the window size changes)
+
+        :attr _hit_bounds: cached (min x, min y, max x, max y) bounding box of the hit area, any point outside of this is
+                           rejected without further testing, None if the cache needs to be (re)built
+
+        :attr _hit_edges: cached edges of the hit area as returned by engine.utils.polygon_edges(), or None if the hit
+                          area is an axis aligned box as the bounding box test is then sufficient
+
+        :attr _hit_mask: engine.hit_mask.HitMask derived from the alpha channel of this UI sprite's image, if provided
+                         then a position within the hit area bounds is only a hit if it is opaque in the hit mask, this
+                         is looked up in unscaled image pixels so it matches the image at any scale
 
         :attr _mouse_inside: a boolean flag that shows if the current mouse position is determined to be "inside" this
                              UI sprite as it is located within its container and scaled accordingly, NOTE: this is
@@ -47,19 +62,28 @@ class UISprite(GameSprite):
                          bounds of this UI sprite, the last entry in the list will become the "closing" coordinate, ie.
                          it must be the same as the first coordinate, NOTE: if None is provided then the hit area is
                          assumed to be an area that conforms to the bounds of the UI sprite
+        :param hit_mask: engine.hit_mask.HitMask to refine hit tests with or None to use just the hit area
         """
         super().__init__(*args, **kwargs)
-        self.key_handler = pyglet.window.key.KeyStateHandler()
         self._enabled = enabled
         self._mouse_inside = False
 
-        # If no hit area provided then assume a rectangular, ie. box, hit area based on size of the UI sprite
+        # If no hit area provided then assume a rectangular, ie. box, hit area based on size of the UI sprite, offset by
+        # the anchor of its image (a trimmed image is anchored so that it is drawn where its untrimmed image would be)
         if not hit_area:
-            self._hit_area = [(0, 0), (0, self.height - 1), (self.width - 1, self.height - 1), (self.width - 1, 0),
-                              (0, 0)]
+            left = -self.image.anchor_x
+            bottom = -self.image.anchor_y
+            right = left + self.width - 1
+            top = bottom + self.height - 1
+            self._hit_area = [(left, bottom), (left, top), (right, top), (right, bottom), (left, bottom)]
         else:
             self._hit_area = hit_area
 
+        self._unscaled_hit_area = self._hit_area
+        self._hit_bounds = None
+        self._hit_edges = None
+        self._hit_mask = hit_mask
+
     @property
     def enabled(self):
         return self._enabled
@@ -70,6 +94,7 @@ class UISprite(GameSprite):
             old_value = self.enabled
             self._enabled = value
             self.on_enabled_changed(old_value)
+            self.mark_dirty()
 
     def on_enabled_changed(self, old_value):
         pass
@@ -81,37 +106,103 @@ class UISprite(GameSprite):
     @hit_area.setter
     def hit_area(self, value):
         self._hit_area = value
+        self._hit_bounds = None
+
+    @property
+    def hit_mask(self):
+        return self._hit_mask
+
+    @hit_mask.setter
+    def hit_mask(self, value):
+        self._hit_mask = value
 
     @property
     def mouse_inside(self):
         return self._mouse_inside
 
+    @property
+    def input_snapshot(self):
+        """
+        Input state of the current frame, shared by all widgets (see engine.input_state.InputState), use this rather
+        than tracking keys or mouse buttons in a widget
+
+        :return snapshot: engine.input_state.InputSnapshot object, or None if this UI sprite is not bound to a game state
+        """
+        if not self.game_state:
+            return None
+
+        return self.game_state.app.input_state.snapshot
+
+    @property
+    def bounds(self):
+        """
+        Bounding box of the hit area as located within its container, ie. in window coordinates
+
+        :return bounds: (min x, min y, max x, max y) tuple
+        """
+        if not self._hit_bounds:
+            self._build_hit_geometry()
+
+        min_x, min_y, max_x, max_y = self._hit_bounds
+        return self.x + min_x, self.y + min_y, self.x + max_x, self.y + max_y
+
     def change_scale(self, scale_x, scale_y):
         """
-        Use this mthod to rescale any UI widget so that its hit area is scaled accordingly
+        Use this mthod to rescale any UI widget so that its hit area is scaled accordingly, the hit area is scaled from
+        its unscaled coordinates so this can be called any number of times
 
         :param scale_x: new scale for along x-axis as float number
         :param scale_y: new scale along y_axis as float number
 
         :return: nothing
         """
-        self.scale_x = scale_x
-        self.scale_y = scale_y
+        self.update(scale_x=scale_x, scale_y=scale_y)
 
+        # The sprite is drawn at its overall scale multiplied by its scale along each axis, so the hit area is too
         new_hit_area = []
 
-        for coord in self.hit_area:
-            new_hit_area.append((coord[0] * self.scale_x, coord[1] * self.scale_y))
+        for coord in self._unscaled_hit_area:
+            new_hit_area.append((coord[0] * self.scale * self.scale_x, coord[1] * self.scale * self.scale_y))
 
         self.hit_area = new_hit_area
 
+    def _build_hit_geometry(self):
+        """
+        (Re)build the cached hit geometry from the current hit area, this is only needed when the hit area changes, ie.
+        on creation and in change_scale()
+
+        :return: nothing
+        """
+        xs = [coord[0] for coord in self.hit_area]
+        ys = [coord[1] for coord in self.hit_area]
+        self._hit_bounds = (min(xs), min(ys), max(xs), max(ys))
+
+        # An axis aligned box is fully described by its bounding box so needs no polygon test
+        corners = set(self.hit_area)
+        if len(corners) == 4 and len(set(xs)) == 2 and len(set(ys)) == 2:
+            self._hit_edges = None
+        else:
+            self._hit_edges = polygon_edges(self.hit_area)
+
     def establish_mouse_inside(self, x, y):
+        if not self._hit_bounds:
+            self._build_hit_geometry()
+
         # Transform the x,y position of the mouse to take into account the location of the sprite in its containing
-        # window and any scaling that needs to be applied
+        # window, the hit area has already been scaled accordingly
         transformed_x = x - self.x
         transformed_y = y - self.y
-        p = Polygon(self.hit_area)
-        return p.contains(Point(transformed_x, transformed_y))
+        min_x, min_y, max_x, max_y = self._hit_bounds
+
+        if not (min_x < transformed_x < max_x and min_y < transformed_y < max_y):
+            return False
+
+        if self._hit_mask:
+            # Map back into unscaled image pixels for the hit mask lookup, using the same scale as the hit area
+            return self._hit_mask.contains(transformed_x / (self.scale * self.scale_x) + self.image.anchor_x,
+                                           transformed_y / (self.scale * self.scale_y) + self.image.anchor_y)
+
+        return self._hit_edges is None or point_in_polygon(transformed_x, transformed_y, self._hit_edges)
 
     def updater(self, dt):
         super().updater(dt)
@@ -119,20 +210,25 @@ class UISprite(GameSprite):
     def on_mouse_motion(self, x, y,    dx, dy):
         # Only react to mouse motion if enabled
         if self.enabled:
-            within_hit_area = self.establish_mouse_inside(x, y)
+            start = _mouse_motion_timer.start()
+
+            try:
+                within_hit_area = self.establish_mouse_inside(x, y)
 
-            if not self.mouse_inside and within_hit_area:
-                self._mouse_inside = True
-                self.on_mouse_entered()
-                return pyglet.event.EVENT_HANDLED
+                if not self.mouse_inside and within_hit_area:
+                    self._mouse_inside = True
+                    self.on_mouse_entered()
+                    return pyglet.event.EVENT_HANDLED
 
-            if self.mouse_inside and not within_hit_area:
-                self._mouse_inside = False
-                self.on_mouse_left()
-                return pyglet.event.EVENT_HANDLED
+                if self.mouse_inside and not within_hit_area:
+                    self._mouse_inside = False
+                    self.on_mouse_left()
+                    return pyglet.event.EVENT_HANDLED
 
-            if within_hit_area:
-                return pyglet.event.EVENT_HANDLED
+                if within_hit_area:
+                    return pyglet.event.EVENT_HANDLED
+            finally:
+                _mouse_motion_timer.stop(start)
 
     def on_mouse_entered(self):
         pass